@@ -1 +1,2 @@
 from app.api.routes.content import router as content_router
+from app.api.routes.usage import router as usage_router
@@ -0,0 +1,37 @@
+from datetime import datetime
+from uuid import UUID
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.models.content import Transcript
+from app.models.user import User
+from app.schemas.content import TranscriptUsageResponse, UsageSummaryResponse
+from app.services.usage_service import UsageService, month_start
+
+router = APIRouter()
+
+@router.get("/transcript/{transcript_id}", response_model=TranscriptUsageResponse)
+async def get_transcript_usage(transcript_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    """
+    Every AI call recorded for one job, with token, latency and cost totals.
+    """
+    result = await db.execute(select(Transcript.id).where(Transcript.id == transcript_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transcript not found")
+    return await UsageService(db).transcript_usage(transcript_id)
+
+@router.get("/summary", response_model=UsageSummaryResponse)
+async def get_usage_summary(
+    since: Optional[datetime] = Query(None, description="Defaults to the start of the current month (UTC)"),
+    top: int = Query(10, ge=1, le=100, description="Number of most expensive transcripts to return"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Mock User retrieval for MVP (mirrors create_content)
+    result = await db.execute(select(User).limit(1))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return await UsageService(db).summary(user, since or month_start(), top=top)
@@ -1,15 +1,83 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Video Repurposing API"
     API_V1_STR: str = "/api/v1"
     
     DATABASE_URL: str
+    DB_CREATE_ALL_ON_STARTUP: bool = False # Otherwise run `python -m scripts.init_db` once per deploy
+    DATABASE_REPLICA_URL: Optional[str] = None # Read-only endpoints (status, preview, lists) use it when set
+    DB_ECHO: bool = False # Log every SQL statement
+    # Connection pool per engine and process (ignored for SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_WORKER_POOL_SIZE: int = 2 # Per Celery worker thread (each thread has its own event loop and pool)
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0 # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800 # Reconnect connections older than this (seconds, -1 disables)
+    DB_POOL_PRE_PING: bool = True # Check connections on checkout (survives DB/proxy restarts)
+    DB_STATEMENT_CACHE_SIZE: int = 100 # asyncpg prepared statements per connection; 0 behind pgbouncer (transaction mode)
     REDIS_URL: str
     OPENAI_API_KEY: str
     GEMINI_API_KEY: str
     AI_PROVIDER: str = "openai"
+    TRANSCRIPT_PREPROCESSING: bool = True # Normalize auto-captions before extraction
+    # Override provider endpoints, e.g. to point at scripts/fake_llm_server.py
+    OPENAI_BASE_URL: Optional[str] = None
+    GEMINI_BASE_URL: Optional[str] = None
+    # Shared AI HTTP client pool (one per process and event loop)
+    AI_HTTP_MAX_CONNECTIONS: int = 100
+    AI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    AI_HTTP_KEEPALIVE_EXPIRY: float = 60.0 # Seconds an idle connection stays open
+    AI_HTTP_TIMEOUT: float = 120.0
+    AI_HTTP2: bool = False # Requires the `h2` package
     USE_MOCK_AI: bool = False # Default to False, can be overridden by env var
+    # MockProvider behaviour (median seconds per call, log-normal spread, error rate)
+    MOCK_AI_EXTRACT_LATENCY: float = 1.0
+    MOCK_AI_REWRITE_LATENCY: float = 0.0
+    MOCK_AI_LATENCY_SIGMA: float = 0.0
+    MOCK_AI_FAILURE_RATE: float = 0.0
+    MOCK_AI_ATOM_COUNT: int = 4
+    MOCK_AI_SEED: Optional[int] = None # Fixed seed for reproducible latencies and failures (benchmarks)
+    # Monthly prompt+completion token budget per user, checked before enqueueing (None = unlimited)
+    DEFAULT_MONTHLY_TOKEN_BUDGET: Optional[int] = None
+    # yt-dlp metadata lookups: reused YoutubeDL instances on a shared thread pool
+    YTDLP_POOL_SIZE: int = 4 # Max concurrent extractions per process
+    YTDLP_TIMEOUT: float = 30.0 # Seconds per lookup, from when it starts running
+    # Reuse an earlier post when a new atom's SimHash is this similar to one of the user's previous atoms
+    REWRITE_REUSE_ENABLED: bool = True
+    REWRITE_REUSE_THRESHOLD: float = 0.9 # 1 - Hamming distance / 64
+    REWRITE_REUSE_INDEX_SIZE: int = 5000 # Most recent posts per user searched
+    SCHEDULE_NOVELTY_WINDOW: int = 2000 # Most recent scheduled posts per user compared for novelty
+    EXPORT_BATCH_SIZE: int = 1000 # Rows fetched and serialized per chunk of /export
+    # Celery: per-queue worker concurrency (see app/core/queues.py and app/workers/run_worker.py)
+    CELERY_TRANSCRIPTION_CONCURRENCY: int = 2
+    CELERY_GENERATION_CONCURRENCY: int = 16
+    CELERY_PUBLISHING_CONCURRENCY: int = 8
+    # Redis redelivers unacked messages after this many seconds; must exceed the longest task with acks_late
+    CELERY_VISIBILITY_TIMEOUT: int = 7200
+    PIPELINE_LEASE_SECONDS: int = 300 # Per-transcript processing lease, renewed while work progresses
+    # inprocess: a task runs a job's whole stage graph; celery: every stage item is its own task
+    PIPELINE_MODE: str = "inprocess"
+    PIPELINE_MAX_BACKLOG: int = 1000 # celery mode: hold upstream stages while a queue is deeper than this
+    PIPELINE_BACKPRESSURE_DELAY: float = 5.0 # Seconds before a held stage task is retried
+    # Content-addressed store for transcripts and atom sets passed between tasks
+    ARTIFACT_STORE: str = "local" # local or s3
+    ARTIFACT_DIR: str = "/tmp/artifacts" # local: must be shared by the API and all workers
+    ARTIFACT_S3_BUCKET: Optional[str] = None
+    ARTIFACT_S3_PREFIX: str = "artifacts"
+    ARTIFACT_S3_ENDPOINT_URL: Optional[str] = None # e.g. http://minio:9000; requires boto3
+    METRICS_WORKER_PORT: int = 9808 # Prometheus endpoint served by each Celery worker (0 disables)
+
+    # Sampling profiler (requires pyinstrument). Requests opt in with the
+    # PROFILING_HEADER header; tasks with a `profile` message header.
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0 # Fraction of un-flagged requests/tasks to profile
+    PROFILING_MAX_PER_MINUTE: int = 6 # Per-process cap, applies to flagged requests too
+    PROFILING_INTERVAL: float = 0.001 # Sampling interval in seconds
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_TOKEN: Optional[str] = None # If set, the header value must match it
+    PROFILING_OUTPUT_DIR: str = "/tmp/profiles"
 
     class Config:
         env_file = ".env"
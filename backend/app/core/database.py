@@ -1,18 +1,102 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from typing import AsyncGenerator
+import asyncio
+import threading
+import weakref
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from typing import AsyncGenerator, Dict, List, Tuple
 from app.core.config import settings
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True, # Set to False in production
-    future=True,
-)
+def _engine_options(url: str, pool_size: int) -> dict:
+    options = {
+        "echo": settings.DB_ECHO,
+        "future": True,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    backend = make_url(url)
+    # SQLite (tests, benchmarks) keeps SQLAlchemy's default pool for its driver
+    if backend.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=pool_size,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if backend.get_driver_name() == "asyncpg":
+        # SQLAlchemy's and asyncpg's own prepared statement caches; set 0 behind pgbouncer in transaction mode
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+def _create_engines() -> Dict[str, AsyncEngine]:
+    # Loops on secondary threads (the Celery threads pool, one task at a time each) keep a small pool
+    if threading.current_thread() is threading.main_thread():
+        pool_size = settings.DB_POOL_SIZE
+    else:
+        pool_size = settings.DB_WORKER_POOL_SIZE
+    primary = create_async_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL, pool_size))
+    # Read-only endpoints use the replica when DATABASE_REPLICA_URL is set, the primary otherwise
+    if not settings.DATABASE_REPLICA_URL:
+        return {"primary": primary, "replica": primary}
+    replica = create_async_engine(settings.DATABASE_REPLICA_URL, **_engine_options(settings.DATABASE_REPLICA_URL, pool_size))
+    return {"primary": primary, "replica": replica}
+
+# One set of engines (and therefore connection pools) per event loop, like the AI providers
+# in app/services/ai/factory.py: asyncpg connections are bound to the loop that opened them,
+# and every Celery worker thread runs its own loop (app/workers/event_loop.py)
+_loop_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncEngine]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+def get_engine(role: str = "primary") -> AsyncEngine:
+    """
+    The running event loop's engine for `role` ("primary" or "replica"), created on first use.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        loop_engines = _loop_engines.get(loop)
+        if loop_engines is None:
+            loop_engines = _loop_engines[loop] = _create_engines()
+    return loop_engines[role]
+
+class _LoopSessionmaker:
+    """
+    Drop-in for an async_sessionmaker whose sessions bind to the running loop's engine.
+    """
+    def __init__(self, role: str):
+        self.role = role
+        self._maker = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+    def __call__(self, **kwargs) -> AsyncSession:
+        return self._maker(bind=get_engine(self.role), **kwargs)
+
+AsyncSessionLocal = _LoopSessionmaker("primary")
+ReadSessionLocal = _LoopSessionmaker("replica")
+
+def engines() -> List[Tuple[str, AsyncEngine]]:
+    """
+    (role, engine) for every live engine in the process, across event loops.
+    """
+    with _lock:
+        loop_engines = list(_loop_engines.values())
+    result = []
+    for by_role in loop_engines:
+        result.append(("primary", by_role["primary"]))
+        if by_role["replica"] is not by_role["primary"]:
+            result.append(("replica", by_role["replica"]))
+    return result
+
+async def dispose_engines():
+    """
+    Closes the running loop's pools. Must run on that loop: connections can't be closed from another.
+    """
+    with _lock:
+        by_role = _loop_engines.pop(asyncio.get_running_loop(), None)
+    if by_role is None:
+        return
+    await by_role["primary"].dispose()
+    if by_role["replica"] is not by_role["primary"]:
+        await by_role["replica"].dispose()
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
@@ -20,3 +104,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for endpoints that never write. May lag the primary by the replication delay.
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def create_tables():
+    """
+    Creates missing tables. Run once per deploy (python -m scripts.init_db),
+    not on every API boot.
+    """
+    from app.models.base import Base
+    import app.models # Registers every model with Base
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
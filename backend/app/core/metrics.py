@@ -0,0 +1,178 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from app.core.config import settings
+from app.core.queues import ALL_QUEUES
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages span sub-second DB writes up to multi-minute LLM extractions
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Time spent in each content pipeline stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+PIPELINE_STAGE_ERRORS = Counter(
+    "pipeline_stage_errors_total",
+    "Pipeline stage invocations that raised",
+    ["stage"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by AI provider calls",
+    ["provider", "operation", "kind"],
+)
+TRANSCRIPT_REDUCTION_RATIO = Histogram(
+    "transcript_preprocess_reduction_ratio",
+    "Fraction of transcript characters removed by preprocessing",
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0),
+)
+REWRITE_REUSE_LOOKUPS = Counter(
+    "rewrite_reuse_lookups_total",
+    "Atom x platform rewrites checked against the similarity index (hit = earlier post reused)",
+    ["platform", "result"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+CELERY_TASKS_IN_FLIGHT = Gauge(
+    "celery_tasks_in_flight",
+    "Celery tasks currently executing",
+    ["task"],
+    multiprocess_mode="livesum",
+)
+
+# Extra callbacks receiving raw (stage, seconds) samples, e.g. benchmark percentiles
+stage_observers: List[Callable[[str, float], None]] = []
+
+@contextmanager
+def track_stage(stage: str):
+    """
+    Times a pipeline stage into PIPELINE_STAGE_SECONDS and counts failures.
+    Works around both sync and async code (`with track_stage("llm_extract"): ...`).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PIPELINE_STAGE_ERRORS.labels(stage=stage).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        PIPELINE_STAGE_SECONDS.labels(stage=stage).observe(elapsed)
+        for observer in stage_observers:
+            observer(stage, elapsed)
+
+def record_llm_usage(provider: str, operation: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+    """
+    Records token usage reported by an AI provider response (missing counts are skipped).
+    """
+    if prompt_tokens:
+        LLM_TOKENS.labels(provider=provider, operation=operation, kind="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(provider=provider, operation=operation, kind="completion").inc(completion_tokens)
+
+class CeleryQueueDepthCollector:
+    """
+    Reports broker queue depth at scrape time (LLEN on the Redis list backing each queue).
+    """
+    def __init__(self, redis_url: str, queues: Iterable[str]):
+        self.redis_url = redis_url
+        self.queues = list(queues)
+        self._client = None
+
+    def describe(self):
+        # Avoid touching Redis when the collector is registered
+        return []
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "celery_queue_depth",
+            "Messages waiting in each Celery broker queue",
+            labels=["queue"],
+        )
+        try:
+            if self._client is None:
+                import redis
+                self._client = redis.Redis.from_url(self.redis_url, socket_timeout=1)
+            for queue in self.queues:
+                gauge.add_metric([queue], self._client.llen(queue))
+        except Exception as e:
+            logger.warning(f"Could not read Celery queue depth: {e}")
+        yield gauge
+
+queue_depth_collector = CeleryQueueDepthCollector(settings.REDIS_URL, ALL_QUEUES)
+
+class DBPoolCollector:
+    """
+    Reports this process's SQLAlchemy connection pool usage per engine role (primary, replica) at scrape time.
+    """
+    def describe(self):
+        return []
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured persistent connections per pool", labels=["engine"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections currently in use", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size", labels=["engine"])
+        idle = GaugeMetricFamily("db_pool_checked_in", "Idle connections held by the pool", labels=["engine"])
+        try:
+            from app.core.database import engines
+            # Worker threads each have their own pools; report the sum per engine role
+            totals: Dict[str, List[int]] = {}
+            for name, db_engine in engines():
+                pool = db_engine.sync_engine.pool
+                if not hasattr(pool, "checkedout"):
+                    continue # Pools without accounting (e.g. NullPool, StaticPool)
+                stats = (pool.size(), pool.checkedout(), max(pool.overflow(), 0), pool.checkedin())
+                totals[name] = [a + b for a, b in zip(totals.get(name, [0, 0, 0, 0]), stats)]
+            for name, (pool_size, pool_checked_out, pool_overflow, pool_idle) in totals.items():
+                size.add_metric([name], pool_size)
+                checked_out.add_metric([name], pool_checked_out)
+                overflow.add_metric([name], pool_overflow)
+                idle.add_metric([name], pool_idle)
+        except Exception as e:
+            logger.warning(f"Could not read DB pool stats: {e}")
+        yield from (size, checked_out, overflow, idle)
+
+db_pool_collector = DBPoolCollector()
+
+def _multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+if not _multiprocess_enabled():
+    REGISTRY.register(queue_depth_collector)
+    REGISTRY.register(db_pool_collector)
+
+def build_registry() -> CollectorRegistry:
+    """
+    Returns the registry to expose. With PROMETHEUS_MULTIPROC_DIR set (uvicorn
+    workers, Celery prefork children) samples are merged from every process.
+    """
+    if _multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(queue_depth_collector)
+        registry.register(db_pool_collector) # Pools of the process serving the scrape
+        return registry
+    return REGISTRY
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(build_registry()), CONTENT_TYPE_LATEST
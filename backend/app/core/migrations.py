@@ -0,0 +1,116 @@
+"""
+Schema upgrades for databases created before a column, index or constraint existed.
+
+create_tables() creates missing tables but never alters existing ones. The steps
+below are explicit and idempotent: each checks the live schema and only issues DDL
+for what is missing, so `python -m scripts.init_db` is safe to run on every deploy.
+When a model gains a column on an existing table, add it to COLUMNS (and to
+AFTER_COLUMN if existing rows need a backfill); indexes and unique constraints
+declared on the models are created automatically.
+
+Written for PostgreSQL. SQLite databases (tests, benchmarks) are always created
+from scratch, and SQLite can't add NOT NULL columns with non-constant defaults.
+"""
+from typing import Dict, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import AddConstraint, UniqueConstraint
+
+from app.core.database import get_engine
+
+# (table, column, definition). NOT NULL columns get a default that backfills existing rows.
+COLUMNS: List[Tuple[str, str, str]] = [
+    ("transcripts", "created_at", "TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()"),
+    ("transcripts", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("transcripts", "schedule_version", "INTEGER NOT NULL DEFAULT 0"),
+    ("transcripts", "text_key", "VARCHAR"),
+    ("transcripts", "atoms_key", "VARCHAR"),
+    ("transcripts", "segments_key", "VARCHAR"),
+    ("transcripts", "video_id", "VARCHAR"),
+    ("transcripts", "generation_key", "VARCHAR"),
+    ("transcripts", "lease_owner", "VARCHAR"),
+    ("transcripts", "lease_expires_at", "TIMESTAMP WITHOUT TIME ZONE"),
+    ("content_atoms", "position", "INTEGER"),
+    ("content_atoms", "simhash", "BIGINT"),
+    ("content_atoms", "start_seconds", "FLOAT"),
+    ("content_atoms", "created_at", "TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()"),
+    ("posts", "created_at", "TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()"),
+    ("posts", "user_id", "UUID REFERENCES users (id)"),
+    ("users", "monthly_token_budget", "BIGINT"),
+]
+
+# Run right after the column is added: (description, SQL) pairs
+AFTER_COLUMN: Dict[Tuple[str, str], List[Tuple[str, str]]] = {
+    ("posts", "user_id"): [
+        ("posts backfilled with their transcript's user", """
+            UPDATE posts SET user_id = transcripts.user_id
+            FROM content_atoms JOIN transcripts ON content_atoms.transcript_id = transcripts.id
+            WHERE posts.content_atom_id = content_atoms.id
+        """),
+        ("posts.user_id set NOT NULL", "ALTER TABLE posts ALTER COLUMN user_id SET NOT NULL"),
+    ],
+}
+
+# Rows that would violate a unique constraint added to an existing table
+_DUPLICATE_POSTS = """
+    SELECT id FROM (
+        SELECT id, row_number() OVER (PARTITION BY content_atom_id, platform ORDER BY created_at, id) AS duplicate
+        FROM posts
+    ) ranked WHERE duplicate > 1
+"""
+BEFORE_CONSTRAINT: Dict[str, List[Tuple[str, str]]] = {
+    # Older workers could save a rewrite twice; keep the first post per atom and platform
+    "uq_posts_atom_platform": [
+        ("schedules of duplicate posts", f"DELETE FROM schedules WHERE post_id IN ({_DUPLICATE_POSTS})"),
+        ("duplicate posts", f"DELETE FROM posts WHERE id IN ({_DUPLICATE_POSTS})"),
+    ],
+}
+
+def _upgrade(conn) -> List[str]:
+    from app.models import Base # Registers every model with Base
+
+    applied: List[str] = []
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+
+    for table, column, definition in COLUMNS:
+        if table not in tables:
+            continue # Created complete by create_tables()
+        if column in {c["name"] for c in inspector.get_columns(table)}:
+            continue
+        conn.execute(text(f'ALTER TABLE {table} ADD COLUMN "{column}" {definition}'))
+        applied.append(f"added column {table}.{column}")
+        for description, statement in AFTER_COLUMN.get((table, column), []):
+            conn.execute(text(statement))
+            applied.append(description)
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(conn)
+                applied.append(f"created index {index.name}")
+
+        existing = {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint) or not constraint.name or constraint.name in existing:
+                continue
+            for rows, statement in BEFORE_CONSTRAINT.get(constraint.name, []):
+                removed = conn.execute(text(statement)).rowcount
+                if removed:
+                    applied.append(f"deleted {removed} {rows} ({constraint.name})")
+            conn.execute(AddConstraint(constraint))
+            applied.append(f"added constraint {constraint.name}")
+    return applied
+
+async def upgrade_schema() -> List[str]:
+    """
+    Brings existing tables up to the models in one transaction. Returns what was changed.
+    """
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        return []
+    async with engine.begin() as conn:
+        return await conn.run_sync(_upgrade)
@@ -0,0 +1,2 @@
+# Platforms every content atom is rewritten for
+PLATFORMS = ["twitter", "linkedin"]
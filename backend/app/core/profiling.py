@@ -0,0 +1,96 @@
+import os
+import re
+import time
+import random
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ProfileRateLimiter:
+    """
+    Sliding one-minute window shared by every profiled request/task in this process,
+    so profiling can stay enabled in production without compounding overhead.
+    """
+    def __init__(self, max_per_minute: int):
+        self.max_per_minute = max_per_minute
+        self._started = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            while self._started and now - self._started[0] > 60:
+                self._started.popleft()
+            if len(self._started) >= self.max_per_minute:
+                return False
+            self._started.append(now)
+            return True
+
+rate_limiter = ProfileRateLimiter(settings.PROFILING_MAX_PER_MINUTE)
+
+def is_profile_requested(header_value: Optional[str]) -> bool:
+    """
+    Checks the opt-in header. When PROFILING_TOKEN is set the header must carry it.
+    """
+    if not header_value:
+        return False
+    if settings.PROFILING_TOKEN:
+        return header_value == settings.PROFILING_TOKEN
+    return header_value.lower() in ("1", "true", "yes")
+
+def should_profile(requested: bool = False) -> bool:
+    if not settings.PROFILING_ENABLED:
+        return False
+    if not requested and random.random() >= settings.PROFILING_SAMPLE_RATE:
+        return False
+    return rate_limiter.acquire()
+
+def _profile_path(kind: str, ident: str) -> str:
+    safe_ident = re.sub(r"[^A-Za-z0-9_.-]", "_", ident)
+    return os.path.join(settings.PROFILING_OUTPUT_DIR, f"{kind}-{safe_ident}.speedscope.json")
+
+@contextmanager
+def profile_block(kind: str, ident: str, requested: bool = False):
+    """
+    Runs the enclosed block under pyinstrument's statistical profiler when sampled
+    (or explicitly requested) and writes speedscope/flamegraph JSON named after `ident`.
+    Yields the output path, or None when the block is not profiled.
+    """
+    if not should_profile(requested):
+        yield None
+        return
+
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+    except ImportError:
+        logger.warning("Profiling enabled but pyinstrument is not installed")
+        yield None
+        return
+
+    path = _profile_path(kind, ident)
+    profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+    try:
+        profiler.start()
+    except RuntimeError as e:
+        # Another profiler already owns this thread/async context
+        logger.warning(f"Skipping profile {ident}: {e}")
+        yield None
+        return
+
+    try:
+        yield path
+    finally:
+        profiler.stop()
+        try:
+            os.makedirs(settings.PROFILING_OUTPUT_DIR, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(profiler.output(renderer=SpeedscopeRenderer()))
+            logger.info(f"Profile written: {path}")
+        except Exception as e:
+            logger.error(f"Failed to write profile {path}: {e}")
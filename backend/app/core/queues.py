@@ -0,0 +1,27 @@
+"""
+Celery queue names and the worker pool that serves each one.
+
+Kept free of Celery imports so the API process (routing, metrics) can use it.
+"""
+from dataclasses import dataclass
+from app.core.config import settings
+
+TRANSCRIPTION_QUEUE = "transcription" # Whisper: long, CPU-bound
+GENERATION_QUEUE = "generation" # LLM extraction/rewrites: I/O-bound
+PUBLISHING_QUEUE = "publishing" # Platform API calls: short, I/O-bound
+DEFAULT_QUEUE = GENERATION_QUEUE # Anything unrouted (e.g. test_celery_task)
+
+ALL_QUEUES = [TRANSCRIPTION_QUEUE, GENERATION_QUEUE, PUBLISHING_QUEUE]
+
+@dataclass(frozen=True)
+class QueueWorker:
+    pool: str # prefork, threads or gevent
+    concurrency: int
+    max_tasks_per_child: int = 0 # prefork only; 0 = never recycle
+
+QUEUE_WORKERS = {
+    TRANSCRIPTION_QUEUE: QueueWorker("prefork", settings.CELERY_TRANSCRIPTION_CONCURRENCY, max_tasks_per_child=20),
+    # Threads, not gevent: each thread drives its own asyncio loop, with its own DB and AI pools (app/workers/event_loop.py)
+    GENERATION_QUEUE: QueueWorker("threads", settings.CELERY_GENERATION_CONCURRENCY),
+    PUBLISHING_QUEUE: QueueWorker("threads", settings.CELERY_PUBLISHING_CONCURRENCY),
+}
@@ -0,0 +1,21 @@
+from typing import Any
+from uuid import UUID
+import orjson
+from fastapi.responses import JSONResponse
+
+def orjson_default(value: Any):
+    # orjson only serializes uuid.UUID itself; asyncpg returns a subclass
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    Routes return it directly with plain rows (dicts of UUID/date/str values),
+    which skips FastAPI's response_model validation and jsonable_encoder pass.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default)
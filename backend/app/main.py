@@ -1,8 +1,12 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.routes.content import router as content_router
+from app.api.routes.usage import router as usage_router
+from app.core.metrics import HTTP_REQUEST_SECONDS, render_metrics
+from app.core.profiling import is_profile_requested, profile_block
+import uuid
 import time
 import logging
 
@@ -11,18 +15,21 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api")
 
 from contextlib import asynccontextmanager
-from app.core.database import engine
-from app.models.base import Base
 # Import all models to ensure they are registered with Base
-from app.models import user, content
+from app.models import user, content, usage
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Schema creation is a deploy step (python -m scripts.init_db); opt in for local development
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        from app.core.database import create_tables
+        await create_tables()
     yield
-    # Shutdown
+    # Shutdown: close pooled AI provider connections and the yt-dlp thread pool
+    from app.services.ai.factory import close_ai_providers
+    from app.services.youtube_metadata_service import shutdown_metadata_pool
+    await close_ai_providers()
+    shutdown_metadata_pool()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -35,9 +42,26 @@ async def log_requests(request: Request, call_next):
     start_time = time.time()
     response = await call_next(request)
     process_time = time.time() - start_time
+    # Label by route template, not raw path, to keep UUIDs out of the label set
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.labels(
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    ).observe(process_time)
     logger.info(f"Path: {request.url.path} Method: {request.method} Status: {response.status_code} Duration: {process_time:.4f}s")
     return response
 
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    requested = is_profile_requested(request.headers.get(settings.PROFILING_HEADER))
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    with profile_block("request", request_id, requested=requested) as profile_path:
+        response = await call_next(request)
+    if profile_path:
+        response.headers["X-Profile-Id"] = request_id
+    return response
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Global error: {exc}")
@@ -70,7 +94,21 @@ async def transcript_access_denied_handler(request: Request, exc: TranscriptAcce
         },
     )
 
+from app.services.usage_service import TokenBudgetExceededError
+
+@app.exception_handler(TokenBudgetExceededError)
+async def token_budget_exceeded_handler(request: Request, exc: TokenBudgetExceededError):
+    logger.warning(f"Token budget exceeded: {exc.reason}")
+    return JSONResponse(
+        status_code=429,
+        content={
+            "error": "TOKEN_BUDGET_EXCEEDED",
+            "reason": exc.reason
+        },
+    )
+
 app.include_router(content_router, prefix=f"{settings.API_V1_STR}/content", tags=["content"])
+app.include_router(usage_router, prefix=f"{settings.API_V1_STR}/usage", tags=["usage"])
 
 # Set all CORS enabled origins
 app.add_middleware(
@@ -85,6 +123,11 @@ app.add_middleware(
 def health_check():
     return {"status": "ok", "app": settings.PROJECT_NAME}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Video Repurposing API"}
@@ -1,3 +1,4 @@
 from app.models.base import Base
 from app.models.user import User
-from app.models.content import Transcript, ContentAtom, Post, Schedule
+from app.models.content import Transcript, ContentAtom, Post, Schedule, VideoOutput
+from app.models.usage import AIUsage
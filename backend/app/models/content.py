@@ -1,11 +1,19 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, ForeignKey, Boolean, DateTime, Uuid
+from typing import Optional
+from sqlalchemy import String, Text, ForeignKey, Boolean, DateTime, Uuid, Index, Integer, BigInteger, Float, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
 class Transcript(Base):
     __tablename__ = "transcripts"
+    __table_args__ = (
+        # Keyset pagination: newest-first listing per user, optionally filtered by status
+        Index("ix_transcripts_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_transcripts_user_status_created_id", "user_id", "status", "created_at", "id"),
+    )
+    # Fetch server-computed version stamps via RETURNING so they never lazy-load in async code
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -18,9 +26,34 @@ class Transcript(Base):
     status: Mapped[str] = mapped_column(String, default="queued", nullable=False)
     error_message: Mapped[str] = mapped_column(Text, nullable=True)
     source_type: Mapped[str] = mapped_column(String, default="transcript", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    # Version stamps backing HTTP ETags: `version` is bumped on every row update,
+    # `schedule_version` whenever the transcript's schedule is (re)generated.
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, onupdate=text("version + 1"), nullable=False
+    )
+    schedule_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Artifact store keys (app/services/artifact_store.py) for payloads passed between tasks
+    text_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    atoms_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Caption timings as a compact blob (app/services/segment_store.py); None for metadata/Whisper sources
+    segments_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Normalized YouTube video ID and hash of the generation parameters (app/services/video_output_service.py)
+    video_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    generation_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Processing lease (app/workers/lease.py): one worker per transcript at a time
+    lease_owner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
 class ContentAtom(Base):
     __tablename__ = "content_atoms"
+    __table_args__ = (
+        Index("ix_content_atoms_transcript_created_id", "transcript_id", "created_at", "id"),
+        # One row per extracted atom, so a resumed job can't insert duplicates
+        UniqueConstraint("transcript_id", "position", name="uq_content_atoms_transcript_position"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -30,9 +63,21 @@ class ContentAtom(Base):
     )
     type: Mapped[str] = mapped_column(String, nullable=False) # insight, opinion, lesson, quote
     text: Mapped[str] = mapped_column(Text, nullable=False)
+    position: Mapped[Optional[int]] = mapped_column(Integer, nullable=True) # Index in the extracted atom set
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True) # app/services/rewrite_reuse.py
+    start_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True) # Where in the video the atom was said, if located
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_atom_platform_included", "content_atom_id", "platform", "included"),
+        # Keyset pagination: newest-first listing per user without joining atoms and transcripts
+        Index("ix_posts_user_created_id", "user_id", "created_at", "id"),
+        UniqueConstraint("content_atom_id", "platform", name="uq_posts_atom_platform"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -40,12 +85,43 @@ class Post(Base):
     content_atom_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("content_atoms.id"), nullable=False
     )
+    # Copied from the atom's transcript
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id"), nullable=False
+    )
     platform: Mapped[str] = mapped_column(String, nullable=False) # twitter, linkedin
     text: Mapped[str] = mapped_column(Text, nullable=False)
     included: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+class VideoOutput(Base):
+    """
+    The completed transcript whose output is reused for repeat submissions of a video.
+    """
+    __tablename__ = "video_outputs"
+    __table_args__ = (
+        UniqueConstraint("video_id", "generation_key", name="uq_video_outputs_video_generation"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    video_id: Mapped[str] = mapped_column(String, nullable=False)
+    generation_key: Mapped[str] = mapped_column(String, nullable=False)
+    transcript_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("transcripts.id"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        Index("ix_schedules_post_id", "post_id"), # Joins from posts (preview, novelty scoring)
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import String, ForeignKey, DateTime, Uuid, Index, Integer, Float
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class AIUsage(Base):
+    """
+    One row per provider call made while processing a transcript.
+    """
+    __tablename__ = "ai_usage"
+    __table_args__ = (
+        Index("ix_ai_usage_transcript_id", "transcript_id"),
+        Index("ix_ai_usage_created_at", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    transcript_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("transcripts.id"), nullable=False
+    )
+    provider: Mapped[str] = mapped_column(String, nullable=False) # openai, gemini, mock
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    operation: Mapped[str] = mapped_column(String, nullable=False) # extract, extract_metadata, rewrite
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
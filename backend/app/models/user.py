@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Uuid
+from typing import Optional
+from sqlalchemy import String, DateTime, Uuid, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
@@ -14,3 +15,5 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
+    # Tokens per calendar month (UTC); None falls back to settings.DEFAULT_MONTHLY_TOKEN_BUDGET
+    monthly_token_budget: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
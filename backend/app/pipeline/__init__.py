@@ -0,0 +1 @@
+from app.pipeline.engine import Pipeline, Stage, StageError
@@ -0,0 +1,355 @@
+"""
+Content generation as stage graphs.
+
+    transcript: fetch_source -> extract_atoms -> plan_rewrites -> rewrite -> save_posts
+    metadata:   fetch_metadata -> extract_atoms -> plan_rewrites -> rewrite -> save_posts
+    whisper:    transcribe -> fetch_source -> extract_atoms -> ...
+
+Items are small msgpack-friendly dicts keyed by transcript_id; large payloads go
+through the artifact store. Every stage opens its own session, so any stage can be
+retried or run on a different worker: the source and extraction stages hold the
+transcript lease and skip work already recorded on the transcript, and repeated post
+saves are no-ops (uq_posts_atom_platform). The transcript is marked completed by
+whichever save_posts finds the last rewrite in place.
+"""
+import asyncio
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import track_stage
+from app.core.platforms import PLATFORMS
+from app.core.queues import TRANSCRIPTION_QUEUE
+from app.models.content import Transcript, ContentAtom, Post
+from app.pipeline.engine import Pipeline, Stage
+from app.services.ai.usage import AICallUsage, collect_usage
+from app.services.ai_service import AIService
+from app.services.artifact_store import get_artifact_store
+from app.services.rewrite_reuse import simhash, reuse_rewrites
+from app.services.segment_store import TranscriptSegments
+from app.services.usage_service import usage_rows
+from app.services.video_output_service import register_video_output
+
+REWRITE_CONCURRENCY = 4 # Per job, in-process; distributed it is the generation worker concurrency
+
+Item = Dict[str, Any]
+
+async def _load_transcript(db, transcript_id: str) -> Optional[Transcript]:
+    result = await db.execute(select(Transcript).where(Transcript.id == UUID(transcript_id)))
+    return result.scalars().first()
+
+async def mark_failed(transcript_id: str, reason: str, calls: List[AICallUsage] = ()):
+    async with AsyncSessionLocal() as db:
+        transcript = await _load_transcript(db, transcript_id)
+        if transcript:
+            transcript.status = "failed"
+            transcript.error_message = reason
+            db.add(transcript)
+            db.add_all(usage_rows(transcript.id, calls))
+            await db.commit()
+
+async def _finalize_if_complete(db, transcript_id: UUID, expected_posts: int) -> bool:
+    """
+    Marks the transcript completed once all `expected_posts` (atoms x platforms) exist.
+    Safe to call concurrently: only the first caller flips the status.
+    """
+    post_count = (await db.execute(
+        select(func.count()).select_from(Post)
+        .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+        .where(ContentAtom.transcript_id == transcript_id)
+    )).scalar_one()
+    if not expected_posts or post_count < expected_posts:
+        return False
+
+    result = await db.execute(
+        update(Transcript)
+        .where(Transcript.id == transcript_id, Transcript.status != "completed")
+        .values(status="completed", error_message=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount:
+        print(f"Successfully saved {expected_posts // len(PLATFORMS)} atoms for transcript {transcript_id}")
+        await register_video_output(db, transcript_id)
+    return True
+
+# --- Source stages ---
+
+async def transcribe(item: Item) -> Optional[Item]:
+    """
+    Whisper transcription (CPU-bound; runs on the transcription queue).
+    """
+    from app.services.transcript_service import TranscriptService
+    from app.services.whisper_service import WhisperTranscriptionService
+
+    async with AsyncSessionLocal() as db:
+        transcript = await _load_transcript(db, item["transcript_id"])
+        if not transcript:
+            print(f"Transcript {item['transcript_id']} not found.")
+            return None
+        if transcript.raw_text:
+            return item # Already transcribed by an earlier attempt
+
+        video_id = TranscriptService().extract_video_id(transcript.youtube_url)
+        if not video_id:
+            await mark_failed(item["transcript_id"], "Could not extract video ID from URL")
+            return None
+
+        transcript_text = await asyncio.to_thread(WhisperTranscriptionService().transcribe, video_id)
+        transcript.raw_text = transcript_text
+        transcript.text_key = get_artifact_store().put_text(transcript_text, kind="transcript")
+        db.add(transcript)
+        await db.commit()
+        print(f"Whisper transcription completed for {video_id}.")
+    return item
+
+async def fetch_source(item: Item) -> Optional[Item]:
+    """
+    Marks the job as processing and makes sure transcript text (or, failing
+    that, video metadata) is available.
+    """
+    from app.services.transcript_service import TranscriptService
+
+    async with AsyncSessionLocal() as db:
+        transcript = await _load_transcript(db, item["transcript_id"])
+        if not transcript:
+            print(f"Transcript {item['transcript_id']} not found.")
+            return None
+        if transcript.status == "completed":
+            print(f"Transcript {item['transcript_id']} already completed; ignoring duplicate delivery.")
+            return None
+
+        # Update Status: Processing
+        transcript.status = "processing"
+        db.add(transcript)
+        await db.commit()
+
+        if transcript.raw_text or transcript.atoms_key:
+            return item
+
+        try:
+            print(f"Transcript text missing in DB. Fetching for URL: {transcript.youtube_url}")
+            result = await TranscriptService().get_transcript_async(transcript.youtube_url)
+
+            if isinstance(result, dict) and result.get("mode") == "metadata":
+                print("Transcript unavailable. Swapping to Metadata mode.")
+                transcript.raw_text = "METADATA_FALLBACK" # Placeholder value to satisfy not-null constraint
+                transcript.source_type = "metadata"
+                item = {**item, "metadata_key": get_artifact_store().put_object(result.get("data"), kind="metadata")}
+            elif isinstance(result, str):
+                transcript.raw_text = result
+                transcript.source_type = "transcript"
+                if getattr(result, "segments", None) is not None:
+                    transcript.segments_key = get_artifact_store().put_bytes(result.segments.to_bytes(), kind="segments")
+            else:
+                raise Exception("Unknown result from transcript service")
+            db.add(transcript)
+            await db.commit()
+        except Exception as e:
+            print(f"Failed to fetch transcript/metadata: {e}")
+            await mark_failed(item["transcript_id"], f"Failed to fetch content source: {str(e)}")
+            return None
+    return item
+
+async def fetch_metadata(item: Item) -> Optional[Item]:
+    """
+    Source stage for jobs the API already switched to metadata mode.
+    """
+    from app.services.youtube_metadata_service import YouTubeMetadataService
+
+    async with AsyncSessionLocal() as db:
+        transcript = await _load_transcript(db, item["transcript_id"])
+        if not transcript:
+            print(f"Transcript {item['transcript_id']} not found.")
+            return None
+        if transcript.status == "completed":
+            return None
+
+        transcript.status = "processing"
+        db.add(transcript)
+        await db.commit()
+
+        if transcript.atoms_key or item.get("metadata_key"):
+            return item
+
+        try:
+            with track_stage("metadata_fallback"):
+                metadata = await YouTubeMetadataService().fetch_metadata_async(transcript.youtube_url)
+        except Exception as e:
+            print(f"Failed to fetch metadata: {e}")
+            await mark_failed(item["transcript_id"], f"Failed to fetch content source: {str(e)}")
+            return None
+    return {**item, "metadata_key": get_artifact_store().put_object(metadata, kind="metadata")}
+
+# --- Shared tail ---
+
+async def extract_atoms(item: Item) -> Optional[Item]:
+    store = get_artifact_store()
+    async with AsyncSessionLocal() as db:
+        transcript = await _load_transcript(db, item["transcript_id"])
+        if not transcript:
+            return None
+        if transcript.atoms_key:
+            # A previous attempt already paid for extraction
+            return {**item, "atoms_key": transcript.atoms_key, "segments_key": transcript.segments_key, "user_id": str(transcript.user_id)}
+
+        ai_service = AIService()
+        with collect_usage() as usage:
+            if item.get("metadata_key"):
+                from app.services.ai.metadata_pipeline import MetadataPipeline
+                pipeline = MetadataPipeline(ai_service)
+                atoms_data = await pipeline.generate_content_from_metadata(store.get_object(item["metadata_key"]))
+            else:
+                atoms_data = await ai_service.extract_content_atoms(transcript.raw_text)
+
+        if not atoms_data:
+            print("No atoms extracted.")
+            await mark_failed(item["transcript_id"], "No content atoms extracted from AI response.", usage.calls)
+            return None
+
+        transcript.atoms_key = store.put_object(atoms_data, kind="atoms")
+        db.add(transcript)
+        db.add_all(usage_rows(transcript.id, usage.calls))
+        with track_stage("db_write"):
+            await db.commit()
+    return {**item, "atoms_key": transcript.atoms_key, "segments_key": transcript.segments_key, "user_id": str(transcript.user_id)}
+
+async def plan_rewrites(item: Item) -> List[Item]:
+    """
+    Saves the atom set (once per position) and fans out one unit per
+    atom x platform that doesn't have a post yet, so retries resume where they stopped.
+    """
+    store = get_artifact_store()
+    atoms_data = store.get_object(item["atoms_key"])
+    transcript_id = UUID(item["transcript_id"])
+    # Caption timings stored with the transcript; atoms found in the text get a timestamp
+    segments = TranscriptSegments.from_bytes(store.get_bytes(item["segments_key"])) if item.get("segments_key") else None
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ContentAtom).where(ContentAtom.transcript_id == transcript_id, ContentAtom.position.is_not(None))
+        )
+        existing = {atom.position: atom for atom in result.scalars().all()}
+
+        atoms = []
+        for position, atom in enumerate(atoms_data):
+            content_atom = existing.get(position)
+            if content_atom is None:
+                content_atom = ContentAtom(
+                    transcript_id=transcript_id,
+                    type=atom.get("type", "insight"),
+                    text=atom.get("text", ""),
+                    position=position,
+                )
+                content_atom.simhash = simhash(content_atom.text)
+                if segments is not None:
+                    content_atom.start_seconds = segments.timestamp_of(content_atom.text)
+                db.add(content_atom)
+            atoms.append(content_atom)
+        with track_stage("db_write"):
+            await db.commit()
+
+        result = await db.execute(
+            select(Post.content_atom_id, Post.platform)
+            .where(Post.content_atom_id.in_([atom.id for atom in atoms]))
+        )
+        done = {tuple(row) for row in result.all()}
+        expected_posts = len(atoms) * len(PLATFORMS)
+        if done:
+            print(f"Resuming transcript {transcript_id}: {len(done)}/{expected_posts} rewrites already saved")
+
+        units = [
+            {
+                "transcript_id": item["transcript_id"],
+                "user_id": item["user_id"],
+                "atom_id": str(atom.id),
+                "text": atom.text,
+                "platform": platform,
+                "expected_posts": expected_posts,
+            }
+            for atom in atoms
+            for platform in PLATFORMS
+            if (atom.id, platform) not in done
+        ]
+        if not units:
+            await _finalize_if_complete(db, transcript_id, expected_posts)
+        else:
+            reused = await reuse_rewrites(db, transcript_id, units, {str(atom.id): atom.simhash for atom in atoms})
+            if reused:
+                print(f"Reusing {reused}/{len(units)} rewrites from similar earlier atoms for transcript {transcript_id}")
+    return units
+
+async def rewrite(unit: Item) -> Item:
+    if "rewritten" in unit:
+        return unit # Reused from a similar earlier atom
+    with collect_usage() as usage:
+        rewritten_text = await AIService().rewrite_content(unit["text"], unit["platform"])
+    return {**unit, "rewritten": rewritten_text, "usage": [asdict(call) for call in usage.calls]}
+
+def _post_rows(unit: Item) -> list:
+    transcript_id = UUID(unit["transcript_id"])
+    post = Post(
+        content_atom_id=UUID(unit["atom_id"]),
+        user_id=UUID(unit["user_id"]),
+        platform=unit["platform"],
+        text=unit["rewritten"],
+        included=True
+    )
+    return [post] + usage_rows(transcript_id, [AICallUsage(**call) for call in unit["usage"]])
+
+async def save_posts(units: List[Item]) -> List[Item]:
+    """
+    Commits every rewrite that has finished so far in one transaction.
+    """
+    async with AsyncSessionLocal() as db:
+        for unit in units:
+            db.add_all(_post_rows(unit))
+        try:
+            with track_stage("db_write"):
+                await db.commit()
+        except IntegrityError:
+            # A duplicate delivery saved some of these first; save the rest one by one
+            await db.rollback()
+            for unit in units:
+                db.add_all(_post_rows(unit))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # Its calls were still billed
+                    await db.rollback()
+                    db.add_all(_post_rows(unit)[1:])
+                    await db.commit()
+
+        expected = {unit["transcript_id"]: unit["expected_posts"] for unit in units}
+        for transcript_id, expected_posts in expected.items():
+            await _finalize_if_complete(db, UUID(transcript_id), expected_posts)
+    return [{"transcript_id": u["transcript_id"], "atom_id": u["atom_id"], "platform": u["platform"]} for u in units]
+
+REWRITE_TAIL = [
+    Stage("extract_atoms", extract_atoms, concurrency=1, leased=True),
+    Stage("plan_rewrites", plan_rewrites, fan_out=True),
+    Stage("rewrite", rewrite, concurrency=REWRITE_CONCURRENCY, queue_size=REWRITE_CONCURRENCY * 2),
+    # One writer keeps SQLite happy in-process; distributed, unique constraints make saves idempotent
+    Stage("save_posts", save_posts, batch_size=REWRITE_CONCURRENCY * 4, batch_wait=0.05),
+]
+
+TRANSCRIPT_PIPELINE = Pipeline("transcript", [Stage("fetch_source", fetch_source, leased=True)] + REWRITE_TAIL)
+METADATA_PIPELINE = Pipeline("metadata", [Stage("fetch_metadata", fetch_metadata, leased=True)] + REWRITE_TAIL)
+WHISPER_PIPELINE = Pipeline(
+    "whisper",
+    [Stage("transcribe", transcribe, queue=TRANSCRIPTION_QUEUE, leased=True), Stage("fetch_source", fetch_source, leased=True)] + REWRITE_TAIL,
+)
+
+PIPELINES = {p.name: p for p in (TRANSCRIPT_PIPELINE, METADATA_PIPELINE, WHISPER_PIPELINE)}
+
+async def pipeline_for(transcript_id: UUID) -> Pipeline:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Transcript.source_type).where(Transcript.id == transcript_id)
+        )
+        row = result.first()
+    if row and row.source_type == "metadata":
+        return METADATA_PIPELINE
+    return TRANSCRIPT_PIPELINE
@@ -0,0 +1,61 @@
+"""
+Runs pipeline stages as Celery tasks: each item of each stage is one
+run_stage_task message on that stage's queue, so stages scale with the
+workers consuming their queue (see app/core/queues.py).
+
+Backpressure: before doing its work, a stage task checks the broker backlog of
+the queue its outputs go to and, above PIPELINE_MAX_BACKLOG, re-queues itself
+with a delay instead of piling more work downstream.
+
+Stages marked `leased` (source fetch, transcription, atom extraction) hold the
+transcript's lease while they run, as a whole in-process run does; a delivery
+that finds it held is retried once the lease expires.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+from app.core.config import settings
+from app.pipeline.engine import Pipeline
+
+RUN_STAGE_TASK = "app.workers.tasks.run_stage_task"
+
+@lru_cache(maxsize=1)
+def _redis():
+    import redis
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+def submit(pipeline: Pipeline, item: Any, stage_index: int = 0, countdown: Optional[float] = None):
+    from app.workers.celery_app import celery_app
+    stage = pipeline.stages[stage_index]
+    celery_app.send_task(
+        RUN_STAGE_TASK,
+        args=[pipeline.name, stage_index, item],
+        queue=stage.queue,
+        countdown=countdown,
+    )
+
+def downstream_backlogged(pipeline: Pipeline, stage_index: int) -> bool:
+    if stage_index + 1 >= len(pipeline.stages) or not settings.PIPELINE_MAX_BACKLOG:
+        return False
+    queue = pipeline.stages[stage_index + 1].queue
+    try:
+        return _redis().llen(queue) > settings.PIPELINE_MAX_BACKLOG
+    except Exception:
+        return False # Never stall the pipeline because the depth probe failed
+
+async def run_stage(pipeline: Pipeline, stage_index: int, item: Any) -> int:
+    """
+    Runs one stage on one item and submits its outputs to the next stage.
+    Returns the number of outputs.
+    """
+    stage = pipeline.stages[stage_index]
+    if stage.leased:
+        # Duplicate deliveries of the expensive stages wait for the holder instead of paying twice
+        from app.workers.lease import run_leased
+        outputs = await run_leased(UUID(item["transcript_id"]), lambda: stage.process([item])) or []
+    else:
+        outputs = await stage.process([item])
+    if stage_index + 1 < len(pipeline.stages):
+        for output in outputs:
+            submit(pipeline, output, stage_index + 1)
+    return len(outputs)
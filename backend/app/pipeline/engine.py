@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+from app.core.queues import GENERATION_QUEUE
+
+logger = logging.getLogger(__name__)
+
+StageFn = Callable[[Any], Awaitable[Any]]
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline. `fn` receives an item and returns the item for the
+    next stage, None to drop it, or (with fan_out=True) a list of items. With
+    batch_size > 1, `fn` receives a list of up to that many items (whatever is
+    queued after lingering `batch_wait` seconds) and returns a list of outputs.
+
+    In-process, `concurrency` workers pull from a queue of at most `queue_size`
+    items, so a slow stage blocks its upstream instead of buffering everything.
+    Distributed, each item runs as a Celery task on `queue`; with `leased`, that
+    task holds the item's transcript lease (in-process the whole run holds it).
+    """
+    name: str
+    fn: StageFn
+    concurrency: int = 1
+    queue_size: int = 16
+    fan_out: bool = False
+    batch_size: int = 1
+    batch_wait: float = 0.0
+    queue: str = GENERATION_QUEUE
+    leased: bool = False
+
+    def outputs(self, result: Any) -> List[Any]:
+        if result is None:
+            return []
+        if self.fan_out:
+            return list(result)
+        return [result]
+
+    async def process(self, items: List[Any]) -> List[Any]:
+        if self.batch_size > 1:
+            return list(await self.fn(items) or [])
+        outputs = []
+        for item in items:
+            outputs.extend(self.outputs(await self.fn(item)))
+        return outputs
+
+class StageError(Exception):
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+        super().__init__(f"Stage '{stage}' failed: {error}")
+
+@dataclass(frozen=True)
+class Pipeline:
+    name: str
+    stages: List[Stage]
+
+    def __post_init__(self):
+        if not self.stages:
+            raise ValueError(f"Pipeline {self.name} has no stages")
+
+    def stage_index(self, name: str) -> int:
+        for index, stage in enumerate(self.stages):
+            if stage.name == name:
+                return index
+        raise KeyError(f"Pipeline {self.name} has no stage {name}")
+
+    async def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Runs every item through all stages in this process and returns what the
+        last stage emitted. A failing item is dropped while the rest keep flowing,
+        so work already done still reaches the stages that persist it; the first
+        failure is raised as StageError once the run has drained.
+        """
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        results: List[Any] = []
+        errors: List[StageError] = []
+
+        async def worker(index: int, stage: Stage):
+            queue = queues[index]
+            downstream: Optional[asyncio.Queue] = queues[index + 1] if index + 1 < len(queues) else None
+            while True:
+                batch = [await queue.get()]
+                if stage.batch_wait and queue.qsize() < stage.batch_size - 1:
+                    await asyncio.sleep(stage.batch_wait)
+                while len(batch) < stage.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                try:
+                    for output in await stage.process(batch):
+                        if downstream is None:
+                            results.append(output)
+                        else:
+                            await downstream.put(output) # Blocks while the next stage is saturated
+                except Exception as e:
+                    logger.warning(f"Pipeline {self.name}: stage {stage.name} failed: {e}")
+                    errors.append(StageError(stage.name, e))
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+
+        workers = [
+            [asyncio.create_task(worker(index, stage)) for _ in range(stage.concurrency)]
+            for index, stage in enumerate(self.stages)
+        ]
+
+        async def drive():
+            for item in items:
+                await queues[0].put(item)
+            # Stage N is finished once its queue drains, which also means all its outputs are queued downstream
+            for index, queue in enumerate(queues):
+                await queue.join()
+                for task in workers[index]:
+                    task.cancel()
+
+        try:
+            await drive()
+        finally:
+            pending = [task for stage_workers in workers for task in stage_workers]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+        return results
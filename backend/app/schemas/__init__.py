@@ -2,5 +2,16 @@ from app.schemas.content import (
     CreateContentRequest,
     ContentStatusResponse,
     PostResponse,
+    PostListResponse,
+    TranscriptSummaryResponse,
+    TranscriptListResponse,
+    ContentAtomResponse,
+    ContentAtomListResponse,
     SchedulePreviewResponse,
+    AIUsageResponse,
+    UsageTotals,
+    TranscriptUsageResponse,
+    TranscriptUsageSummary,
+    OperationUsageSummary,
+    UsageSummaryResponse,
 )
@@ -1,12 +1,13 @@
-from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Optional
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
 class CreateContentRequest(BaseModel):
     url: HttpUrl
     tone: str
     emoji_usage: str
+    regenerate: bool = False # Skip reusing earlier output for the same video and parameters
 
 class ContentStatusResponse(BaseModel):
     id: UUID
@@ -21,9 +22,93 @@ class PostResponse(BaseModel):
     platform: str
     content: str
     included: bool
+    content_atom_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+
+class PostListResponse(BaseModel):
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None
+
+class PostFilter(BaseModel):
+    transcript_id: Optional[UUID] = None
+    platform: Optional[str] = None
+    atom_type: Optional[str] = None
+
+class BulkPostUpdateRequest(BaseModel):
+    include_ids: List[UUID] = Field(default_factory=list, max_length=5000)
+    exclude_ids: List[UUID] = Field(default_factory=list, max_length=5000)
+    include_where: Optional[PostFilter] = None # {} matches every post of the user
+    exclude_where: Optional[PostFilter] = None
+
+class BulkPostUpdateResponse(BaseModel):
+    included: int = 0 # Posts switched to included
+    excluded: int = 0
+
+class TranscriptSummaryResponse(BaseModel):
+    id: UUID
+    youtube_url: str
+    status: str
+    content_source: str
+    created_at: datetime
+
+class TranscriptListResponse(BaseModel):
+    items: List[TranscriptSummaryResponse]
+    next_cursor: Optional[str] = None
+
+class ContentAtomResponse(BaseModel):
+    id: UUID
+    transcript_id: UUID
+    type: str
+    text: str
+    start_seconds: Optional[float] = None # Position in the video, when the atom was located in the captions
+    created_at: datetime
+
+class ContentAtomListResponse(BaseModel):
+    items: List[ContentAtomResponse]
+    next_cursor: Optional[str] = None
 
 class SchedulePreviewResponse(BaseModel):
     id: UUID
     date: date
     platform: str
     preview: str
+
+class AIUsageResponse(BaseModel):
+    provider: str
+    model: str
+    operation: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+    cost_usd: float
+    created_at: datetime
+
+class UsageTotals(BaseModel):
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cost_usd: float = 0.0
+    avg_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+class TranscriptUsageResponse(BaseModel):
+    transcript_id: UUID
+    totals: UsageTotals
+    calls: List[AIUsageResponse]
+
+class TranscriptUsageSummary(UsageTotals):
+    transcript_id: UUID
+
+class OperationUsageSummary(UsageTotals):
+    provider: str
+    model: str
+    operation: str
+
+class UsageSummaryResponse(BaseModel):
+    since: datetime
+    totals: UsageTotals
+    by_operation: List[OperationUsageSummary]
+    top_transcripts: List[TranscriptUsageSummary]
+    token_budget: Optional[int] = None
+    tokens_used_this_month: int = 0
@@ -45,3 +45,10 @@ class AIProvider(ABC):
             str: The rewritten text.
         """
         pass
+
+    async def close(self) -> None:
+        """
+        Release pooled network resources (HTTP connections).
+        Called by the provider registry on shutdown; default is a no-op.
+        """
+        pass
@@ -1,16 +1,29 @@
+import asyncio
+import weakref
 from app.core.config import settings
 from app.services.ai.base import AIProvider
 
-def get_ai_provider() -> AIProvider:
+# One provider (and therefore one HTTP connection pool) per event loop.
+# Pooled clients are bound to the loop they were created on, so they cannot be shared across loops.
+_providers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AIProvider]" = weakref.WeakKeyDictionary()
+
+def create_ai_provider() -> AIProvider:
     """
-    Factory function to get the configured AI provider instance.
+    Builds a new instance of the configured AI provider.
     Defaults to OpenAI if not specified or unrecognized.
     Uses local imports to avoid hard dependency requirements if a provider is unused.
     """
     
     if settings.USE_MOCK_AI:
         from app.services.ai.mock_provider import MockProvider
-        return MockProvider()
+        return MockProvider(
+            extract_latency=settings.MOCK_AI_EXTRACT_LATENCY,
+            rewrite_latency=settings.MOCK_AI_REWRITE_LATENCY,
+            latency_sigma=settings.MOCK_AI_LATENCY_SIGMA,
+            failure_rate=settings.MOCK_AI_FAILURE_RATE,
+            atom_count=settings.MOCK_AI_ATOM_COUNT,
+            seed=settings.MOCK_AI_SEED,
+        )
 
     provider_name = settings.AI_PROVIDER.lower()
     
@@ -21,3 +34,28 @@ def get_ai_provider() -> AIProvider:
     # Default to OpenAI
     from app.services.ai.openai_provider import OpenAIProvider
     return OpenAIProvider()
+
+def get_ai_provider() -> AIProvider:
+    """
+    Returns the process-wide provider for the running event loop, creating it on
+    first use, so every AIService on that loop shares warm connections.
+    Outside an event loop a fresh, unshared provider is returned.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return create_ai_provider()
+
+    provider = _providers.get(loop)
+    if provider is None:
+        provider = create_ai_provider()
+        _providers[loop] = provider
+    return provider
+
+async def close_ai_providers() -> None:
+    """
+    Shutdown hook: closes the provider registered for the running event loop.
+    """
+    provider = _providers.pop(asyncio.get_running_loop(), None)
+    if provider is not None:
+        await provider.close()
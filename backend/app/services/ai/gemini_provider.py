@@ -1,15 +1,38 @@
 import json
+import time
+import asyncio
 import google.generativeai as genai
 from typing import Any, Dict, List
 from app.core.config import settings
+from app.services.ai.usage import record_ai_call
 from app.services.ai.base import AIProvider
-from app.services.ai.prompts import EXTRACT_ATOMS_PROMPT, REWRITE_CONTENT_PROMPT
+from app.services.ai.prompts import EXTRACT_ATOMS_PROMPT, REWRITE_CONTENT_PROMPT, REPURPOSE_METADATA_PROMPT
 
 class GeminiProvider(AIProvider):
     def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.use_rest = bool(settings.GEMINI_BASE_URL)
+        if self.use_rest:
+            # Custom endpoints (e.g. scripts/fake_llm_server.py) speak the REST wire format
+            genai.configure(
+                api_key=settings.GEMINI_API_KEY,
+                transport="rest",
+                client_options={"api_endpoint": settings.GEMINI_BASE_URL},
+            )
+        else:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
         self.model = genai.GenerativeModel('gemini-2.5-flash')
 
+    async def _generate(self, prompt: str, **kwargs):
+        # The SDK's async client is gRPC-only; REST calls run in a worker thread
+        if self.use_rest:
+            return await asyncio.to_thread(self.model.generate_content, prompt, **kwargs)
+        return await self.model.generate_content_async(prompt, **kwargs)
+
+    def _record_usage(self, response, operation: str, started: float):
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            record_ai_call("gemini", self.model.model_name.removeprefix("models/"), operation, usage.prompt_token_count, usage.candidates_token_count, started)
+
     async def extract_atoms(self, text: str) -> List[Dict[str, str]]:
         """
         Extract structured content atoms from transcript using Gemini.
@@ -26,10 +49,12 @@ class GeminiProvider(AIProvider):
             # The SDK might not have an async method directly on the model instance in all versions, 
             # but wrapping in executor or assuming async support if checking docs. 
             # Version 0.8.3+ usually supports async.
-            response = await self.model.generate_content_async(
+            started = time.perf_counter()
+            response = await self._generate(
                 prompt,
                 generation_config=generation_config
             )
+            self._record_usage(response, "extract", started)
             
             content = response.text
             if not content:
@@ -42,6 +67,38 @@ class GeminiProvider(AIProvider):
             print(f"Error extracting atoms from Gemini: {e}")
             raise e
 
+    async def extract_atoms_from_metadata(self, metadata: Dict[str, str]) -> List[Dict[str, str]]:
+        """
+        Extract atoms from metadata using Gemini.
+        """
+        prompt = REPURPOSE_METADATA_PROMPT.format(
+            title=metadata.get("title", ""),
+            channel=metadata.get("channel_name", ""),
+            description=metadata.get("description", "")
+        )
+
+        try:
+            generation_config = genai.types.GenerationConfig(
+                response_mime_type="application/json"
+            )
+            started = time.perf_counter()
+            response = await self._generate(
+                prompt,
+                generation_config=generation_config
+            )
+            self._record_usage(response, "extract_metadata", started)
+
+            content = response.text
+            if not content:
+                return []
+
+            data = json.loads(content)
+            return data.get("atoms", [])
+
+        except Exception as e:
+            print(f"Error extracting atoms from metadata: {e}")
+            raise e
+
     async def rewrite_for_platform(self, text: str, platform: str) -> str:
         """
         Rewrite content for a specific platform using Gemini.
@@ -56,7 +113,9 @@ class GeminiProvider(AIProvider):
         prompt = REWRITE_CONTENT_PROMPT.format(platform=platform, style_guide=style_guide, text=text)
 
         try:
-            response = await self.model.generate_content_async(prompt)
+            started = time.perf_counter()
+            response = await self._generate(prompt)
+            self._record_usage(response, "rewrite", started)
             return response.text.strip() if response.text else text
         except Exception as e:
             print(f"Error rewriting for {platform}: {e}")
@@ -1,36 +1,103 @@
 import asyncio
+import random
+import time
 from typing import Any, Dict, List
 from app.services.ai.base import AIProvider
+from app.services.ai.usage import record_ai_call
+
+ATOM_TYPES = ["insight", "quote", "lesson", "opinion"]
+
+class MockProviderError(Exception):
+    pass
 
 class MockProvider(AIProvider):
+    """
+    Offline provider for development and benchmarks.
+    Latencies are drawn from a log-normal distribution around the configured
+    medians (sigma=0 gives fixed delays); failure_rate injects provider errors.
+    """
+    def __init__(
+        self,
+        extract_latency: float = 1.0,
+        rewrite_latency: float = 0.0,
+        latency_sigma: float = 0.0,
+        failure_rate: float = 0.0,
+        atom_count: int = 4,
+        seed: int | None = None,
+    ):
+        self.extract_latency = extract_latency
+        self.rewrite_latency = rewrite_latency
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        self.atom_count = atom_count
+        self._random = random.Random(seed)
+
+    @staticmethod
+    def _record_usage(operation: str, prompt: str, completion: str, started: float):
+        # Rough 4-characters-per-token estimate so accounting is exercised offline
+        record_ai_call("mock", "mock", operation, len(prompt) // 4, len(completion) // 4, started)
+
+    async def _simulate_call(self, median_latency: float):
+        if median_latency > 0:
+            delay = median_latency
+            if self.latency_sigma > 0:
+                delay = self._random.lognormvariate(0, self.latency_sigma) * median_latency
+            await asyncio.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise MockProviderError("Simulated provider failure")
+
+    def _atoms(self, templates: Dict[str, str]) -> List[Dict[str, str]]:
+        atoms = []
+        for i in range(self.atom_count):
+            atom_type = ATOM_TYPES[i % len(ATOM_TYPES)]
+            text = templates[atom_type]
+            if i >= len(ATOM_TYPES):
+                text = f"{text} (#{i + 1})"
+            atoms.append({"type": atom_type, "text": text})
+        return atoms
+
     async def extract_atoms(self, text: str) -> List[Dict[str, str]]:
         """
         Return static mock data for extraction.
         """
         print("⚠️ Using MOCK AI for extraction")
-        await asyncio.sleep(1) # Simulate delay
-        return [
-            {"type": "insight", "text": "This is a mock insight from the video transcript."},
-            {"type": "quote", "text": "This is a mock quote that sounds very inspiring."},
-            {"type": "lesson", "text": "This is a mock lesson regarding the content strategy."},
-            {"type": "opinion", "text": "This is a mock opinion about the subject matter."}
-        ]
+        started = time.perf_counter()
+        await self._simulate_call(self.extract_latency)
+        atoms = self._atoms({
+            "insight": "This is a mock insight from the video transcript.",
+            "quote": "This is a mock quote that sounds very inspiring.",
+            "lesson": "This is a mock lesson regarding the content strategy.",
+            "opinion": "This is a mock opinion about the subject matter.",
+        })
+        self._record_usage("extract", text, str(atoms), started)
+        return atoms
 
     async def extract_atoms_from_metadata(self, metadata: Dict[str, str]) -> List[Dict[str, str]]:
         """
         Return static mock data for metadata extraction.
         """
         print(f"⚠️ Using MOCK AI for metadata extraction: {metadata.get('title')}")
-        await asyncio.sleep(1)
-        return [
-            {"type": "insight", "text": f"Mock insight derived from title: {metadata.get('title')}"},
-            {"type": "quote", "text": "Mock quote inferred from description."},
-            {"type": "lesson", "text": "Always optimize your video metadata."},
-        ]
+        started = time.perf_counter()
+        await self._simulate_call(self.extract_latency)
+        atoms = self._atoms({
+            "insight": f"Mock insight derived from title: {metadata.get('title')}",
+            "quote": "Mock quote inferred from description.",
+            "lesson": "Always optimize your video metadata.",
+            "opinion": "Mock opinion about the video topic.",
+        })[:max(self.atom_count - 1, 1)]
+        self._record_usage("extract_metadata", str(metadata), str(atoms), started)
+        return atoms
 
     async def rewrite_for_platform(self, text: str, platform: str) -> str:
         """
         Return simple mock rewritten text.
         """
         # print(f"⚠️ Using MOCK AI for rewriting {platform}")
-        return f"[MOCK {platform.upper()}] {text}"
+        started = time.perf_counter()
+        try:
+            await self._simulate_call(self.rewrite_latency)
+        except MockProviderError:
+            return text # Same fallback as the real providers
+        rewritten = f"[MOCK {platform.upper()}] {text}"
+        self._record_usage("rewrite", text, rewritten, started)
+        return rewritten
@@ -1,13 +1,38 @@
 import json
+import time
 from typing import Any, Dict, List
+import httpx
 from openai import AsyncOpenAI
 from app.core.config import settings
+from app.services.ai.usage import record_ai_call
 from app.services.ai.base import AIProvider
 from app.services.ai.prompts import EXTRACT_ATOMS_PROMPT, REWRITE_CONTENT_PROMPT, REPURPOSE_METADATA_PROMPT
 
 class OpenAIProvider(AIProvider):
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        http_client = httpx.AsyncClient(
+            http2=settings.AI_HTTP2,
+            timeout=settings.AI_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            http_client=http_client,
+        )
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    @staticmethod
+    def _record_usage(response, operation: str, started: float):
+        usage = getattr(response, "usage", None)
+        if usage:
+            record_ai_call("openai", response.model, operation, usage.prompt_tokens, usage.completion_tokens, started)
 
     async def extract_atoms(self, text: str) -> List[Dict[str, str]]:
         """
@@ -18,6 +43,7 @@ class OpenAIProvider(AIProvider):
         prompt = EXTRACT_ATOMS_PROMPT.format(transcript_text=truncated_text)
 
         try:
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo-1106", # Cost effective JSON mode support
                 messages=[
@@ -26,6 +52,7 @@ class OpenAIProvider(AIProvider):
                 ],
                 response_format={"type": "json_object"}
             )
+            self._record_usage(response, "extract", started)
             
             content = response.choices[0].message.content
             if not content:
@@ -49,6 +76,7 @@ class OpenAIProvider(AIProvider):
         )
 
         try:
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo-1106",
                 messages=[
@@ -57,6 +85,7 @@ class OpenAIProvider(AIProvider):
                 ],
                 response_format={"type": "json_object"}
             )
+            self._record_usage(response, "extract_metadata", started)
             
             content = response.choices[0].message.content
             if not content:
@@ -83,6 +112,7 @@ class OpenAIProvider(AIProvider):
         prompt = REWRITE_CONTENT_PROMPT.format(platform=platform, style_guide=style_guide, text=text)
 
         try:
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
@@ -90,6 +120,7 @@ class OpenAIProvider(AIProvider):
                     {"role": "user", "content": prompt}
                 ]
             )
+            self._record_usage(response, "rewrite", started)
             return response.choices[0].message.content.strip() if response.choices[0].message.content else text
         except Exception as e:
             print(f"Error rewriting for {platform}: {e}")
@@ -0,0 +1,82 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from app.core.metrics import record_llm_usage
+
+# USD per 1K (prompt, completion) tokens. Unknown models are recorded at zero cost.
+MODEL_PRICES_PER_1K: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-3.5-turbo-0125": (0.0005, 0.0015),
+    "gpt-3.5-turbo-1106": (0.001, 0.002),
+    "gemini-2.5-flash": (0.0003, 0.0025),
+}
+
+@dataclass
+class AICallUsage:
+    provider: str
+    model: str
+    operation: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+
+    @property
+    def cost_usd(self) -> float:
+        return estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+@dataclass
+class UsageCollector:
+    calls: List[AICallUsage] = field(default_factory=list)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(c.prompt_tokens + c.completion_tokens for c in self.calls)
+
+_current_collector: ContextVar[Optional[UsageCollector]] = ContextVar("ai_usage_collector", default=None)
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    # Versioned names ("models/gemini-2.5-flash-001") fall back to their base model price
+    name = model.removeprefix("models/")
+    prices = MODEL_PRICES_PER_1K.get(name) or next(
+        (p for known, p in MODEL_PRICES_PER_1K.items() if name.startswith(known)), (0.0, 0.0)
+    )
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1000
+
+@contextmanager
+def collect_usage():
+    """
+    Collects every AI call made in the current async context (one pipeline job).
+    """
+    collector = UsageCollector()
+    token = _current_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _current_collector.reset(token)
+
+def record_ai_call(
+    provider: str,
+    model: str,
+    operation: str,
+    prompt_tokens: Optional[int],
+    completion_tokens: Optional[int],
+    started: float,
+):
+    """
+    Called by providers after each API response; `started` is a time.perf_counter() value.
+    Feeds the Prometheus token counters and the active job's collector, if any.
+    """
+    record_llm_usage(provider, operation, prompt_tokens, completion_tokens)
+
+    collector = _current_collector.get()
+    if collector is not None:
+        collector.calls.append(AICallUsage(
+            provider=provider,
+            model=model,
+            operation=operation,
+            prompt_tokens=prompt_tokens or 0,
+            completion_tokens=completion_tokens or 0,
+            latency_ms=(time.perf_counter() - started) * 1000,
+        ))
@@ -1,4 +1,5 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any
+from app.core.metrics import track_stage
 from app.services.ai.factory import get_ai_provider
 
 class AIService:
@@ -10,11 +11,21 @@ class AIService:
         Extracts structured content atoms (insights, quotes, etc.) from transcript.
         Delegates to the configured AI provider.
         """
-        return await self.provider.extract_atoms(transcript_text)
+        with track_stage("llm_extract"):
+            return await self.provider.extract_atoms(transcript_text)
+
+    async def extract_atoms_from_metadata(self, metadata: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Extracts content atoms from video metadata (title, description, channel).
+        Delegates to the configured AI provider.
+        """
+        with track_stage("llm_extract_metadata"):
+            return await self.provider.extract_atoms_from_metadata(metadata)
 
     async def rewrite_content(self, text: str, platform: str) -> str:
         """
         Rewrites the given text for a specific platform.
         Delegates to the configured AI provider.
         """
-        return await self.provider.rewrite_for_platform(text, platform)
+        with track_stage("llm_rewrite"):
+            return await self.provider.rewrite_for_platform(text, platform)
@@ -0,0 +1,166 @@
+"""
+Content-addressed store for large inter-task payloads (transcripts, atom sets).
+
+Celery messages and results carry only the returned keys, so broker and result
+backend memory stay flat however long transcripts get. Keys are
+"<kind>/<sha256 of the stored bytes>": writing the same payload twice is a no-op
+and a key always refers to the same bytes.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Optional
+
+import msgpack
+
+from app.core.config import settings
+
+# Keys are "<kind>/<sha256 hex>"; anything else could resolve outside the store
+KIND_PATTERN = re.compile(r"[a-z][a-z0-9_-]*")
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+class ArtifactNotFoundError(KeyError):
+    pass
+
+class ArtifactStore(ABC):
+    """
+    Byte-level backend interface plus typed helpers. Payloads are zlib-compressed.
+    """
+    @abstractmethod
+    def _write(self, key: str, data: bytes):
+        pass
+
+    @abstractmethod
+    def _read(self, key: str) -> bytes:
+        """
+        Raises ArtifactNotFoundError for unknown keys.
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    def put_bytes(self, data: bytes, kind: str = "blob") -> str:
+        key = f"{kind}/{hashlib.sha256(data).hexdigest()}"
+        if not self.exists(key):
+            self._write(key, zlib.compress(data, 6))
+        return key
+
+    def get_bytes(self, key: str) -> bytes:
+        return zlib.decompress(self._read(key))
+
+    def put_text(self, text: str, kind: str = "text") -> str:
+        return self.put_bytes(text.encode("utf-8"), kind)
+
+    def get_text(self, key: str) -> str:
+        return self.get_bytes(key).decode("utf-8")
+
+    def put_object(self, obj: Any, kind: str = "object") -> str:
+        """
+        Stores msgpack-serializable data (dicts, lists, str, numbers).
+        """
+        return self.put_bytes(msgpack.packb(obj, use_bin_type=True), kind)
+
+    def get_object(self, key: str) -> Any:
+        return msgpack.unpackb(self.get_bytes(key), raw=False)
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    Filesystem backend. Must be a volume shared by the API and all workers.
+    """
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        kind, _, digest = key.partition("/")
+        if not KIND_PATTERN.fullmatch(kind) or not DIGEST_PATTERN.fullmatch(digest):
+            raise ValueError(f"Invalid artifact key: {key!r}")
+        # Shard by digest prefix to keep directories small
+        return os.path.join(self.root, kind, digest[:2], digest)
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise ArtifactNotFoundError(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+class S3ArtifactStore(ArtifactStore):
+    """
+    S3-compatible backend (AWS S3, MinIO, LocalStack...). Requires `boto3`;
+    credentials come from the usual AWS_* environment variables.
+    """
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        import boto3
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _write(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=data)
+
+    def _read(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except self.client.exceptions.NoSuchKey:
+            raise ArtifactNotFoundError(key)
+        return response["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+@lru_cache(maxsize=1)
+def get_artifact_store() -> ArtifactStore:
+    if settings.ARTIFACT_STORE == "s3":
+        if not settings.ARTIFACT_S3_BUCKET:
+            raise ValueError("ARTIFACT_S3_BUCKET must be set when ARTIFACT_STORE=s3")
+        return S3ArtifactStore(
+            settings.ARTIFACT_S3_BUCKET,
+            prefix=settings.ARTIFACT_S3_PREFIX,
+            endpoint_url=settings.ARTIFACT_S3_ENDPOINT_URL or None,
+        )
+    return LocalArtifactStore(settings.ARTIFACT_DIR)
@@ -0,0 +1,103 @@
+"""
+Streams a user's generated posts as NDJSON or CSV.
+
+Rows are read through a server-side cursor in batches of EXPORT_BATCH_SIZE and
+serialized batch by batch, optionally through an incremental gzip stream, so
+memory stays flat however many posts are exported.
+"""
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+import orjson
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import ReadSessionLocal
+from app.core.responses import orjson_default
+from app.models.content import Transcript, ContentAtom, Post
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+EXPORT_COLUMNS = [
+    "id",
+    "transcript_id",
+    "youtube_url",
+    "content_atom_id",
+    "atom_type",
+    "start_seconds",
+    "platform",
+    "included",
+    "content",
+    "created_at",
+]
+
+def export_query(user_id: UUID, transcript_id: Optional[UUID] = None, platform: Optional[str] = None, included: Optional[bool] = None):
+    query = (
+        select(
+            Post.id,
+            ContentAtom.transcript_id,
+            Transcript.youtube_url,
+            Post.content_atom_id,
+            ContentAtom.type.label("atom_type"),
+            ContentAtom.start_seconds,
+            Post.platform,
+            Post.included,
+            Post.text.label("content"),
+            Post.created_at,
+        )
+        .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+        .join(Transcript, ContentAtom.transcript_id == Transcript.id)
+        .where(Transcript.user_id == user_id)
+        .order_by(Post.created_at, Post.id)
+    )
+    if transcript_id:
+        query = query.where(ContentAtom.transcript_id == transcript_id)
+    if platform:
+        query = query.where(Post.platform == platform)
+    if included is not None:
+        query = query.where(Post.included == included)
+    return query
+
+def _ndjson(rows) -> bytes:
+    return b"".join(orjson.dumps(row._asdict(), default=orjson_default) + b"\n" for row in rows)
+
+def _csv(rows, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in row
+        ])
+    return buffer.getvalue().encode("utf-8")
+
+async def stream_export(query, fmt: str, gzip: bool = False) -> AsyncIterator[bytes]:
+    """
+    Yields the serialized rows of `query` one batch at a time. Opens its own
+    session: the request's session is closed before a streaming body is sent.
+    """
+    compressor = zlib.compressobj(wbits=31) if gzip else None # 31: gzip container
+    header = fmt == "csv"
+    async with ReadSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            chunk = _csv(rows, header) if fmt == "csv" else _ndjson(rows)
+            header = False
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    if header:
+        # No rows: a CSV export still gets its header
+        chunk = _csv([], True)
+        yield compressor.compress(chunk) if compressor else chunk
+    if compressor:
+        yield compressor.flush()
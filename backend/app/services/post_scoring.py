@@ -0,0 +1,212 @@
+"""
+Scores candidate posts for the schedule so the best ones fill the 30 slots.
+
+Features for all candidates are computed in one NumPy pass: how well the length
+fits the platform, hashtag density, how over-represented the atom type is, and
+novelty against the user's already scheduled posts (SimHash distance of the atoms).
+Lengths and hashtag/word counts are computed in SQL, so post texts are never loaded.
+The scheduler then takes the top posts per platform and atom type, interleaving types.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, func
+
+from app.core.config import settings
+from app.models.content import Transcript, ContentAtom, Post, Schedule
+from app.services.rewrite_reuse import FINGERPRINT_BITS
+from app.utils.hashing import as_uint64
+
+# (ideal min, ideal max, hard limit) in characters
+PLATFORM_LENGTHS = {
+    "twitter": (70, 240, 280),
+    "linkedin": (600, 1500, 3000),
+}
+DEFAULT_LENGTH = (100, 1000, 5000)
+
+# Hashtags per word: none is acceptable, a few is ideal, a wall of tags is spam
+HASHTAG_DENSITY_IDEAL = 0.05
+HASHTAG_DENSITY_MAX = 0.25
+
+WEIGHTS = {
+    "length": 0.4,
+    "novelty": 0.3,
+    "hashtags": 0.15,
+    "type_balance": 0.15,
+}
+
+# Keeps the (queries x index) distance matrix of one chunk around a few MB
+NOVELTY_CHUNK_CELLS = 1 << 20
+
+@dataclass
+class Candidates:
+    """
+    Column arrays of the posts that can be scheduled, one entry per post.
+    """
+    post_ids: List[UUID]
+    platforms: np.ndarray
+    types: np.ndarray
+    lengths: np.ndarray
+    words: np.ndarray
+    hashtags: np.ndarray
+    fingerprints: List[Optional[int]]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence) -> "Candidates":
+        """
+        Rows with the columns of candidate_columns, read by label.
+        """
+        counts = np.array([(row.length, row.words, row.hashtags) for row in rows], dtype=np.float64).reshape(-1, 3)
+        return cls(
+            post_ids=[row.post_id for row in rows],
+            platforms=np.array([row.platform for row in rows], dtype=object),
+            types=np.array([row.atom_type for row in rows], dtype=object),
+            fingerprints=[row.simhash for row in rows],
+            lengths=counts[:, 0],
+            words=counts[:, 1],
+            hashtags=counts[:, 2],
+        )
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+def length_fit(lengths: np.ndarray, platforms: np.ndarray) -> np.ndarray:
+    """
+    1 inside the platform's ideal range, falling linearly to 0 at zero
+    characters and at the hard limit; 0 beyond the limit.
+    """
+    scores = np.zeros(len(lengths))
+    for platform in np.unique(platforms):
+        mask = platforms == platform
+        low, high, limit = PLATFORM_LENGTHS.get(platform, DEFAULT_LENGTH)
+        scores[mask] = np.interp(lengths[mask], [0, low, high, limit], [0.0, 1.0, 1.0, 0.0], right=0.0)
+    return scores
+
+def hashtag_fit(hashtags: np.ndarray, words: np.ndarray) -> np.ndarray:
+    density = hashtags / np.maximum(words, 1)
+    return np.interp(density, [0.0, HASHTAG_DENSITY_IDEAL, HASHTAG_DENSITY_MAX], [0.5, 1.0, 0.0])
+
+def type_balance(platforms: np.ndarray, types: np.ndarray) -> np.ndarray:
+    """
+    1 minus the type's share of its platform's candidates, so types that
+    dominate the library don't crowd out the rest.
+    """
+    keys = platforms.astype(str) + "\x00" + types.astype(str)
+    _, key_index, key_counts = np.unique(keys, return_inverse=True, return_counts=True)
+    _, platform_index, platform_counts = np.unique(platforms.astype(str), return_inverse=True, return_counts=True)
+    return 1.0 - key_counts[key_index] / platform_counts[platform_index]
+
+def _bits(fingerprints: np.ndarray) -> np.ndarray:
+    return np.unpackbits(fingerprints.view(np.uint8).reshape(-1, 8), axis=1).astype(np.float32)
+
+def min_distances(queries: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """
+    Hamming distance from each uint64 query to its closest index fingerprint.
+    Uses |a| + |b| - 2 a·b over the bit matrices, a matrix product NumPy hands to BLAS.
+    """
+    index_bits = _bits(index)
+    index_ones = index_bits.sum(axis=1)
+    closest = np.empty(len(queries), dtype=np.int64)
+    chunk = max(NOVELTY_CHUNK_CELLS // len(index), 1)
+    for start in range(0, len(queries), chunk):
+        query_bits = _bits(queries[start:start + chunk])
+        distances = query_bits.sum(axis=1)[:, None] + index_ones[None, :] - 2 * (query_bits @ index_bits.T)
+        closest[start:start + chunk] = np.rint(distances.min(axis=1))
+    return closest
+
+def novelty(fingerprints: Sequence[Optional[int]], scheduled: Sequence[int]) -> np.ndarray:
+    """
+    Distance to the closest already scheduled atom, scaled so that half the
+    bits differing (unrelated texts) is fully novel. Unfingerprinted atoms count as novel.
+    """
+    scores = np.ones(len(fingerprints))
+    positions = np.array([i for i, f in enumerate(fingerprints) if f is not None], dtype=np.int64)
+    if not len(scheduled) or not len(positions):
+        return scores
+
+    index = np.unique(as_uint64(scheduled))
+    # Atoms appear once per platform; compare each distinct fingerprint once
+    queries, inverse = np.unique(as_uint64([fingerprints[i] for i in positions]), return_inverse=True)
+    closest = min_distances(queries, index)
+    scores[positions] = np.minimum(closest[inverse] / (FINGERPRINT_BITS / 2), 1.0)
+    return scores
+
+def score_posts(candidates: Candidates, scheduled: Sequence[int]) -> np.ndarray:
+    """
+    Weighted sum of the features, between 0 and 1 per candidate.
+    """
+    if not len(candidates):
+        return np.zeros(0)
+    return (
+        WEIGHTS["length"] * length_fit(candidates.lengths, candidates.platforms)
+        + WEIGHTS["hashtags"] * hashtag_fit(candidates.hashtags, candidates.words)
+        + WEIGHTS["type_balance"] * type_balance(candidates.platforms, candidates.types)
+        + WEIGHTS["novelty"] * novelty(candidates.fingerprints, scheduled)
+    )
+
+def rank_for_schedule(candidates: Candidates, scores: np.ndarray, platform: str, k: int) -> List[int]:
+    """
+    Indices of the platform's best `k` candidates in publishing order: each type
+    contributes its top ceil(k / types) posts, interleaved round-robin (strongest
+    type first); leftover slots go to the best remaining posts.
+    """
+    indices = np.flatnonzero(candidates.platforms == platform)
+    if not len(indices) or k <= 0:
+        return []
+
+    by_type = []
+    for atom_type in np.unique(candidates.types[indices].astype(str)):
+        group = indices[candidates.types[indices].astype(str) == atom_type]
+        by_type.append(group[np.argsort(-scores[group], kind="stable")])
+    by_type.sort(key=lambda group: -scores[group[0]])
+
+    quota = math.ceil(k / len(by_type))
+    ranked: List[int] = []
+    for rank in range(quota):
+        ranked.extend(int(group[rank]) for group in by_type if rank < len(group))
+
+    if len(ranked) < k:
+        taken = set(ranked)
+        rest = indices[np.argsort(-scores[indices], kind="stable")]
+        ranked.extend(int(i) for i in rest if int(i) not in taken)
+    return ranked[:k]
+
+def candidate_columns():
+    """
+    Columns Candidates.from_rows expects, computed in SQL: the text itself is never loaded.
+    """
+    text = func.coalesce(Post.text, "")
+    length = func.length(text)
+    return (
+        Post.id.label("post_id"),
+        Post.platform.label("platform"),
+        ContentAtom.type.label("atom_type"),
+        ContentAtom.simhash.label("simhash"),
+        length.label("length"),
+        (length - func.length(func.replace(text, " ", "")) + 1).label("words"), # Approximated by spaces
+        (length - func.length(func.replace(text, "#", ""))).label("hashtags"),
+    )
+
+async def load_scheduled_fingerprints(db, transcript_id: UUID) -> List[int]:
+    """
+    SimHashes of the atoms behind the user's other scheduled posts, most
+    recent SCHEDULE_NOVELTY_WINDOW first.
+    """
+    user_id = select(Transcript.user_id).where(Transcript.id == transcript_id).scalar_subquery()
+    result = await db.execute(
+        select(ContentAtom.simhash)
+        .join(Post, Post.content_atom_id == ContentAtom.id)
+        .join(Schedule, Schedule.post_id == Post.id)
+        .join(Transcript, ContentAtom.transcript_id == Transcript.id)
+        .where(
+            Transcript.user_id == user_id,
+            Transcript.id != transcript_id,
+            ContentAtom.simhash.is_not(None),
+        )
+        .order_by(Schedule.publish_date.desc())
+        .limit(settings.SCHEDULE_NOVELTY_WINDOW)
+    )
+    return list(result.scalars().all())
@@ -1,4 +1,7 @@
-from app.models.content import Post
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.content import Post, Schedule, ContentAtom
 
 class PublishingService:
     @staticmethod
@@ -18,3 +21,29 @@ class PublishingService:
         print(f"[{post.platform.upper()}] Publishing post {post.id}: {post.text}")
         # In future: Integration with LinkedIn API
         return True
+
+    @staticmethod
+    async def publish_schedule(db: AsyncSession, transcript_id: UUID) -> int:
+        """
+        Publishes every scheduled post for a transcript. Returns the number published.
+        """
+        query = (
+            select(Schedule, Post)
+            .join(Post, Schedule.post_id == Post.id)
+            .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+            .where(ContentAtom.transcript_id == transcript_id)
+        )
+        result = await db.execute(query)
+
+        published_count = 0
+        for schedule, post in result.all():
+            if schedule.platform == "twitter":
+                PublishingService.publish_to_twitter(post)
+                published_count += 1
+            elif schedule.platform == "linkedin":
+                PublishingService.publish_to_linkedin(post)
+                published_count += 1
+
+            # In a real app, we would mark the schedule item as 'published' to avoid re-publishing
+            # For this MVP simulation, we just run through them.
+        return published_count
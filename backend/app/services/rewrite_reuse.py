@@ -0,0 +1,149 @@
+"""
+Reuses platform rewrites of near-duplicate atoms instead of paying for a new one.
+
+Creators repeat their key messages across videos. Every atom gets a 64-bit SimHash
+of its character trigrams; before rewriting, new atoms are compared against the
+fingerprints of the same user's earlier atoms that already have a post for the
+platform (Hamming distance over a NumPy array), and close matches copy that post's text.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.metrics import REWRITE_REUSE_LOOKUPS
+from app.models.content import Transcript, ContentAtom, Post
+from app.utils.hashing import as_uint64
+
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 20 # Shorter atoms don't carry enough signal to call them duplicates
+FINGERPRINT_BITS = 64
+
+_NON_WORD = re.compile(r"[\W_]+")
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64-bit SimHash of the normalized text's character trigrams, as a signed
+    integer (fits a BIGINT column). None for texts too short to compare.
+    """
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # One row of 64 bits per shingle; each fingerprint bit is the majority vote of its column
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int(np.packbits(votes, bitorder="little").view(np.int64)[0])
+
+def hamming_distances(queries: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """
+    Pairwise bit distances between two uint64 fingerprint arrays, shape (len(queries), len(index)).
+    """
+    xor = np.bitwise_xor(queries[:, None], index[None, :])
+    return _POPCOUNT[xor.view(np.uint8)].reshape(xor.shape + (8,)).sum(axis=-1, dtype=np.int64)
+
+class RewriteIndex:
+    """
+    Fingerprints of one user's rewritten atoms, one array per platform.
+    """
+    def __init__(self, rows: Sequence[Tuple[str, int, UUID]]):
+        grouped: Dict[str, List[Tuple[int, UUID]]] = defaultdict(list)
+        for platform, fingerprint, post_id in rows:
+            grouped[platform].append((fingerprint, post_id))
+        self.fingerprints = {p: as_uint64([f for f, _ in entries]) for p, entries in grouped.items()}
+        self.post_ids = {p: [post_id for _, post_id in entries] for p, entries in grouped.items()}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.post_ids.values())
+
+    def match(self, platform: str, fingerprints: Sequence[Optional[int]], threshold: float) -> List[Optional[UUID]]:
+        """
+        For each fingerprint, the post of the closest indexed atom whose
+        similarity (1 - distance / 64) is at least `threshold`, else None.
+        """
+        matches: List[Optional[UUID]] = [None] * len(fingerprints)
+        index = self.fingerprints.get(platform)
+        positions = [i for i, f in enumerate(fingerprints) if f is not None]
+        if index is None or not positions:
+            return matches
+
+        distances = hamming_distances(as_uint64([fingerprints[i] for i in positions]), index)
+        best = distances.argmin(axis=1)
+        max_distance = int((1 - threshold) * FINGERPRINT_BITS)
+        for row, position in enumerate(positions):
+            if distances[row, best[row]] <= max_distance:
+                matches[position] = self.post_ids[platform][best[row]]
+        return matches
+
+async def load_rewrite_index(db, user_id: UUID, exclude_transcript_id: UUID, platforms: Sequence[str]) -> RewriteIndex:
+    """
+    Loads the user's most recent fingerprinted posts (REWRITE_REUSE_INDEX_SIZE)
+    for the given platforms. Excluded posts are left out, so rejected copy isn't repeated.
+    """
+    result = await db.execute(
+        select(Post.platform, ContentAtom.simhash, Post.id)
+        .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+        .join(Transcript, ContentAtom.transcript_id == Transcript.id)
+        .where(
+            Transcript.user_id == user_id,
+            Transcript.id != exclude_transcript_id,
+            ContentAtom.simhash.is_not(None),
+            Post.platform.in_(platforms),
+            Post.included.is_(True),
+        )
+        .order_by(Post.created_at.desc())
+        .limit(settings.REWRITE_REUSE_INDEX_SIZE)
+    )
+    return RewriteIndex([tuple(row) for row in result.all()])
+
+async def reuse_rewrites(db, transcript_id: UUID, units: List[dict], fingerprints: Dict[str, Optional[int]]) -> int:
+    """
+    Fills in `rewritten` (and `reused_from`) for units whose atom closely matches
+    an earlier one of the same user. `fingerprints` maps atom_id to SimHash.
+    Returns the number of reused rewrites.
+    """
+    if not settings.REWRITE_REUSE_ENABLED or not units:
+        return 0
+
+    user_id = (await db.execute(
+        select(Transcript.user_id).where(Transcript.id == transcript_id)
+    )).scalar_one()
+    platforms = sorted({unit["platform"] for unit in units})
+    index = await load_rewrite_index(db, user_id, transcript_id, platforms)
+
+    hits: Dict[int, UUID] = {}
+    if len(index):
+        for platform in platforms:
+            positions = [i for i, unit in enumerate(units) if unit["platform"] == platform]
+            matches = index.match(
+                platform,
+                [fingerprints.get(units[i]["atom_id"]) for i in positions],
+                settings.REWRITE_REUSE_THRESHOLD,
+            )
+            hits.update({i: post_id for i, post_id in zip(positions, matches) if post_id is not None})
+
+    if hits:
+        result = await db.execute(select(Post.id, Post.text).where(Post.id.in_(set(hits.values()))))
+        texts = dict(result.all())
+        for i, post_id in list(hits.items()):
+            if post_id not in texts:
+                del hits[i] # Deleted since the index was loaded
+                continue
+            units[i]["rewritten"] = texts[post_id]
+            units[i]["reused_from"] = str(post_id)
+            units[i]["usage"] = []
+
+    for i, unit in enumerate(units):
+        REWRITE_REUSE_LOOKUPS.labels(platform=unit["platform"], result="hit" if i in hits else "miss").inc()
+    return len(hits)
@@ -1,96 +1,207 @@
+from dataclasses import dataclass, field
 from datetime import date, timedelta, datetime
 from uuid import UUID
-from typing import List, Dict
-from sqlalchemy import select
+from typing import List, Dict, Optional, Sequence
+from sqlalchemy import select, update, insert, delete, case, func
 from app.core.database import AsyncSessionLocal
-from app.models.content import Post, ContentAtom, Schedule
+from app.core.metrics import track_stage
+from app.models.content import Post, ContentAtom, Schedule, Transcript
+
+PREVIEW_LENGTH = 100
+SCHEDULE_DAYS = 30
+
+def schedule_preview_query(transcript_id: UUID):
+    """
+    Projection for the schedule preview: only the rendered columns, with the
+    post text truncated in SQL so full post bodies never leave the database.
+    """
+    preview = case(
+        (func.length(Post.text) > PREVIEW_LENGTH, func.substr(Post.text, 1, PREVIEW_LENGTH) + "..."),
+        else_=Post.text,
+    )
+    return (
+        select(Schedule.id, Schedule.publish_date, Schedule.platform, preview.label("preview"))
+        .join(Post, Schedule.post_id == Post.id)
+        .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+        .where(ContentAtom.transcript_id == transcript_id)
+        .order_by(Schedule.publish_date)
+    )
+
+@dataclass
+class ScheduleSlot:
+    id: UUID
+    post_id: UUID
+    publish_date: datetime
+    platform: str
+
+@dataclass
+class SchedulePlan:
+    """
+    Row-level changes that turn the stored schedule into the desired one.
+    """
+    inserts: List[dict] = field(default_factory=list)
+    updates: List[dict] = field(default_factory=list) # Freed slots refilled with another post
+    deletes: List[UUID] = field(default_factory=list)
+    scheduled: int = 0 # Upcoming slots once applied
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+PLATFORMS_ROTATION = ["twitter", "linkedin"]
+
+def _other_platform(platform: str) -> str:
+    if platform not in PLATFORMS_ROTATION:
+        return PLATFORMS_ROTATION[0]
+    return PLATFORMS_ROTATION[(PLATFORMS_ROTATION.index(platform) + 1) % len(PLATFORMS_ROTATION)]
+
+def plan_schedule(
+    slots: Sequence[ScheduleSlot],
+    post_ids: Sequence[UUID],
+    platforms: Sequence[str],
+    ranked: Dict[str, List[int]],
+    start_date: date,
+) -> SchedulePlan:
+    """
+    Diffs the stored slots against the ranked candidates (indices into
+    `post_ids` / `platforms`).
+    Slots before `start_date` are left alone. Upcoming slots keep their post while
+    it is still included; slots of excluded posts are refilled with the best unused
+    post (same platform first) or removed; duplicate slots (same day or same post)
+    are removed. New posts are appended after the last slot, alternating platforms,
+    up to SCHEDULE_DAYS upcoming slots.
+    """
+    plan = SchedulePlan()
+    index_of = {post_id: i for i, post_id in enumerate(post_ids)}
+    start = datetime(start_date.year, start_date.month, start_date.day)
+    used = set()
+    taken_days = set()
+    upcoming: List[ScheduleSlot] = []
+    freed: List[ScheduleSlot] = []
+
+    for slot in sorted(slots, key=lambda s: (s.publish_date, str(s.id))):
+        index = index_of.get(slot.post_id)
+        if slot.publish_date < start:
+            if index is not None:
+                used.add(index) # Already went out
+            continue
+        if slot.publish_date.date() in taken_days or (index is not None and index in used):
+            plan.deletes.append(slot.id)
+            continue
+        taken_days.add(slot.publish_date.date())
+        if index is None:
+            freed.append(slot)
+        else:
+            used.add(index)
+            upcoming.append(slot)
+
+    # `used` only grows, so each ranked list is walked once overall
+    cursors = {platform: 0 for platform in ranked}
+
+    def next_post(platform: str) -> Optional[int]:
+        for preferred in (platform, _other_platform(platform)):
+            candidates = ranked.get(preferred, [])
+            while cursors.get(preferred, 0) < len(candidates):
+                index = candidates[cursors[preferred]]
+                cursors[preferred] += 1
+                if index not in used:
+                    used.add(index)
+                    return index
+        return None
+
+    for slot in freed:
+        index = next_post(slot.platform)
+        if index is None:
+            plan.deletes.append(slot.id)
+            continue
+        slot.post_id = post_ids[index]
+        slot.platform = platforms[index]
+        plan.updates.append({"id": slot.id, "post_id": slot.post_id, "platform": slot.platform})
+        upcoming.append(slot)
+
+    upcoming.sort(key=lambda s: s.publish_date)
+    last_date = upcoming[-1].publish_date if upcoming else start - timedelta(days=1)
+    last_platform = upcoming[-1].platform if upcoming else PLATFORMS_ROTATION[-1]
+    count = len(upcoming)
+    while count < SCHEDULE_DAYS:
+        index = next_post(_other_platform(last_platform))
+        if index is None:
+            # No content left at all
+            break
+        last_date += timedelta(days=1)
+        last_platform = platforms[index]
+        plan.inserts.append({"post_id": post_ids[index], "publish_date": last_date, "platform": last_platform})
+        count += 1
+
+    plan.scheduled = count
+    return plan
 
 class SchedulingService:
-    async def generate_schedule(self, transcript_id: UUID, start_date: date):
+    async def generate_schedule(self, transcript_id: UUID, start_date: date) -> SchedulePlan:
         """
-        Generates a 30-day schedule for the given transcript.
+        Brings the transcript's 30-day schedule up to date incrementally.
         Rules:
         - 1 post per day
         - Alternate platforms (Twitter, LinkedIn)
-        - Rotate content atom types
-        - Max 30 days
+        - Best-scored posts first (see post_scoring), rotating content atom types
+        - Max 30 upcoming days
+        Only changed slots are written (see plan_schedule), in one transaction.
         """
-        async with AsyncSessionLocal() as db:
-            # 1. Fetch all included posts with their content atom (for type)
-            query = (
-                select(Post, ContentAtom)
-                .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
-                .where(ContentAtom.transcript_id == transcript_id)
-                .where(Post.included == True)
-            )
-            result = await db.execute(query)
-            rows = result.all() # list of (Post, ContentAtom) tuples
-
-            if not rows:
-                return 0
-
-            # 2. Group by Platform
-            posts_by_platform: Dict[str, List[tuple]] = {
-                "twitter": [],
-                "linkedin": []
-            }
-            
-            for post, atom in rows:
-                if post.platform in posts_by_platform:
-                    posts_by_platform[post.platform].append((post, atom))
-
-            # 3. Group by Type within Platform (Optional for advanced sort)
-            # For now, we trust the DB order or just selection logic.
-
-            # 3. Generate Schedule
-            schedule_items: List[Schedule] = []
-            
-            # Helper to get next post rotating by type
-            def get_next_post(platform_posts: List[tuple], used_ids: set) -> tuple | None:
-                # Simple rotation: just pick the first unused one.
-                # Ideally we sort by atom.type to ensure rotation.
-                # Let's try to find one that hasn't been used.
-                for p, a in platform_posts:
-                    if p.id not in used_ids:
-                        return (p, a)
-                return None
-
-            used_post_ids = set()
-            current_date = start_date
-            
-            # Platforms rotation: starts with Twitter
-            platforms_rotation = ["twitter", "linkedin"]
-            
-            for i in range(30): # 30 days max
-                platform = platforms_rotation[i % 2]
-                
-                # Try to get a post for this platform
-                selection = get_next_post(posts_by_platform.get(platform, []), used_post_ids)
-                
-                # If no post for this platform, try the other one
-                if not selection:
-                    other_platform = platforms_rotation[(i + 1) % 2]
-                    selection = get_next_post(posts_by_platform.get(other_platform, []), used_post_ids)
-                
-                if not selection:
-                    # No content left at all
-                    break
-                
-                post, atom = selection
-                used_post_ids.add(post.id)
-                
-                schedule = Schedule(
-                    post_id=post.id,
-                    publish_date=datetime(current_date.year, current_date.month, current_date.day),
-                    platform=post.platform
+        # NumPy stays out of API startup
+        from app.services.post_scoring import Candidates, candidate_columns, load_scheduled_fingerprints, score_posts, rank_for_schedule
+
+        with track_stage("schedule_generation"):
+            async with AsyncSessionLocal() as db:
+                # 1. Every post of the transcript with its schedule rows, if any: included
+                # posts are the candidates, rows of excluded posts are freed slots
+                result = await db.execute(
+                    select(
+                        *candidate_columns(),
+                        Post.included,
+                        Schedule.id.label("schedule_id"),
+                        Schedule.publish_date,
+                        Schedule.platform.label("schedule_platform"),
+                    )
+                    .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+                    .outerjoin(Schedule, Schedule.post_id == Post.id)
+                    .where(ContentAtom.transcript_id == transcript_id)
+                    .order_by(ContentAtom.position, Post.created_at, Post.id)
+                )
+                candidate_rows = {}
+                slots: List[ScheduleSlot] = []
+                for row in result.all():
+                    if row.included:
+                        candidate_rows.setdefault(row.post_id, row)
+                    if row.schedule_id is not None:
+                        slots.append(ScheduleSlot(id=row.schedule_id, post_id=row.post_id, publish_date=row.publish_date, platform=row.schedule_platform))
+                candidates = Candidates.from_rows(list(candidate_rows.values()))
+
+                # 2. Score every candidate in one pass and rank per platform, rotating atom types
+                scores = score_posts(candidates, await load_scheduled_fingerprints(db, transcript_id))
+                ranked: Dict[str, List[int]] = {
+                    platform: rank_for_schedule(candidates, scores, platform, len(candidates))
+                    for platform in PLATFORMS_ROTATION
+                }
+
+                # 3. Diff against the stored schedule
+                plan = plan_schedule(slots, candidates.post_ids, [str(p) for p in candidates.platforms], ranked, start_date)
+                if not plan.changed:
+                    return plan
+
+                # 4. Apply only the changed rows
+                if plan.deletes:
+                    await db.execute(delete(Schedule).where(Schedule.id.in_(plan.deletes)))
+                if plan.updates:
+                    await db.execute(update(Schedule), plan.updates) # Bulk UPDATE by primary key
+                if plan.inserts:
+                    await db.execute(insert(Schedule), plan.inserts)
+
+                # Invalidate cached schedule previews (ETag) in the same transaction
+                await db.execute(
+                    update(Transcript)
+                    .where(Transcript.id == transcript_id)
+                    .values(schedule_version=Transcript.schedule_version + 1)
                 )
-                
-                schedule_items.append(schedule)
-                current_date += timedelta(days=1)
-
-            # 4. Save Schedule
-            for item in schedule_items:
-                db.add(item)
-            
-            await db.commit()
-            return len(schedule_items)
+
+                await db.commit()
+                return plan
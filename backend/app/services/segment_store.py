@@ -0,0 +1,166 @@
+"""
+Compact timestamped transcript segments.
+
+One blob per transcript: a header, parallel float32 arrays of caption start and
+duration (seconds), uint32 character offsets of each segment in the transcript
+text (plus the end offset), then the text as UTF-8. That is 12 bytes per segment
+on top of the text, and loading is a few zero-copy NumPy views. Character offsets
+map to timestamps with a binary search, so atoms can be linked back to the moment
+in the video they came from without refetching captions.
+"""
+import re
+import struct
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"SEG1"
+HEADER = struct.Struct("<4sII") # magic, segment count, text bytes
+MIN_TRIGRAM_HITS = 2 # Less weighted trigram evidence than this is not a match
+MATCH_WINDOW_FACTOR = 1.2 # Hits must fall within this many snippet lengths
+
+_WORD = re.compile(r"\w+")
+
+class InvalidSegmentsError(ValueError):
+    pass
+
+class TranscriptSegments:
+    def __init__(self, starts: np.ndarray, durations: np.ndarray, offsets: np.ndarray, text: str):
+        self.starts = starts
+        self.durations = durations
+        self.offsets = offsets # len(starts) + 1 character offsets into text
+        self.text = text
+        self._trigrams: Optional[Dict[Tuple[str, str, str], List[int]]] = None
+        self._word_offsets: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_fragments(cls, texts: Sequence[str], starts: Sequence[float], durations: Sequence[float]) -> "TranscriptSegments":
+        """
+        Builds segments from caption fragments joined with single spaces.
+        Empty fragments (dropped by preprocessing) are skipped.
+        """
+        kept = [(text, start, duration) for text, start, duration in zip(texts, starts, durations) if text]
+        offsets = np.zeros(len(kept) + 1, dtype=np.uint32)
+        position = 0
+        for i, (text, _, _) in enumerate(kept):
+            offsets[i] = position
+            position += len(text) + 1
+        offsets[len(kept)] = max(position - 1, 0)
+        return cls(
+            starts=np.array([start for _, start, _ in kept], dtype=np.float32),
+            durations=np.array([duration for _, _, duration in kept], dtype=np.float32),
+            offsets=offsets,
+            text=" ".join(text for text, _, _ in kept),
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def to_bytes(self) -> bytes:
+        text = self.text.encode("utf-8")
+        return b"".join([
+            HEADER.pack(MAGIC, len(self), len(text)),
+            self.starts.astype("<f4").tobytes(),
+            self.durations.astype("<f4").tobytes(),
+            self.offsets.astype("<u4").tobytes(),
+            text,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TranscriptSegments":
+        if len(data) < HEADER.size:
+            raise InvalidSegmentsError("Segment blob is truncated")
+        magic, count, text_bytes = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + count * 12 + 4 + text_bytes:
+            raise InvalidSegmentsError("Not a segment blob or corrupt")
+        position = HEADER.size
+        starts = np.frombuffer(data, dtype="<f4", count=count, offset=position)
+        position += count * 4
+        durations = np.frombuffer(data, dtype="<f4", count=count, offset=position)
+        position += count * 4
+        offsets = np.frombuffer(data, dtype="<u4", count=count + 1, offset=position)
+        position += (count + 1) * 4
+        return cls(starts, durations, offsets, data[position:].decode("utf-8"))
+
+    def segments_at(self, char_offsets) -> np.ndarray:
+        """
+        Index of the segment containing each character offset (clamped to the transcript).
+        """
+        index = np.searchsorted(self.offsets[:-1], np.asarray(char_offsets), side="right") - 1
+        return np.clip(index, 0, max(len(self) - 1, 0))
+
+    def timestamps_at(self, char_offsets) -> np.ndarray:
+        """
+        Seconds into the video for each character offset, interpolated within its segment.
+        """
+        char_offsets = np.asarray(char_offsets, dtype=np.float64)
+        index = self.segments_at(char_offsets)
+        begin = self.offsets[index].astype(np.float64)
+        length = np.maximum(self.offsets[index + 1].astype(np.float64) - begin, 1.0)
+        within = np.clip((char_offsets - begin) / length, 0.0, 1.0)
+        return self.starts[index] + within * self.durations[index]
+
+    def timestamp_at(self, char_offset: int) -> Optional[float]:
+        if not len(self):
+            return None
+        return float(self.timestamps_at([char_offset])[0])
+
+    def _index_words(self):
+        # Lowercase word by word: lowering the whole text can change its length ("İ"), shifting offsets
+        words = [(m.group(0).lower(), m.start()) for m in _WORD.finditer(self.text)]
+        trigrams: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+        for i in range(len(words) - 2):
+            trigrams[(words[i][0], words[i + 1][0], words[i + 2][0])].append(i)
+        self._trigrams = trigrams
+        self._word_offsets = np.array([start for _, start in words], dtype=np.int64)
+
+    def locate(self, snippet: str) -> Optional[int]:
+        """
+        Character offset where `snippet` (e.g. an atom's text) occurs: an exact,
+        case-insensitive match, else the start of the snippet-sized window sharing the
+        most word trigrams with it, rarer trigrams counting more. None when nothing
+        matches well enough (fully paraphrased atoms).
+        """
+        if not snippet or not len(self):
+            return None
+        exact = re.search(re.escape(snippet.strip()), self.text, re.IGNORECASE)
+        if exact:
+            return exact.start()
+
+        if self._trigrams is None:
+            self._index_words()
+        words = _WORD.findall(snippet.lower())
+        snippet_trigrams = {(words[i], words[i + 1], words[i + 2]) for i in range(len(words) - 2)}
+        # (text offset, trigram, weight): a trigram repeated across the transcript is weak evidence
+        hits = sorted(
+            (int(self._word_offsets[position]), trigram, 1.0 / len(positions))
+            for trigram in snippet_trigrams
+            for positions in [self._trigrams.get(trigram, ())]
+            for position in positions
+        )
+        # Best snippet-sized window, each distinct trigram counted once; captions are short,
+        # so a match spans several segments
+        window = int(len(snippet) * MATCH_WINDOW_FACTOR)
+        in_window: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        score, best_score, best_offset = 0.0, 0.0, None
+        end = 0
+        for offset, trigram, weight in hits:
+            while end < len(hits) and hits[end][0] <= offset + window:
+                _, added, added_weight = hits[end]
+                if not in_window[added]:
+                    score += added_weight
+                in_window[added] += 1
+                end += 1
+            if score > best_score:
+                best_score, best_offset = score, offset
+            in_window[trigram] -= 1
+            if not in_window[trigram]:
+                score -= weight
+        if best_score < MIN_TRIGRAM_HITS:
+            return None
+        return best_offset
+
+    def timestamp_of(self, snippet: str) -> Optional[float]:
+        offset = self.locate(snippet)
+        return None if offset is None else self.timestamp_at(offset)
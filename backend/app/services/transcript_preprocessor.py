@@ -0,0 +1,144 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+# [Music], [Applause], (laughs), ♪ ... and ">>" speaker-change markers from auto-captions
+NON_SPEECH_PATTERN = re.compile(
+    r"\[[^\]]*\]|\((?:[^)]*\b(?:music|applause|laugh\w*|inaudible|silence|cheer\w*|crosstalk)\b[^)]*)\)|♪+|>>",
+    re.IGNORECASE,
+)
+FILLER_WORDS = {"um", "umm", "uh", "uhh", "uhm", "erm", "er", "hmm", "hm", "mm", "mhm", "ah", "eh"}
+# Function words that auto-captions often stutter ("the the"); content words may repeat on purpose
+STUTTER_WORDS = {
+    "i", "the", "a", "an", "to", "and", "of", "so", "we", "you", "it", "in", "is", "that",
+    "okay", "ok", "yeah", "right",
+}
+SENTENCE_STARTERS = {
+    "so", "now", "but", "okay", "ok", "alright", "today", "first", "second", "third",
+    "next", "finally", "also", "basically", "anyway", "remember", "let's",
+}
+SENTENCE_END = (".", "!", "?")
+
+MAX_OVERLAP_WORDS = 25 # Longest rolling-caption overlap we look for
+MIN_SENTENCE_WORDS = 5
+SOFT_SENTENCE_WORDS = 20 # Prefer breaking at a caption boundary after this many words
+MAX_SENTENCE_WORDS = 35
+PUNCTUATED_WORDS_PER_SENTENCE = 30 # Denser punctuation than this means the source is already punctuated
+
+@dataclass
+class PreprocessResult:
+    text: str
+    fragments: List[str] = field(default_factory=list) # Cleaned text per input fragment ("" if dropped)
+    original_chars: int = 0
+    normalized_chars: int = 0
+
+    @property
+    def reduction_ratio(self) -> float:
+        if not self.original_chars:
+            return 0.0
+        return 1 - self.normalized_chars / self.original_chars
+
+def _key(word: str) -> str:
+    return word.lower().strip(".,!?;:\"'")
+
+def _drop_repeats(tokens: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """
+    Removes immediately repeated word runs: rolling caption overlap
+    ("going to talk about going to talk about money") and function-word stutters.
+    """
+    out: List[Tuple[str, int]] = []
+    keys: List[str] = []
+    for word, frag in tokens:
+        out.append((word, frag))
+        keys.append(_key(word))
+        n = len(keys)
+        for k in range(min(MAX_OVERLAP_WORDS, n // 2), 0, -1):
+            # Cheap filter before comparing the full runs
+            if keys[-1] != keys[-1 - k]:
+                continue
+            if k == 1 and keys[-1] not in STUTTER_WORDS:
+                continue
+            if keys[n - k:] == keys[n - 2 * k:n - k]:
+                del out[n - k:]
+                del keys[n - k:]
+                break
+    return out
+
+def _restore_punctuation(tokens: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """
+    Heuristically splits unpunctuated caption text into sentences, breaking at
+    discourse markers, preferring caption boundaries, and capping sentence length.
+    """
+    if not tokens:
+        return tokens
+
+    ended = sum(1 for word, _ in tokens if word.endswith(SENTENCE_END))
+    if ended and len(tokens) / ended <= PUNCTUATED_WORDS_PER_SENTENCE:
+        return tokens
+
+    out: List[Tuple[str, int]] = []
+    sentence_len = 0
+    for word, frag in tokens:
+        if out:
+            starts_fragment = frag != out[-1][1]
+            should_break = (
+                (_key(word) in SENTENCE_STARTERS and sentence_len >= MIN_SENTENCE_WORDS)
+                or (starts_fragment and sentence_len >= SOFT_SENTENCE_WORDS)
+                or sentence_len >= MAX_SENTENCE_WORDS
+            )
+            if should_break and not out[-1][0].endswith(SENTENCE_END):
+                prev_word, prev_frag = out[-1]
+                out[-1] = (prev_word.rstrip(",;:") + ".", prev_frag)
+            if out[-1][0].endswith(SENTENCE_END):
+                sentence_len = 0
+
+        if sentence_len == 0:
+            word = word[:1].upper() + word[1:]
+        out.append((word, frag))
+        sentence_len += 1
+
+    last_word, last_frag = out[-1]
+    if not last_word.endswith(SENTENCE_END):
+        out[-1] = (last_word.rstrip(",;:") + ".", last_frag)
+    return out
+
+def preprocess_fragments(fragments: List[str]) -> PreprocessResult:
+    """
+    Normalizes auto-caption fragments before they are sent to the LLM:
+    strips non-speech tags and fillers, drops rolling-caption overlap and
+    stutters, and restores sentence punctuation when the source has none.
+    Per-fragment output stays aligned with the input for timestamp lookups.
+    """
+    original_chars = len(" ".join(fragments))
+
+    tokens: List[Tuple[str, int]] = []
+    for index, fragment in enumerate(fragments):
+        cleaned = NON_SPEECH_PATTERN.sub(" ", fragment)
+        for word in cleaned.split():
+            key = _key(word)
+            if not key or key in FILLER_WORDS:
+                continue
+            if key == "i" or key.startswith("i'"):
+                word = "I" + word[1:]
+            tokens.append((word, index))
+
+    tokens = _restore_punctuation(_drop_repeats(tokens))
+
+    grouped: List[List[str]] = [[] for _ in fragments]
+    for word, index in tokens:
+        grouped[index].append(word)
+    cleaned_fragments = [" ".join(words) for words in grouped]
+    text = " ".join(word for word, _ in tokens)
+
+    return PreprocessResult(
+        text=text,
+        fragments=cleaned_fragments,
+        original_chars=original_chars,
+        normalized_chars=len(text),
+    )
+
+def preprocess_text(text: str) -> PreprocessResult:
+    """
+    Same normalization for an already-joined transcript (one fragment per line).
+    """
+    return preprocess_fragments(text.splitlines() or [text])
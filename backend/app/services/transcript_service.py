@@ -1,20 +1,25 @@
+import asyncio
 import re
 from typing import Optional
-from youtube_transcript_api import (
-    YouTubeTranscriptApi, 
-    TranscriptsDisabled, 
-    NoTranscriptFound, 
-    VideoUnavailable
-)
-
-# Note: AgeRestricted might not be directly importable in older versions or might be under VideoUnavailable
-# Check if available, otherwise just use VideoUnavailable which is the base for many.
-# Based on previous `dir()` output, AgeRestricted is available.
-try:
-    from youtube_transcript_api import AgeRestricted
-except ImportError:
-    # Fallback if not available or renamed
-    AgeRestricted = VideoUnavailable
+import logging
+from app.core.config import settings
+from app.core.metrics import track_stage, TRANSCRIPT_REDUCTION_RATIO
+from app.services.transcript_preprocessor import preprocess_fragments
+
+logger = logging.getLogger(__name__)
+
+def _inaccessible_errors() -> tuple:
+    """
+    youtube_transcript_api errors meaning the video itself can't be accessed.
+    The SDK is imported on first use to keep API startup fast.
+    """
+    from youtube_transcript_api import VideoUnavailable
+    try:
+        # Not available (or renamed) in some versions; VideoUnavailable is the base for many
+        from youtube_transcript_api import AgeRestricted
+    except ImportError:
+        AgeRestricted = VideoUnavailable
+    return (VideoUnavailable, AgeRestricted)
 
 class TranscriptNotAvailableError(Exception):
     def __init__(self, reason: str):
@@ -26,6 +31,19 @@ class TranscriptAccessDeniedError(Exception):
         self.reason = reason
         super().__init__(reason)
 
+class TranscriptText(str):
+    """
+    Transcript text that also carries its caption timings (app/services/segment_store.py)
+    when they are known, so callers can store them without refetching.
+    """
+    segments = None
+
+    @classmethod
+    def with_segments(cls, text: str, segments) -> "TranscriptText":
+        result = cls(text)
+        result.segments = segments
+        return result
+
 class TranscriptService:
     def extract_video_id(self, video_url: str) -> Optional[str]:
         """
@@ -41,68 +59,97 @@ class TranscriptService:
                 return match.group(1)
         return None
 
-    def get_transcript(self, video_url: str) -> str | dict:
+    def _fetch_transcript_text(self, video_id: str) -> str:
+        """
+        Fetches and joins the English transcript for a video ID, keeping each
+        caption's timing (returns a TranscriptText).
+        Raises TranscriptNotAvailableError or youtube_transcript_api errors.
+        """
+        from youtube_transcript_api import YouTubeTranscriptApi
+        from app.services.segment_store import TranscriptSegments
+
+        # list_transcripts() checks availability and returns a TranscriptList object
+        # If this fails (e.g. video private), it raises VideoUnavailable etc.
+        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        
+        transcript = None
+        
+        # 1. Try manually created transcripts in English variants
+        try:
+            transcript = transcript_list.find_manually_created_transcript(['en', 'en-US', 'en-GB'])
+        except:
+            pass
+        
+        # 2. If not found, try auto-generated transcripts in English
+        if transcript is None:
+            try:
+                transcript = transcript_list.find_generated_transcript(['en'])
+            except:
+                pass
+        
+        # Internal guard: Parsing (fetching) is only attempted if transcript exists
+        if transcript is None:
+            raise TranscriptNotAvailableError(reason="language_not_supported")
+            
+        # Fetch the content
+        transcript_data = transcript.fetch()
+        
+        if not transcript_data:
+             raise TranscriptNotAvailableError(reason="empty_transcript_content")
+        
+        fragments = [t['text'] for t in transcript_data]
+        starts = [t.get('start', 0.0) for t in transcript_data]
+        durations = [t.get('duration', 0.0) for t in transcript_data]
+        if not settings.TRANSCRIPT_PREPROCESSING:
+            segments = TranscriptSegments.from_fragments(fragments, starts, durations)
+            return TranscriptText.with_segments(segments.text, segments)
+
+        # Fewer prompt tokens: drop caption overlap, [Music] tags and fillers, add sentence breaks
+        with track_stage("transcript_preprocess"):
+            result = preprocess_fragments(fragments)
+        TRANSCRIPT_REDUCTION_RATIO.observe(result.reduction_ratio)
+        logger.info(
+            f"Transcript {video_id} preprocessed: {result.original_chars} -> {result.normalized_chars} chars "
+            f"({result.reduction_ratio:.1%} reduction)"
+        )
+        if not result.text:
+             raise TranscriptNotAvailableError(reason="empty_transcript_content")
+        # Cleaned fragments stay aligned with the captions and join to result.text
+        segments = TranscriptSegments.from_fragments(result.fragments, starts, durations)
+        return TranscriptText.with_segments(segments.text, segments)
+
+    async def get_transcript_async(self, video_url: str) -> str | dict:
         """
         Fetches the transcript for the given YouTube URL.
         If transcript is unavailable, falls back to fetching metadata.
+        Doesn't block the event loop: captions are fetched in a worker thread and
+        the metadata fallback runs on the shared yt-dlp pool.
         """
         video_id = self.extract_video_id(video_url)
         if not video_id:
             raise TranscriptNotAvailableError(f"Could not extract video ID from URL: {video_url}")
 
         try:
-            # list_transcripts() checks availability and returns a TranscriptList object
-            # If this fails (e.g. video private), it raises VideoUnavailable etc.
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            
-            transcript = None
-            
-            # 1. Try manually created transcripts in English variants
-            try:
-                transcript = transcript_list.find_manually_created_transcript(['en', 'en-US', 'en-GB'])
-            except:
-                pass
-            
-            # 2. If not found, try auto-generated transcripts in English
-            if transcript is None:
-                try:
-                    transcript = transcript_list.find_generated_transcript(['en'])
-                except:
-                    pass
-            
-            # Internal guard: Parsing (fetching) is only attempted if transcript exists
-            if transcript is None:
-                raise TranscriptNotAvailableError(reason="language_not_supported")
-                
-            # Fetch the content
-            transcript_data = transcript.fetch()
-            
-            if not transcript_data:
-                 raise TranscriptNotAvailableError(reason="empty_transcript_content")
-            
-            return " ".join([t['text'] for t in transcript_data])
+            with track_stage("transcript_fetch"):
+                return await asyncio.to_thread(self._fetch_transcript_text, video_id)
 
-        except (TranscriptsDisabled, NoTranscriptFound, TranscriptNotAvailableError, Exception) as e:
+        except Exception as e: # TranscriptsDisabled, NoTranscriptFound, TranscriptNotAvailableError, ...
             # Check for Access Denied errors first (don't fallback for private videos)
-            if isinstance(e, (VideoUnavailable, AgeRestricted)):
+            if isinstance(e, _inaccessible_errors()):
                  raise TranscriptAccessDeniedError(f"Video is inaccessible: {str(e)}")
-            
+
             # Fallback to Metadata
-            # Note: "no element found" or "ExpatError" are generic libs errors for empty/bad XML, treat as fallback case
             print(f"Transcript unavailable ({e}). Falling back to Metadata.")
-            
+
             try:
                 from app.services.youtube_metadata_service import YouTubeMetadataService
-                meta_service = YouTubeMetadataService()
-                metadata = meta_service.fetch_metadata(video_url)
-                
+                with track_stage("metadata_fallback"):
+                    metadata = await YouTubeMetadataService().fetch_metadata_async(video_url)
+
                 return {
                     "mode": "metadata",
                     "data": metadata
                 }
             except Exception as meta_e:
-                # If metadata also fails, then we truly fail
                 print(f"Metadata fallback failed: {meta_e}")
-                # Raise original error or new one? User said "Only raise error if Video is private..."
-                # But if metadata also fails, we have nothing.
                 raise TranscriptNotAvailableError(f"Transcript and Metadata both unavailable. Transcript error: {e}. Metadata error: {meta_e}")
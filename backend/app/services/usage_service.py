@@ -0,0 +1,154 @@
+from datetime import datetime
+from uuid import UUID
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.content import Transcript
+from app.models.usage import AIUsage
+from app.models.user import User
+from app.services.ai.usage import AICallUsage
+
+class TokenBudgetExceededError(Exception):
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(reason)
+
+def month_start(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.utcnow()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def usage_rows(transcript_id: UUID, calls: Iterable[AICallUsage]) -> List[AIUsage]:
+    return [
+        AIUsage(
+            transcript_id=transcript_id,
+            provider=call.provider,
+            model=call.model,
+            operation=call.operation,
+            prompt_tokens=call.prompt_tokens,
+            completion_tokens=call.completion_tokens,
+            latency_ms=round(call.latency_ms, 2),
+            cost_usd=call.cost_usd,
+        )
+        for call in calls
+    ]
+
+def _totals_columns():
+    return (
+        func.count(AIUsage.id).label("calls"),
+        func.coalesce(func.sum(AIUsage.prompt_tokens), 0).label("prompt_tokens"),
+        func.coalesce(func.sum(AIUsage.completion_tokens), 0).label("completion_tokens"),
+        func.coalesce(func.sum(AIUsage.cost_usd), 0.0).label("cost_usd"),
+        func.coalesce(func.avg(AIUsage.latency_ms), 0.0).label("avg_latency_ms"),
+        func.coalesce(func.max(AIUsage.latency_ms), 0.0).label("max_latency_ms"),
+    )
+
+def _totals_dict(row) -> Dict:
+    return {
+        "calls": row.calls,
+        "prompt_tokens": row.prompt_tokens,
+        "completion_tokens": row.completion_tokens,
+        "total_tokens": row.prompt_tokens + row.completion_tokens,
+        "cost_usd": round(row.cost_usd, 6),
+        "avg_latency_ms": round(row.avg_latency_ms, 2),
+        "max_latency_ms": round(row.max_latency_ms, 2),
+    }
+
+class UsageService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def token_budget(self, user: User) -> Optional[int]:
+        if user.monthly_token_budget is not None:
+            return user.monthly_token_budget
+        return settings.DEFAULT_MONTHLY_TOKEN_BUDGET
+
+    async def tokens_used_since(self, user_id: UUID, since: datetime) -> int:
+        result = await self.db.execute(
+            select(func.coalesce(func.sum(AIUsage.prompt_tokens + AIUsage.completion_tokens), 0))
+            .join(Transcript, AIUsage.transcript_id == Transcript.id)
+            .where(Transcript.user_id == user_id, AIUsage.created_at >= since)
+        )
+        return result.scalar_one()
+
+    async def check_token_budget(self, user: User):
+        """
+        Raises TokenBudgetExceededError if the user has used up this month's budget.
+        Jobs already in flight may overshoot it; the check only gates new work.
+        """
+        budget = self.token_budget(user)
+        if budget is None:
+            return
+        used = await self.tokens_used_since(user.id, month_start())
+        if used >= budget:
+            raise TokenBudgetExceededError(
+                f"Monthly token budget of {budget} exhausted ({used} tokens used since {month_start().date()})"
+            )
+
+    async def transcript_usage(self, transcript_id: UUID) -> Dict:
+        totals = (await self.db.execute(
+            select(*_totals_columns()).where(AIUsage.transcript_id == transcript_id)
+        )).one()
+        calls = (await self.db.execute(
+            select(AIUsage).where(AIUsage.transcript_id == transcript_id).order_by(AIUsage.created_at)
+        )).scalars().all()
+        return {
+            "transcript_id": transcript_id,
+            "totals": _totals_dict(totals),
+            "calls": [
+                {
+                    "provider": c.provider,
+                    "model": c.model,
+                    "operation": c.operation,
+                    "prompt_tokens": c.prompt_tokens,
+                    "completion_tokens": c.completion_tokens,
+                    "latency_ms": c.latency_ms,
+                    "cost_usd": c.cost_usd,
+                    "created_at": c.created_at,
+                }
+                for c in calls
+            ],
+        }
+
+    async def summary(self, user: User, since: datetime, top: int = 10) -> Dict:
+        """
+        Aggregates for the user's jobs since `since`: overall totals, a breakdown
+        per provider/model/operation, and the most expensive transcripts.
+        """
+        base = (
+            select()
+            .select_from(AIUsage)
+            .join(Transcript, AIUsage.transcript_id == Transcript.id)
+            .where(Transcript.user_id == user.id, AIUsage.created_at >= since)
+        )
+
+        totals = (await self.db.execute(base.add_columns(*_totals_columns()))).one()
+
+        by_operation = (await self.db.execute(
+            base.add_columns(AIUsage.provider, AIUsage.model, AIUsage.operation, *_totals_columns())
+            .group_by(AIUsage.provider, AIUsage.model, AIUsage.operation)
+            .order_by(func.sum(AIUsage.cost_usd).desc())
+        )).all()
+
+        cost = func.sum(AIUsage.cost_usd)
+        top_transcripts = (await self.db.execute(
+            base.add_columns(AIUsage.transcript_id, *_totals_columns())
+            .group_by(AIUsage.transcript_id)
+            .order_by(cost.desc(), func.sum(AIUsage.prompt_tokens + AIUsage.completion_tokens).desc())
+            .limit(top)
+        )).all()
+
+        return {
+            "since": since,
+            "totals": _totals_dict(totals),
+            "by_operation": [
+                {"provider": r.provider, "model": r.model, "operation": r.operation, **_totals_dict(r)}
+                for r in by_operation
+            ],
+            "top_transcripts": [
+                {"transcript_id": r.transcript_id, **_totals_dict(r)}
+                for r in top_transcripts
+            ],
+            "token_budget": self.token_budget(user),
+            "tokens_used_this_month": await self.tokens_used_since(user.id, month_start()),
+        }
@@ -0,0 +1,161 @@
+"""
+Reuses finished output when a video is submitted again with the same generation parameters.
+
+Completed transcripts are registered in `video_outputs`, unique on the normalized
+video ID plus a hash of the generation parameters. A repeat submission clones that
+transcript's atoms and posts with INSERT ... SELECT statements and is completed immediately.
+"""
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from typing import Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import select, insert, delete, literal, cast, union_all, Boolean, DateTime, Integer, String, Uuid
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.content import Transcript, ContentAtom, Post, VideoOutput
+
+def generation_key(tone: str, emoji_usage: str, platforms: Sequence[str]) -> str:
+    """
+    Stable hash of everything that shapes the generated output.
+    """
+    provider = "mock" if settings.USE_MOCK_AI else settings.AI_PROVIDER.lower()
+    params = {
+        "tone": tone.strip().lower(),
+        "emoji_usage": emoji_usage.strip().lower(),
+        "platforms": sorted(platforms),
+        "provider": provider,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+async def register_video_output(db: AsyncSession, transcript_id: UUID):
+    """
+    Records a newly completed transcript as the reusable output for its video.
+    The first completion wins; later ones (including clones) are ignored.
+    """
+    result = await db.execute(
+        select(Transcript.video_id, Transcript.generation_key).where(Transcript.id == transcript_id)
+    )
+    row = result.first()
+    if not row or not row.video_id or not row.generation_key:
+        return
+    db.add(VideoOutput(video_id=row.video_id, generation_key=row.generation_key, transcript_id=transcript_id))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+
+def _id_map(name: str, rows: Sequence[Tuple[UUID, ...]]):
+    """
+    Old-to-new ID mapping as a derived table: (old_id, new_id[, new_atom_id]) per row.
+    """
+    labels = ("old_id", "new_id", "new_atom_id")
+    return union_all(*(
+        select(*(cast(literal(value, Uuid()), Uuid()).label(label) for value, label in zip(row, labels)))
+        for row in rows
+    )).subquery(name)
+
+class VideoOutputService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find_completed(self, video_id: str, key: str):
+        """
+        Returns (transcript_id, source_type) of the registered transcript for this
+        video and parameters if it is still completed; drops stale registrations.
+        """
+        result = await self.db.execute(
+            select(VideoOutput.id, VideoOutput.transcript_id, Transcript.status, Transcript.source_type)
+            .join(Transcript, VideoOutput.transcript_id == Transcript.id)
+            .where(VideoOutput.video_id == video_id, VideoOutput.generation_key == key)
+        )
+        row = result.first()
+        if not row:
+            return None
+        if row.status != "completed":
+            await self.db.execute(delete(VideoOutput).where(VideoOutput.id == row.id))
+            await self.db.commit()
+            return None
+        return row
+
+    async def clone(self, source_id: UUID, user_id: UUID, youtube_url: str) -> Tuple[UUID, int]:
+        """
+        Copies a completed transcript with its atoms and posts for `user_id`.
+        Returns (new transcript id, post count).
+        """
+        new_id = uuid.uuid4()
+        now = datetime.utcnow()
+        # INSERT ... SELECT keeps raw_text inside the database
+        await self.db.execute(
+            insert(Transcript).from_select(
+                [
+                    "id", "user_id", "youtube_url", "raw_text", "status", "source_type", "created_at",
+                    "version", "schedule_version", "text_key", "atoms_key", "segments_key", "video_id", "generation_key",
+                ],
+                select(
+                    literal(new_id, Uuid()),
+                    literal(user_id, Uuid()),
+                    literal(youtube_url, String()),
+                    Transcript.raw_text,
+                    literal("completed", String()),
+                    Transcript.source_type,
+                    literal(now, DateTime()),
+                    literal(1, Integer()),
+                    literal(0, Integer()),
+                    Transcript.text_key,
+                    Transcript.atoms_key,
+                    Transcript.segments_key,
+                    Transcript.video_id,
+                    Transcript.generation_key,
+                ).where(Transcript.id == source_id),
+            )
+        )
+
+        # Only IDs come back to Python; atom and post text is copied by INSERT ... SELECT
+        result = await self.db.execute(select(ContentAtom.id).where(ContentAtom.transcript_id == source_id))
+        atom_ids = {atom_id: uuid.uuid4() for atom_id in result.scalars()}
+        result = await self.db.execute(
+            select(Post.id, Post.content_atom_id)
+            .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+            .where(ContentAtom.transcript_id == source_id)
+        )
+        post_ids = [(post.id, uuid.uuid4(), atom_ids[post.content_atom_id]) for post in result.all()]
+
+        if atom_ids:
+            atom_map = _id_map("atom_map", list(atom_ids.items()))
+            await self.db.execute(
+                insert(ContentAtom).from_select(
+                    ["id", "transcript_id", "type", "text", "position", "simhash", "start_seconds", "created_at"],
+                    select(
+                        atom_map.c.new_id,
+                        literal(new_id, Uuid()),
+                        ContentAtom.type,
+                        ContentAtom.text,
+                        ContentAtom.position,
+                        ContentAtom.simhash,
+                        ContentAtom.start_seconds,
+                        literal(now, DateTime()),
+                    ).join(atom_map, ContentAtom.id == atom_map.c.old_id),
+                )
+            )
+        if post_ids:
+            post_map = _id_map("post_map", post_ids)
+            # Every copy starts included: the source's exclusions are its submitter's curation
+            await self.db.execute(
+                insert(Post).from_select(
+                    ["id", "content_atom_id", "user_id", "platform", "text", "included", "created_at"],
+                    select(
+                        post_map.c.new_id,
+                        post_map.c.new_atom_id,
+                        literal(user_id, Uuid()),
+                        Post.platform,
+                        Post.text,
+                        literal(True, Boolean()),
+                        literal(now, DateTime()),
+                    ).join(post_map, Post.id == post_map.c.old_id),
+                )
+            )
+        await self.db.commit()
+        return new_id, len(post_ids)
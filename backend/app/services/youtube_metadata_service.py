@@ -1,10 +1,47 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional
-import yt_dlp
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Union
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Building a YoutubeDL loads every extractor, so each pool thread keeps one and reuses it.
+# yt_dlp itself is imported on first use to keep API startup fast.
+_thread_state = threading.local()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool of YTDLP_POOL_SIZE threads; its size caps concurrent extractions.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.YTDLP_POOL_SIZE, thread_name_prefix="yt-dlp")
+        return _executor
+
+# Per event loop (asyncio primitives are loop-bound): lookups handed to the pool at a time
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _loop_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(settings.YTDLP_POOL_SIZE)
+    return semaphore
+
+def shutdown_metadata_pool():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
 class VideoMetadataNotAvailableError(Exception):
     def __init__(self, reason: str):
         self.reason = reason
@@ -17,8 +54,21 @@ class YouTubeMetadataService:
             'no_warnings': True,
             'skip_download': True,
             'extract_flat': True, # Fast extraction, does not download video
+            'socket_timeout': settings.YTDLP_TIMEOUT, # Bounds a call even after its awaiter timed out
         }
 
+    def _ydl(self):
+        ydl = getattr(_thread_state, "ydl", None)
+        if ydl is None:
+            import yt_dlp
+            ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+            _thread_state.ydl = ydl
+        return ydl
+
+    def _discard_ydl(self):
+        # Don't reuse an instance that failed in an unexpected way
+        _thread_state.ydl = None
+
     def fetch_metadata(self, url: str) -> Dict[str, Any]:
         """
         Fetches metadata for a given YouTube URL.
@@ -37,33 +87,82 @@ class YouTubeMetadataService:
              raise VideoMetadataNotAvailableError("Empty URL provided")
 
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                try:
-                    info = ydl.extract_info(url, download=False)
-                except yt_dlp.utils.DownloadError as e:
-                    raise VideoMetadataNotAvailableError(str(e))
-                
-                if not info:
-                    raise VideoMetadataNotAvailableError("No info returned from yt-dlp")
-
-                # Parse relevant fields
-                metadata = {
-                    "title": info.get("title"),
-                    "description": info.get("description"),
-                    "channel_name": info.get("uploader") or info.get("channel"),
-                    "duration": info.get("duration"),
-                    "view_count": info.get("view_count"),
-                    "video_id": info.get("id")
-                }
-                
-                # Check critical fields
-                if not metadata["title"]:
-                     raise VideoMetadataNotAvailableError("Could not retrieve video title")
-                     
-                return metadata
+            from yt_dlp.utils import DownloadError
+            ydl = self._ydl()
+            try:
+                info = ydl.extract_info(url, download=False)
+            except DownloadError as e:
+                raise VideoMetadataNotAvailableError(str(e))
+            
+            if not info:
+                raise VideoMetadataNotAvailableError("No info returned from yt-dlp")
+
+            # Parse relevant fields
+            metadata = {
+                "title": info.get("title"),
+                "description": info.get("description"),
+                "channel_name": info.get("uploader") or info.get("channel"),
+                "duration": info.get("duration"),
+                "view_count": info.get("view_count"),
+                "video_id": info.get("id")
+            }
+            
+            # Check critical fields
+            if not metadata["title"]:
+                 raise VideoMetadataNotAvailableError("Could not retrieve video title")
+                 
+            return metadata
 
         except Exception as e:
             if isinstance(e, VideoMetadataNotAvailableError):
                 raise e
+            self._discard_ydl()
             logger.error(f"Error fetching metadata for {url}: {e}")
             raise VideoMetadataNotAvailableError(f"Unexpected error: {str(e)}")
+
+    async def fetch_metadata_async(self, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Runs fetch_metadata on the shared yt-dlp pool without blocking the event loop.
+        At most YTDLP_POOL_SIZE lookups per event loop are handed to the pool at once.
+        Raises VideoMetadataNotAvailableError after `timeout` seconds (YTDLP_TIMEOUT),
+        counted from when the lookup starts running, not while it waits its turn.
+        """
+        timeout = timeout or settings.YTDLP_TIMEOUT
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+
+        def mark_started(_=None):
+            if not started.done():
+                started.set_result(None)
+
+        def run():
+            loop.call_soon_threadsafe(mark_started)
+            return self.fetch_metadata(url)
+
+        async with _loop_semaphore():
+            job = loop.run_in_executor(_get_executor(), run)
+            job.add_done_callback(mark_started) # e.g. the pool was shut down before it ran
+            try:
+                # Threads from other loops share the pool, so the call may still queue briefly
+                await started
+                return await asyncio.wait_for(job, timeout=timeout)
+            except asyncio.TimeoutError:
+                raise VideoMetadataNotAvailableError(f"Timed out after {timeout}s")
+            finally:
+                job.cancel() # No-op once finished; drops the call if it never started
+
+    async def fetch_metadata_many(
+        self, urls: Sequence[str], timeout: Optional[float] = None
+    ) -> List[Union[Dict[str, Any], VideoMetadataNotAvailableError]]:
+        """
+        Fetches metadata for several URLs concurrently (up to YTDLP_POOL_SIZE at a time).
+        Results are in input order; failed lookups are returned as their error.
+        """
+        results = await asyncio.gather(
+            *(self.fetch_metadata_async(url, timeout) for url in urls),
+            return_exceptions=True,
+        )
+        return [
+            r if isinstance(r, (dict, VideoMetadataNotAvailableError)) else VideoMetadataNotAvailableError(str(r))
+            for r in results
+        ]
@@ -0,0 +1,25 @@
+import hashlib
+from typing import Any, Optional
+
+def make_etag(*parts: Any) -> str:
+    """
+    Builds a weak ETag from cheap version stamps (ids, counters) instead of the response body.
+    """
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluates an If-None-Match header against the current ETag (weak comparison).
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
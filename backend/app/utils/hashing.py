@@ -0,0 +1,13 @@
+"""
+Helpers for 64-bit SimHash fingerprints, shared by rewrite reuse and post scoring.
+Imports NumPy, so keep it out of API startup.
+"""
+from typing import Sequence
+
+import numpy as np
+
+def as_uint64(fingerprints: Sequence[int]) -> np.ndarray:
+    """
+    Signed BIGINT fingerprints (as stored) reinterpreted bit for bit as uint64.
+    """
+    return np.array(fingerprints, dtype=np.int64).view(np.uint64)
@@ -0,0 +1,55 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+class InvalidCursorError(ValueError):
+    pass
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """
+    Encodes the (created_at, id) keyset of the last row on a page into an opaque cursor.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_str, id_str = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at_str), uuid.UUID(id_str)
+    except Exception:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+def paginate_keyset(query: Select, created_at_col, id_col, cursor: Optional[str], limit: int) -> Select:
+    """
+    Applies newest-first keyset pagination on (created_at, id) to a select.
+    Fetches one extra row so the caller can tell whether another page exists.
+    The row-value comparison lets the (created_at, id) index serve the seek
+    directly, so every page costs the same regardless of depth (no OFFSET scan).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_at_col, id_col) < tuple_(created_at, row_id))
+
+    return query.order_by(created_at_col.desc(), id_col.desc()).limit(limit + 1)
+
+def split_page(rows: list, limit: int, created_at_attr: str = "created_at", id_attr: str = "id") -> Tuple[list, Optional[str]]:
+    """
+    Trims the look-ahead row returned by `paginate_keyset` and builds the next cursor.
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_at_attr), getattr(last, id_attr))
@@ -1,5 +1,8 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown, worker_shutdown, task_prerun, task_postrun
+from kombu import Queue
 from app.core.config import settings
+from app.core.queues import ALL_QUEUES, DEFAULT_QUEUE, TRANSCRIPTION_QUEUE, GENERATION_QUEUE, PUBLISHING_QUEUE
 
 celery_app = Celery(
     "worker",
@@ -8,9 +11,60 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Messages carry IDs and artifact keys only (large payloads live in app/services/artifact_store.py).
+    # json stays accepted so messages queued before a deploy still run.
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    result_compression="zlib",
+    # Nothing reads task results; tasks that need one set ignore_result=False
+    task_ignore_result=True,
+    result_expires=3600,
     timezone="UTC",
     enable_utc=True,
+    # Separate queues so long Whisper jobs never sit in front of quick generation jobs
+    task_queues=[Queue(name) for name in ALL_QUEUES],
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes={
+        "app.workers.tasks.transcribe_video_task": {"queue": TRANSCRIPTION_QUEUE},
+        "app.workers.tasks.generate_content_task": {"queue": GENERATION_QUEUE},
+        "app.workers.tasks.publish_schedule_task": {"queue": PUBLISHING_QUEUE},
+        # run_stage_task is sent to its stage's queue explicitly (app/pipeline/distributed.py)
+    },
+    # Reserve one message per worker process/thread and ack only after the task finishes,
+    # so a busy worker doesn't hoard jobs and a crashed one gives them back
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    broker_transport_options={"visibility_timeout": settings.CELERY_VISIBILITY_TIMEOUT},
 )
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """
+    Exposes worker metrics (stage histograms, token counters, in-flight and queue gauges).
+    Set PROMETHEUS_MULTIPROC_DIR so prefork children report into the same endpoint.
+    """
+    if not settings.METRICS_WORKER_PORT:
+        return
+    from prometheus_client import start_http_server
+    from app.core.metrics import build_registry
+    start_http_server(settings.METRICS_WORKER_PORT, registry=build_registry())
+
+@task_prerun.connect
+def track_task_started(task=None, **kwargs):
+    from app.core.metrics import CELERY_TASKS_IN_FLIGHT
+    CELERY_TASKS_IN_FLIGHT.labels(task=task.name).inc()
+
+@task_postrun.connect
+def track_task_finished(task=None, **kwargs):
+    from app.core.metrics import CELERY_TASKS_IN_FLIGHT
+    CELERY_TASKS_IN_FLIGHT.labels(task=task.name).dec()
+
+@worker_process_shutdown.connect # prefork children
+@worker_shutdown.connect # threads/solo pools, after the pool has stopped
+def close_pooled_clients(**kwargs):
+    from app.workers.event_loop import shutdown_worker_loops
+    from app.services.youtube_metadata_service import shutdown_metadata_pool
+    shutdown_worker_loops()
+    shutdown_metadata_pool()
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, List
+
+_local = threading.local()
+# Every worker thread's loop, so process shutdown can close them all
+_loops: List[asyncio.AbstractEventLoop] = []
+_loops_lock = threading.Lock()
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns this worker thread's persistent event loop.
+    asyncio.run() would create and close a loop per task, discarding pooled
+    AI clients and DB connections (which are bound to their loop) every time.
+    """
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _local.loop = loop
+        with _loops_lock:
+            _loops.append(loop)
+    return loop
+
+def run_async(coro: Coroutine) -> Any:
+    """
+    Runs a coroutine to completion on the persistent worker loop.
+    """
+    return get_worker_loop().run_until_complete(coro)
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Closes the loop's pooled AI clients and DB connections, then the loop itself.
+    Both are bound to the loop, so they are closed by running on it.
+    """
+    from app.core.database import dispose_engines
+    from app.services.ai.factory import close_ai_providers
+
+    async def _close():
+        await close_ai_providers()
+        await dispose_engines()
+
+    try:
+        loop.run_until_complete(_close())
+    finally:
+        loop.close()
+
+def shutdown_worker_loops() -> None:
+    """
+    Closes every worker thread's loop. Called once the pool has stopped, so the loops
+    are idle; one still running a task (cold shutdown) is left to process exit.
+    """
+    with _loops_lock:
+        loops, _loops[:] = list(_loops), []
+    for loop in loops:
+        if loop.is_closed() or loop.is_running():
+            continue
+        _close_loop(loop)
+    _local.loop = None
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, TypeVar
+from uuid import UUID
+from sqlalchemy import select, update, or_
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.content import Transcript
+
+class LeaseHeldError(Exception):
+    """
+    Another worker holds the transcript's lease. The job must be retried, not
+    dropped: the holder may have crashed, leaving a lease that has yet to expire.
+    """
+    def __init__(self, transcript_id: UUID, retry_after: float):
+        self.transcript_id = transcript_id
+        self.retry_after = retry_after # Seconds until the current lease expires
+        super().__init__(f"Transcript {transcript_id} is leased by another worker for {retry_after:.0f}s")
+
+class TranscriptLease:
+    """
+    Per-transcript processing lease stored on the transcript row.
+
+    Acks-late redelivery and retries can hand the same job to two workers at once;
+    only the lease holder processes it. A crashed holder's lease simply expires.
+    Lease writes pin `version` so they don't invalidate status ETags.
+    """
+    def __init__(self, transcript_id: UUID, owner: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        self.transcript_id = transcript_id
+        self.owner = owner or uuid.uuid4().hex
+        self.ttl = timedelta(seconds=ttl_seconds or settings.PIPELINE_LEASE_SECONDS)
+        self.expires_at: Optional[datetime] = None
+
+    async def _claim(self) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + self.ttl
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Transcript)
+                .where(
+                    Transcript.id == self.transcript_id,
+                    or_(
+                        Transcript.lease_owner.is_(None),
+                        Transcript.lease_owner == self.owner,
+                        Transcript.lease_expires_at < now,
+                    ),
+                )
+                .values(lease_owner=self.owner, lease_expires_at=expires_at, version=Transcript.version)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount != 1:
+            return False
+        self.expires_at = expires_at
+        return True
+
+    async def acquire(self) -> bool:
+        return await self._claim()
+
+    async def held_for(self) -> Optional[float]:
+        """
+        Seconds left on the current holder's lease (0 if unleased); None if the transcript doesn't exist.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Transcript.lease_expires_at).where(Transcript.id == self.transcript_id))
+            row = result.first()
+        if row is None:
+            return None
+        if row.lease_expires_at is None:
+            return 0.0
+        return max((row.lease_expires_at - datetime.utcnow()).total_seconds(), 0.0)
+
+    async def renew(self) -> bool:
+        """
+        Extends the lease once less than half of it remains (cheap to call per work unit).
+        """
+        if self.expires_at and self.expires_at - datetime.utcnow() > self.ttl / 2:
+            return True
+        return await self._claim()
+
+    async def release(self):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Transcript)
+                .where(Transcript.id == self.transcript_id, Transcript.lease_owner == self.owner)
+                .values(lease_owner=None, lease_expires_at=None, version=Transcript.version)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        self.expires_at = None
+
+T = TypeVar("T")
+
+async def _keep_lease(lease: TranscriptLease, job: asyncio.Future):
+    """
+    Renews the lease while the job runs; cancels the job if another worker took it over.
+    """
+    while True:
+        await asyncio.sleep(lease.ttl.total_seconds() / 3)
+        if not await lease.renew():
+            print(f"Lost processing lease for transcript {lease.transcript_id}; stopping.")
+            job.cancel()
+            return
+
+async def run_leased(transcript_id: UUID, work: Callable[[], Awaitable[T]]) -> Optional[T]:
+    """
+    Runs `work()` while holding the transcript's lease, renewing it in the background.
+    Raises LeaseHeldError while another worker holds it. Returns None without running
+    if the transcript doesn't exist, or after cancelling `work` if the lease was lost.
+    """
+    lease = TranscriptLease(transcript_id)
+    if not await lease.acquire():
+        held_for = await lease.held_for()
+        if held_for is None:
+            print(f"Transcript {transcript_id} not found; skipping.")
+            return None
+        raise LeaseHeldError(transcript_id, held_for)
+
+    job = asyncio.ensure_future(work())
+    keeper = asyncio.create_task(_keep_lease(lease, job))
+    try:
+        return await job
+    except asyncio.CancelledError:
+        if not keeper.done():
+            raise
+        # Lease lost: another worker owns the job now; leave its status alone
+        return None
+    finally:
+        keeper.cancel()
+        await lease.release()
@@ -0,0 +1,60 @@
+"""
+Starts a Celery worker for one queue with the pool type suited to its work:
+
+    python -m app.workers.run_worker transcription     # prefork (CPU-bound Whisper)
+    python -m app.workers.run_worker generation        # threads (I/O-bound LLM calls)
+    python -m app.workers.run_worker publishing --concurrency 4
+    python -m app.workers.run_worker generation --pool gevent   # requires gevent
+
+Pool and concurrency defaults come from QUEUE_WORKERS in app/core/queues.py.
+Extra arguments after `--` are passed to `celery worker` unchanged.
+"""
+import argparse
+import sys
+
+def build_argv(queue: str, pool: str, concurrency: int, max_tasks_per_child: int, loglevel: str, extra=()):
+    argv = [
+        "worker",
+        f"--queues={queue}",
+        f"--pool={pool}",
+        f"--concurrency={concurrency}",
+        f"--hostname={queue}@%h",
+        f"--loglevel={loglevel}",
+    ]
+    if pool == "prefork" and max_tasks_per_child:
+        argv.append(f"--max-tasks-per-child={max_tasks_per_child}")
+    return argv + list(extra)
+
+def main():
+    from app.core.config import settings
+    from app.core.queues import QUEUE_WORKERS
+
+    parser = argparse.ArgumentParser(description="Run a Celery worker for a single queue")
+    parser.add_argument("queue", choices=sorted(QUEUE_WORKERS))
+    parser.add_argument("--pool", choices=["prefork", "threads", "gevent", "solo"], default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--loglevel", default="info")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Overrides METRICS_WORKER_PORT (needed when several workers share a host)")
+    args, extra = parser.parse_known_args()
+    if extra and extra[0] == "--":
+        extra = extra[1:]
+
+    if args.metrics_port is not None:
+        settings.METRICS_WORKER_PORT = args.metrics_port # Read by the worker_init signal handler
+
+    spec = QUEUE_WORKERS[args.queue]
+    pool = args.pool or spec.pool
+    if pool == "gevent":
+        from gevent import monkey
+        monkey.patch_all()
+
+    from app.workers.celery_app import celery_app
+    import app.workers.tasks # noqa: F401  (registers tasks)
+
+    argv = build_argv(args.queue, pool, args.concurrency or spec.concurrency, spec.max_tasks_per_child, args.loglevel, extra)
+    print(f"Starting {args.queue} worker: celery {' '.join(argv)}")
+    celery_app.worker_main(argv)
+
+if __name__ == "__main__":
+    sys.exit(main())
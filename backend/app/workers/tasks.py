@@ -1,10 +1,37 @@
 from app.workers.celery_app import celery_app
-from app.workers.content_processor import process_content
+from app.workers.content_processor import start_content_pipeline
+from app.pipeline.content import PIPELINES, mark_failed
+from app.pipeline.distributed import downstream_backlogged, run_stage, submit
+from app.core.profiling import profile_block
+from app.workers.event_loop import run_async
+from app.workers.lease import LeaseHeldError
+from celery.exceptions import Retry
 from time import sleep
-import asyncio
+from typing import Optional
 from uuid import UUID
 
-@celery_app.task
+def _profile_requested(task) -> bool:
+    # Opt in per message: task.apply_async(args, headers={"profile": True})
+    return bool(getattr(task.request, "profile", False))
+
+def _retry_when_lease_expires(task, e: LeaseHeldError, queue: Optional[str] = None) -> Retry:
+    """
+    Re-sends the task for when the lease expires, like task.retry() but without
+    counting a retry: waiting on another worker (or a crashed one's lease) is not a
+    failure, so it never uses up max_retries however long the lease is held.
+    """
+    request = task.request
+    if request.called_directly:
+        raise e
+    countdown = e.retry_after + 1
+    if request.is_eager:
+        # apply() would re-run it at once, while the lease is still held
+        return Retry(exc=e, when=countdown, is_eager=True)
+    signature = task.signature_from_request(request, countdown=countdown, retries=request.retries, queue=queue)
+    signature.apply_async()
+    return Retry(exc=e, when=countdown, sig=signature)
+
+@celery_app.task(ignore_result=False) # Smoke test: callers wait on the result
 def test_celery_task(word: str):
     sleep(1)
     return f"Hello {word}"
@@ -16,79 +43,71 @@ def generate_content_task(self, transcript_id: str):
     """
     try:
         # We need to run the async function in the synchronous Celery worker
-        asyncio.run(process_content(UUID(transcript_id)))
+        # (on a persistent loop so pooled AI/DB connections survive between tasks)
+        with profile_block("task", self.request.id or transcript_id, requested=_profile_requested(self)):
+            run_async(start_content_pipeline(UUID(transcript_id)))
         return f"Content generation completed for {transcript_id}"
+    except LeaseHeldError as e:
+        # Possibly a crashed worker's lease: come back once it expires instead of acking the job away
+        raise _retry_when_lease_expires(self, e)
     except Exception as e:
         # Logic to handle exceptions if needed beyond autoretry
         raise e
 
-from app.services.whisper_service import WhisperTranscriptionService
-
 from app.core.database import AsyncSessionLocal
-from app.models.content import Transcript
-from sqlalchemy import select
+from app.core.config import settings
 
 @celery_app.task(bind=True, max_retries=3, autoretry_for=(Exception,), retry_backoff=True)
 def transcribe_video_task(self, transcript_id: str):
     """
-    Celery task for Whisper transcription.
+    Celery task for Whisper transcription followed by content generation (whisper stage graph).
     """
     try:
-        # Resolve transcript_id to UUID
-        t_id = UUID(transcript_id)
-        
-        # Async logic wrapper
-        async def run_transcription():
-            async with AsyncSessionLocal() as db:
-                result = await db.execute(select(Transcript).where(Transcript.id == t_id))
-                transcript = result.scalars().first()
-                
-                if not transcript:
-                    print(f"Transcript {transcript_id} not found.")
-                    return "TRANSCRIPT_NOT_FOUND"
+        with profile_block("task", self.request.id or transcript_id, requested=_profile_requested(self)):
+            run_async(start_content_pipeline(UUID(transcript_id), whisper=True))
+        return f"Transcription pipeline started for {transcript_id}"
 
-                try:
-                    # Extract video ID from URL stored in transcript
-                    # We might need TranscriptService instance for extraction logic or just do it here
-                    # For simplicity, let's use TranscriptService helper or just assume we pass video_id?
-                    # No, we have the URL in DB. Let's re-use TranscriptService extraction logic or do it inline.
-                    # Ideally we instantiated TranscriptService in the task.
-                    from app.services.transcript_service import TranscriptService
-                    ts = TranscriptService()
-                    video_id = ts.extract_video_id(transcript.youtube_url)
-                    
-                    if not video_id:
-                        raise Exception("Could not extract video ID from URL")
+    except LeaseHeldError as e:
+        raise _retry_when_lease_expires(self, e)
+    except Exception as e:
+        print(f"Error in Whisper task: {e}")
+        raise e
 
-                    service = WhisperTranscriptionService()
-                    transcript_text = service.transcribe(video_id)
-                    
-                    # Update Record
-                    transcript.raw_text = transcript_text
-                    # Trigger next step? 
-                    # Actually, if we just save it, the Status is still 'processing'.
-                    # We should trigger generation.
-                    
-                    db.add(transcript)
-                    await db.commit()
-                    
-                    print(f"Whisper transcription completed for {video_id}. Triggering content generation.")
-                    
-                    # Chain the next task
-                    generate_content_task.delay(str(transcript.id))
-                    
-                    return transcript_text
-                    
-                except Exception as inner_e:
-                    print(f"Transcription failed: {inner_e}")
-                    transcript.status = "failed"
-                    transcript.error_message = str(inner_e)
-                    db.add(transcript)
-                    await db.commit()
-                    raise inner_e
+@celery_app.task(bind=True, max_retries=3)
+def run_stage_task(self, pipeline_name: str, stage_index: int, item: dict):
+    """
+    Runs one pipeline stage for one item (PIPELINE_MODE=celery) and enqueues its outputs.
+    """
+    pipeline = PIPELINES[pipeline_name]
+    stage = pipeline.stages[stage_index]
 
-        return asyncio.run(run_transcription())
+    if downstream_backlogged(pipeline, stage_index):
+        # Backpressure: hand the item back with a delay instead of flooding the next queue
+        submit(pipeline, item, stage_index, countdown=settings.PIPELINE_BACKPRESSURE_DELAY)
+        return
 
+    try:
+        with profile_block("task", self.request.id or stage.name, requested=_profile_requested(self)):
+            run_async(run_stage(pipeline, stage_index, item))
+    except LeaseHeldError as e:
+        raise _retry_when_lease_expires(self, e, queue=stage.queue)
     except Exception as e:
-        print(f"Error in Whisper task: {e}")
-        raise e
+        if self.request.retries >= self.max_retries:
+            print(f"Stage {pipeline_name}.{stage.name} failed permanently: {e}")
+            run_async(mark_failed(item["transcript_id"], str(e)))
+            raise e
+        raise self.retry(exc=e, countdown=2 ** self.request.retries, queue=stage.queue)
+
+from app.services.publishing_service import PublishingService
+
+@celery_app.task(bind=True, max_retries=3, autoretry_for=(Exception,), retry_backoff=True)
+def publish_schedule_task(self, transcript_id: str):
+    """
+    Celery task for publishing a transcript's schedule (publishing queue).
+    """
+    async def run_publishing():
+        async with AsyncSessionLocal() as db:
+            return await PublishingService.publish_schedule(db, UUID(transcript_id))
+
+    published_count = run_async(run_publishing())
+    return f"Published {published_count} posts for {transcript_id}"
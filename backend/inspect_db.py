@@ -15,7 +15,7 @@ async def inspect_db():
             # Check Transcripts (Step 1)
             print("\n=== STEP 1: Transcripts (Last 3) ===")
             try:
-                rows = await conn.execute(text("SELECT id, status, left(raw_text, 50) as snippet, error_message FROM transcripts ORDER BY id DESC LIMIT 3"))
+                rows = await conn.execute(text("SELECT id, status, left(raw_text, 50) as snippet, error_message FROM transcripts ORDER BY created_at DESC, id DESC LIMIT 3"))
                 transcripts = rows.fetchall()
                 for t in transcripts:
                     print(f"ID: {t.id} | Status: {t.status} | Error: {t.error_message} | Text: {t.snippet}...")
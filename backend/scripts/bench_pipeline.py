@@ -0,0 +1,320 @@
+"""
+Offline end-to-end benchmark for the content pipeline.
+
+Runs process_content, SchedulingService.generate_schedule and the read API routes
+against a throwaway SQLite database (or --database-url, e.g. an ephemeral Postgres)
+with MockProvider standing in for the LLM. Reports jobs/sec, per-stage latency
+percentiles, route latencies and DB statement counts, and compares them with a
+stored baseline. MockProvider is seeded (--seed) so injected latencies and failures
+repeat; statement counts and completed jobs fail the run when they regress, timings
+are machine-dependent and only warn.
+
+    python -m scripts.bench_pipeline                      # run and compare with baseline
+    python -m scripts.bench_pipeline --save-baseline      # record a new baseline
+    python -m scripts.bench_pipeline --jobs 200 --failure-rate 0.05 --database-url postgresql+asyncpg://localhost/bench
+
+Every table in the target database is dropped first; --database-url is refused
+unless it is SQLite or a local server, or --i-know-this-drops-tables is passed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Tuple
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "bench_pipeline.json")
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline content pipeline benchmark")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--route-requests", type=int, default=200)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file (requires aiosqlite). ALL TABLES ARE DROPPED")
+    parser.add_argument("--i-know-this-drops-tables", action="store_true", help="Allow a --database-url that is not SQLite or on this machine")
+    parser.add_argument("--extract-latency", type=float, default=0.2, help="Median seconds per mock extraction")
+    parser.add_argument("--rewrite-latency", type=float, default=0.02, help="Median seconds per mock rewrite")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal spread of mock latencies")
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--atoms", type=int, default=12, help="Atoms returned per mock extraction")
+    parser.add_argument("--seed", type=int, default=0, help="MockProvider seed, so injected latencies and failures repeat")
+    parser.add_argument("--rewrite-reuse", action="store_true", help="Enable similarity reuse (mock atoms repeat across jobs, so most rewrites hit)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression before failing (counters) or warning (timings)")
+    args = parser.parse_args()
+    if args.database_url and not args.i_know_this_drops_tables and not is_disposable(args.database_url):
+        parser.error(
+            "refusing to drop every table in --database-url: it is not SQLite or a local server. "
+            "Pass --i-know-this-drops-tables if it is a throwaway database."
+        )
+    return args
+
+def is_disposable(database_url: str) -> bool:
+    """
+    SQLite files and servers on this machine (TCP loopback or a Unix socket).
+    """
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return True
+    socket = url.query.get("host")
+    if isinstance(socket, tuple):
+        socket = socket[0]
+    if not url.host:
+        return not socket or socket.startswith("/")
+    return url.host in LOCAL_HOSTS
+
+def configure_environment(args) -> str:
+    """
+    Settings are read at import time, so the environment must be set before importing app.*
+    """
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite+aiosqlite:///{os.path.join(work_dir, 'bench.db')}"
+
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+    os.environ["USE_MOCK_AI"] = "true"
+    os.environ["ARTIFACT_STORE"] = "local"
+    os.environ["ARTIFACT_DIR"] = os.path.join(work_dir, "artifacts")
+    os.environ["MOCK_AI_EXTRACT_LATENCY"] = str(args.extract_latency)
+    os.environ["MOCK_AI_REWRITE_LATENCY"] = str(args.rewrite_latency)
+    os.environ["MOCK_AI_LATENCY_SIGMA"] = str(args.latency_sigma)
+    os.environ["MOCK_AI_FAILURE_RATE"] = str(args.failure_rate)
+    os.environ["MOCK_AI_ATOM_COUNT"] = str(args.atoms)
+    os.environ["MOCK_AI_SEED"] = str(args.seed)
+    os.environ["REWRITE_REUSE_ENABLED"] = "true" if args.rewrite_reuse else "false"
+    return database_url
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+    def take(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+async def run(args) -> Dict:
+    import contextlib
+    import io
+    import httpx
+    from sqlalchemy import event, select
+    from app.core.database import get_engine, dispose_engines, AsyncSessionLocal
+    from app.core.metrics import stage_observers
+    from app.main import app
+    from app.models import Base, User, Transcript
+    from app.services.scheduling_service import SchedulingService
+    from app.workers.content_processor import process_content
+
+    engine = get_engine()
+    engine.sync_engine.echo = False
+    logging.getLogger("api").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    statements = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", statements)
+
+    stage_samples: Dict[str, List[float]] = defaultdict(list)
+    stage_observers.append(lambda stage, seconds: stage_samples[stage].append(seconds))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        user = User(email="bench@example.com")
+        db.add(user)
+        await db.flush()
+        transcripts = [
+            Transcript(
+                user_id=user.id,
+                youtube_url=f"https://www.youtube.com/watch?v=bench{i:07d}",
+                raw_text="Benchmark transcript. " * 200,
+                status="queued",
+            )
+            for i in range(args.jobs)
+        ]
+        db.add_all(transcripts)
+        await db.commit()
+        transcript_ids = [t.id for t in transcripts]
+    statements.take()
+
+    report: Dict = {"config": {k: v for k, v in vars(args).items() if k not in ("baseline", "save_baseline", "tolerance", "i_know_this_drops_tables")}}
+
+    # 1. Content generation
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = 0
+    job_latencies: List[float] = []
+
+    async def run_job(transcript_id):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await process_content(transcript_id)
+            except Exception:
+                failures += 1
+            job_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()): # worker code prints per job
+        await asyncio.gather(*(run_job(t_id) for t_id in transcript_ids))
+    elapsed = time.perf_counter() - started
+    report["process_content"] = {
+        "jobs": args.jobs,
+        "failed": failures,
+        "jobs_per_sec": round(args.jobs / elapsed, 2),
+        "latency": summarize(job_latencies),
+        "statements_per_job": round(statements.take() / args.jobs, 2),
+    }
+
+    # 2. Schedule generation
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Transcript.id).where(Transcript.status == "completed"))
+        completed_ids = result.scalars().all()
+
+    service = SchedulingService()
+    schedule_latencies: List[float] = []
+    for t_id in completed_ids:
+        started = time.perf_counter()
+        await service.generate_schedule(t_id, date(2030, 1, 1))
+        schedule_latencies.append(time.perf_counter() - started)
+    report["generate_schedule"] = {
+        "latency": summarize(schedule_latencies),
+        "statements_per_call": round(statements.take() / max(len(completed_ids), 1), 2),
+    }
+
+    # 3. Read API routes (in-process ASGI, no network)
+    routes = {
+        "status": "/api/v1/content/status/{id}",
+        "schedule_preview": "/api/v1/content/schedule/preview/{id}",
+        "list_posts": "/api/v1/content/posts?transcript_id={id}",
+        "list_transcripts": "/api/v1/content/transcripts",
+    }
+    report["routes"] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, template in routes.items():
+            latencies = []
+            for i in range(args.route_requests):
+                url = template.format(id=completed_ids[i % len(completed_ids)]) if completed_ids else template.format(id=transcript_ids[0])
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+            report["routes"][name] = {
+                **summarize(latencies),
+                "statements_per_request": round(statements.take() / args.route_requests, 2),
+            }
+
+    report["stages"] = {stage: summarize(samples) for stage, samples in sorted(stage_samples.items())}
+    await dispose_engines()
+    return report
+
+def regressions(current: Dict, baseline: Dict, tolerance: float) -> Tuple[List[str], List[str]]:
+    """
+    (failures, warnings) vs the baseline. Counters (statements, completed jobs) are
+    repeatable and fail the run; timings depend on the machine and only warn.
+    Stages that just measure MockProvider's injected latency (llm_*) are not compared.
+    """
+    failures: List[str] = []
+    warnings: List[str] = []
+
+    def check(found, label, now, before, higher_is_better=False):
+        if not before:
+            return
+        change = (before - now) / before if higher_is_better else (now - before) / before
+        if change > tolerance:
+            found.append(f"{label}: {before} -> {now} ({change:+.0%})")
+
+    pc, bpc = current["process_content"], baseline.get("process_content", {})
+    completed, before_completed = pc["jobs"] - pc["failed"], None
+    if bpc.get("jobs") == pc["jobs"]:
+        before_completed = bpc["jobs"] - bpc.get("failed", 0)
+    check(failures, "process_content.completed", completed, before_completed, higher_is_better=True)
+    check(failures, "process_content.statements_per_job", pc["statements_per_job"], bpc.get("statements_per_job"))
+    check(failures, "generate_schedule.statements_per_call", current["generate_schedule"]["statements_per_call"], baseline.get("generate_schedule", {}).get("statements_per_call"))
+    check(warnings, "process_content.jobs_per_sec", pc["jobs_per_sec"], bpc.get("jobs_per_sec"), higher_is_better=True)
+    check(warnings, "generate_schedule.p95_ms", current["generate_schedule"]["latency"]["p95_ms"], baseline.get("generate_schedule", {}).get("latency", {}).get("p95_ms"))
+    for name, stats in current["routes"].items():
+        before = baseline.get("routes", {}).get(name, {})
+        check(failures, f"routes.{name}.statements_per_request", stats["statements_per_request"], before.get("statements_per_request"))
+        check(warnings, f"routes.{name}.p95_ms", stats["p95_ms"], before.get("p95_ms"))
+    for stage, stats in current["stages"].items():
+        if stage.startswith("llm_"):
+            continue
+        check(warnings, f"stages.{stage}.p95_ms", stats["p95_ms"], baseline.get("stages", {}).get(stage, {}).get("p95_ms"))
+    return failures, warnings
+
+def print_report(report: Dict):
+    pc = report["process_content"]
+    print(f"process_content: {pc['jobs']} jobs, {pc['failed']} failed, {pc['jobs_per_sec']} jobs/sec, "
+          f"p50={pc['latency']['p50_ms']}ms p95={pc['latency']['p95_ms']}ms, {pc['statements_per_job']} statements/job")
+    gs = report["generate_schedule"]
+    print(f"generate_schedule: p50={gs['latency']['p50_ms']}ms p95={gs['latency']['p95_ms']}ms, {gs['statements_per_call']} statements/call")
+    print("routes:")
+    for name, stats in report["routes"].items():
+        print(f"  {name:<18} p50={stats['p50_ms']:>8}ms p95={stats['p95_ms']:>8}ms p99={stats['p99_ms']:>8}ms  {stats['statements_per_request']} statements/request")
+    print("stages:")
+    for stage, stats in report["stages"].items():
+        print(f"  {stage:<20} n={stats['count']:<6} p50={stats['p50_ms']:>8}ms p95={stats['p95_ms']:>8}ms p99={stats['p99_ms']:>8}ms")
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+    # Run from backend/ so `app` is importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures, warnings = regressions(report, baseline, args.tolerance)
+        for line in warnings:
+            print(f"WARN: {line}")
+        if failures:
+            print("REGRESSIONS vs baseline:")
+            for line in failures:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions vs baseline." if not warnings else "No counter regressions vs baseline (timings above are machine-dependent).")
+
+if __name__ == "__main__":
+    main()
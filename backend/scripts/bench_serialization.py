@@ -0,0 +1,133 @@
+"""
+Micro-benchmark: schedule preview read path, old vs new.
+
+old: load full (Schedule, Post) ORM rows, truncate post.text in Python, build one
+     SchedulePreviewResponse per row, then let the response_model validate and
+     jsonable-encode the whole list again before json.dumps.
+new: schedule_preview_query projection (SQL-side substr) straight into orjson.
+
+Runs against an in-memory SQLite database (requires `aiosqlite`):
+    python -m scripts.bench_serialization --rows 1000 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+# Settings are required at import time; the benchmark never touches these services.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.core.responses import FastJSONResponse
+from app.models import Base, User, Transcript, ContentAtom, Post, Schedule
+from app.schemas.content import SchedulePreviewResponse
+from app.services.scheduling_service import schedule_preview_query
+
+POST_TEXT = "Consistency beats intensity when you are building an audience. " * 6
+
+async def seed(session_factory, rows: int) -> uuid.UUID:
+    async with session_factory() as db:
+        user = User(id=uuid.uuid4(), email="bench@example.com")
+        transcript = Transcript(id=uuid.uuid4(), user_id=user.id, youtube_url="https://youtu.be/benchmark01", raw_text="bench", status="completed")
+        db.add_all([user, transcript])
+        await db.flush()
+
+        # One post per platform per atom (uq_posts_atom_platform)
+        atom_ids = [uuid.uuid4() for _ in range((rows + 1) // 2)]
+        await db.execute(insert(ContentAtom), [
+            {"id": atom_id, "transcript_id": transcript.id, "type": "insight", "text": "bench", "created_at": datetime.utcnow()}
+            for atom_id in atom_ids
+        ])
+
+        post_rows = [
+            {"id": uuid.uuid4(), "content_atom_id": atom_ids[i // 2], "user_id": user.id, "platform": "twitter" if i % 2 else "linkedin",
+             "text": POST_TEXT, "included": True, "created_at": datetime.utcnow()}
+            for i in range(rows)
+        ]
+        await db.execute(insert(Post), post_rows)
+
+        start = datetime(2030, 1, 1)
+        await db.execute(insert(Schedule), [
+            {"id": uuid.uuid4(), "post_id": p["id"], "publish_date": start + timedelta(days=i), "platform": p["platform"]}
+            for i, p in enumerate(post_rows)
+        ])
+        await db.commit()
+        return transcript.id
+
+async def old_path(db: AsyncSession, transcript_id: uuid.UUID) -> bytes:
+    query = (
+        select(Schedule, Post)
+        .join(Post, Schedule.post_id == Post.id)
+        .join(ContentAtom, Post.content_atom_id == ContentAtom.id)
+        .where(ContentAtom.transcript_id == transcript_id)
+        .order_by(Schedule.publish_date)
+    )
+    rows = (await db.execute(query)).all()
+    preview_list = [
+        SchedulePreviewResponse(
+            id=schedule.id,
+            date=schedule.publish_date.date(),
+            platform=schedule.platform,
+            preview=post.text[:100] + "..." if len(post.text) > 100 else post.text
+        )
+        for schedule, post in rows
+    ]
+    # What FastAPI does with response_model=List[SchedulePreviewResponse]
+    validated = TypeAdapter(List[SchedulePreviewResponse]).validate_python(preview_list, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+async def new_path(db: AsyncSession, transcript_id: uuid.UUID) -> bytes:
+    result = await db.execute(schedule_preview_query(transcript_id))
+    preview_list = [
+        {"id": row.id, "date": row.publish_date.date(), "platform": row.platform, "preview": row.preview}
+        for row in result
+    ]
+    return FastJSONResponse(preview_list).body
+
+async def measure(fn, session_factory, transcript_id, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await fn(db, transcript_id)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+async def run(rows_list: List[int], repeat: int):
+    for rows in rows_list:
+        engine = create_async_engine("sqlite+aiosqlite://")
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            transcript_id = await seed(session_factory, rows)
+
+            async with session_factory() as db:
+                assert json.loads(await old_path(db, transcript_id)) == json.loads(await new_path(db, transcript_id))
+
+            old = await measure(old_path, session_factory, transcript_id, repeat)
+            new = await measure(new_path, session_factory, transcript_id, repeat)
+            old_ms, new_ms = statistics.median(old) * 1000, statistics.median(new) * 1000
+            print(f"rows={rows:>6}  old={old_ms:8.2f} ms  new={new_ms:8.2f} ms  speedup={old_ms / new_ms:5.2f}x")
+        finally:
+            # aiosqlite's connection thread would otherwise keep the process alive after an error
+            await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark schedule preview serialization")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
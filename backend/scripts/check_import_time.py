@@ -0,0 +1,146 @@
+"""
+Import-time budget check for API cold starts.
+
+Imports the module (default `app.main`) in a fresh interpreter with `-X importtime`.
+Fails when a module that must stay lazy (heavy SDKs, Celery and the task graph) is
+imported at startup; that is the hard gate. The cumulative import time is compared
+with a budget of the stored baseline plus --tolerance (at most one second), and going over it only warns
+unless --strict: timings are machine-dependent and noisy, so re-save the baseline on
+the machine that runs the check.
+
+    python -m scripts.check_import_time
+    python -m scripts.check_import_time --save-baseline     # record this machine's import time
+    python -m scripts.check_import_time --budget-ms 600 --strict --runs 5 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "import_time.json")
+MAX_BUDGET_MS = 1000.0 # Startup must stay under a second whatever the baseline
+
+# Imported on first use only; pulling any of these into `app.main` is a regression
+LAZY_MODULES = [
+    "celery",
+    "app.workers.tasks",
+    "app.pipeline",
+    "youtube_transcript_api",
+    "yt_dlp",
+    "openai",
+    "google.generativeai",
+    "numpy",
+    "boto3",
+    "pyinstrument",
+]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fail when API startup imports regress")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Max cumulative import time of --module (default: baseline plus tolerance)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative increase over the baseline")
+    parser.add_argument("--strict", action="store_true", help="Fail, not just warn, when over budget")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--runs", type=int, default=5, help="Best of N runs (filters out cold file cache)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to print")
+    return parser.parse_args()
+
+def budget_ms(args) -> Tuple[float, str]:
+    """
+    (budget, where it came from): --budget-ms, else the baseline plus tolerance, capped at MAX_BUDGET_MS.
+    """
+    if args.budget_ms is not None:
+        return args.budget_ms, "--budget-ms"
+    baseline: Optional[float] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get(args.module)
+    if baseline is None or baseline * (1 + args.tolerance) > MAX_BUDGET_MS:
+        return MAX_BUDGET_MS, "the one-second ceiling"
+    return baseline * (1 + args.tolerance), f"baseline {baseline:.0f}ms + {args.tolerance:.0%}"
+
+def measure(module: str) -> Tuple[float, Dict[str, int], List[Tuple[str, int]]]:
+    """
+    Returns (total ms, cumulative us per module, direct imports of `module` with their us).
+    """
+    env = dict(os.environ)
+    # Settings are required at import time; nothing is connected to
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+    env.setdefault("REDIS_URL", "redis://localhost:6379/0")
+    env.setdefault("OPENAI_API_KEY", "import-check")
+    env.setdefault("GEMINI_API_KEY", "import-check")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    entries: List[Tuple[int, str, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        cumulative[name.strip()] = int(cum)
+        entries.append((depth, name.strip(), int(cum)))
+
+    # -X importtime prints children before their parent, one indent level deeper
+    direct: List[Tuple[str, int]] = []
+    for i, (depth, name, cum) in enumerate(entries):
+        if name == module:
+            j = i - 1
+            while j >= 0 and entries[j][0] > depth:
+                if entries[j][0] == depth + 1:
+                    direct.append((entries[j][1], entries[j][2]))
+                j -= 1
+            break
+    return cumulative.get(module, 0) / 1000, cumulative, direct
+
+def main():
+    args = parse_args()
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    total_ms, cumulative, direct = min(runs, key=lambda run: run[0])
+
+    if args.save_baseline:
+        baselines = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baselines = json.load(f)
+        baselines[args.module] = round(total_ms, 1)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"import {args.module}: {total_ms:.1f}ms (best of {len(runs)}); baseline saved to {args.baseline}")
+
+    budget, budget_source = budget_ms(args)
+    print(f"import {args.module}: {total_ms:.1f}ms (best of {len(runs)}, budget {budget:.0f}ms from {budget_source})")
+    for name, us in sorted(direct, key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:>8.1f}ms  {name}")
+
+    failures = []
+    eager = [m for m in LAZY_MODULES if m in cumulative]
+    if eager:
+        failures.append(f"modules that must be imported lazily were imported at startup: {', '.join(eager)}")
+    if total_ms > budget:
+        over = f"import time {total_ms:.1f}ms exceeds the {budget:.0f}ms budget"
+        if args.strict:
+            failures.append(over)
+        else:
+            print(f"WARN: {over}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Local stand-in for the OpenAI chat-completions and Gemini generateContent APIs.
+
+Lets the real OpenAIProvider / GeminiProvider (HTTP clients, connection pooling,
+timeouts, JSON-mode parsing) be benchmarked and tested offline:
+
+    python -m scripts.fake_llm_server --port 8900 --latency 0.3 --rate-limit-rate 0.02 --error-rate 0.01
+
+    OPENAI_BASE_URL=http://localhost:8900/v1
+    GEMINI_BASE_URL=http://localhost:8900
+
+JSON-mode requests (OpenAI `response_format={"type": "json_object"}`, Gemini
+`responseMimeType: application/json`) get canned atoms; everything else gets a
+rewrite. Streaming is supported for both (`stream: true`, `:streamGenerateContent`).
+Behaviour can be changed at runtime with `POST /_config` and inspected with `GET /_stats`.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+ATOM_TYPES = ["insight", "opinion", "lesson", "quote"]
+
+class FakeLLMConfig(BaseModel):
+    latency: float = 0.2 # Median seconds before the first byte
+    latency_sigma: float = 0.3 # Log-normal spread (0 = fixed latency)
+    rate_limit_rate: float = 0.0 # Fraction of requests answered with 429
+    error_rate: float = 0.0 # Fraction of requests answered with 500
+    retry_after: int = 1 # Retry-After seconds sent with 429s
+    atoms: int = 24 # Atoms per JSON-mode response
+    stream_chunk_delay: float = 0.01 # Seconds between streamed chunks
+    stream_chunks: int = 8
+    seed: Optional[int] = None
+
+config = FakeLLMConfig()
+stats: Counter = Counter()
+rng = random.Random()
+app = FastAPI(title="Fake LLM server")
+
+def _estimate_tokens(text: str) -> int:
+    # Same rough 4-characters-per-token rule the providers document
+    return max(1, len(text) // 4)
+
+def canned_atoms() -> str:
+    return json.dumps({
+        "atoms": [
+            {"type": ATOM_TYPES[i % len(ATOM_TYPES)], "text": f"Canned {ATOM_TYPES[i % len(ATOM_TYPES)]} #{i + 1}: small, consistent steps compound into outsized results."}
+            for i in range(config.atoms)
+        ]
+    })
+
+def canned_rewrite(prompt: str) -> str:
+    platform = "linkedin" if "linkedin" in prompt.lower() else "twitter"
+    if platform == "twitter":
+        return "Small, consistent steps compound. Start today, iterate tomorrow. #growth #creators"
+    return ("Most creators overestimate what they can do in a week and underestimate what they can do in a year.\n\n"
+            "Here is what changed for me:\n- Publish on a schedule\n- Repurpose every long-form video\n- Measure, then iterate")
+
+def _split_chunks(text: str) -> List[str]:
+    size = max(1, len(text) // config.stream_chunks)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+async def _simulate(api: str) -> Optional[JSONResponse]:
+    """
+    Applies latency and fault injection. Returns an error response to send, if any.
+    """
+    stats[f"{api}.requests"] += 1
+    delay = config.latency
+    if config.latency_sigma > 0 and delay > 0:
+        delay = rng.lognormvariate(0, config.latency_sigma) * config.latency
+    await asyncio.sleep(delay)
+
+    roll = rng.random()
+    if roll < config.rate_limit_rate:
+        stats[f"{api}.429"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(config.retry_after)},
+            content={"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_exceeded", "code": 429, "status": "RESOURCE_EXHAUSTED"}},
+        )
+    if roll < config.rate_limit_rate + config.error_rate:
+        stats[f"{api}.500"] += 1
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Internal error (fake)", "type": "server_error", "code": 500, "status": "INTERNAL"}},
+        )
+    return None
+
+# --- OpenAI chat completions ---
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    error = await _simulate("openai")
+    if error:
+        return error
+
+    prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+    json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+    text = canned_atoms() if json_mode else canned_rewrite(prompt)
+    model = body.get("model", "gpt-3.5-turbo")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    usage = {
+        "prompt_tokens": _estimate_tokens(prompt),
+        "completion_tokens": _estimate_tokens(text),
+        "total_tokens": _estimate_tokens(prompt) + _estimate_tokens(text),
+    }
+
+    if body.get("stream"):
+        async def events():
+            first = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+            yield f"data: {json.dumps(first)}\n\n"
+            for piece in _split_chunks(text):
+                await asyncio.sleep(config.stream_chunk_delay)
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            last = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(last)}\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": usage,
+    }
+
+# --- Gemini generateContent ---
+
+def _gemini_payload(text: str, prompt: str, finish: bool = True) -> Dict[str, Any]:
+    candidate: Dict[str, Any] = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish:
+        candidate["finishReason"] = "STOP"
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": _estimate_tokens(prompt),
+            "candidatesTokenCount": _estimate_tokens(text),
+            "totalTokenCount": _estimate_tokens(prompt) + _estimate_tokens(text),
+        },
+    }
+
+@app.post("/{version}/models/{model_action}")
+async def generate_content(version: str, model_action: str, request: Request):
+    model, _, action = model_action.partition(":")
+    if action not in ("generateContent", "streamGenerateContent"):
+        return JSONResponse(status_code=404, content={"error": {"message": f"Unknown action {action}", "code": 404}})
+
+    body = await request.json()
+    error = await _simulate("gemini")
+    if error:
+        return error
+
+    prompt = "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+    generation_config = body.get("generationConfig") or body.get("generation_config") or {}
+    json_mode = (generation_config.get("responseMimeType") or generation_config.get("response_mime_type")) == "application/json"
+    text = canned_atoms() if json_mode else canned_rewrite(prompt)
+
+    if action == "streamGenerateContent":
+        pieces = _split_chunks(text)
+
+        if request.query_params.get("alt") == "sse":
+            async def sse():
+                for i, piece in enumerate(pieces):
+                    await asyncio.sleep(config.stream_chunk_delay)
+                    yield f"data: {json.dumps(_gemini_payload(piece, prompt, finish=i == len(pieces) - 1))}\n\n"
+            return StreamingResponse(sse(), media_type="text/event-stream")
+
+        async def json_array():
+            yield "["
+            for i, piece in enumerate(pieces):
+                await asyncio.sleep(config.stream_chunk_delay)
+                yield ("," if i else "") + json.dumps(_gemini_payload(piece, prompt, finish=i == len(pieces) - 1))
+            yield "]"
+        return StreamingResponse(json_array(), media_type="application/json")
+
+    return _gemini_payload(text, prompt)
+
+# --- Control plane ---
+
+@app.post("/_config")
+async def update_config(update: Dict[str, Any]):
+    global config
+    config = config.model_copy(update=update)
+    if "seed" in update:
+        rng.seed(config.seed)
+    return config
+
+@app.get("/_stats")
+async def get_stats():
+    return dict(stats)
+
+@app.post("/_stats/reset")
+async def reset_stats():
+    stats.clear()
+    return {}
+
+def main():
+    global config
+    parser = argparse.ArgumentParser(description="Fake OpenAI/Gemini HTTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for name, field in FakeLLMConfig.model_fields.items():
+        arg_type = float if field.annotation is float else int
+        parser.add_argument(f"--{name.replace('_', '-')}", type=arg_type, default=field.default)
+    args = parser.parse_args()
+    config = FakeLLMConfig(**{name: getattr(args, name) for name in FakeLLMConfig.model_fields})
+    rng.seed(config.seed)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
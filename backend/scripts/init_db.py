@@ -0,0 +1,22 @@
+"""
+Creates missing database tables and upgrades existing ones (new columns, indexes
+and unique constraints; see app/core/migrations.py). Run once per deploy, before
+the API and workers start (the docker-compose `migrate` service does this):
+
+    python -m scripts.init_db
+"""
+import asyncio
+
+from app.core.database import create_tables, dispose_engines
+from app.core.migrations import upgrade_schema
+
+async def main():
+    await create_tables()
+    applied = await upgrade_schema()
+    await dispose_engines()
+    for change in applied:
+        print(f"  {change}")
+    print(f"Database schema is up to date ({len(applied)} changes applied).")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,253 @@
+"""
+Concurrent load generator for the content API.
+
+Each workflow runs create -> poll status -> schedule -> preview -> run against a live
+server. Workflows arrive as a Poisson process at --rate per second (or all at once
+with --rate 0), bounded by --concurrency in flight. Latency histograms are recorded
+per endpoint together with an error breakdown.
+
+A workflow that arrives while --concurrency are in flight waits for a free slot, so
+under saturation the test turns into a closed loop and the offered rate is not held.
+The report counts those waits; use --concurrency 0 for a pure open-loop run.
+
+    python -m scripts.load_test                                  # single-workflow smoke test
+    python -m scripts.load_test --workflows 200 --rate 5 --concurrency 50
+    python -m scripts.load_test --workflows 500 --rate 10 --max-error-rate 0.01 --json-out load.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+API_PREFIX = "/api/v1/content"
+# Upper bounds (seconds) of the latency histogram buckets
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Async load generator for the content API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--workflows", type=int, default=1, help="Total workflows to run")
+    parser.add_argument("--rate", type=float, default=1.0, help="Mean workflow arrivals per second (0 = all at once)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Max workflows in flight (0 = unbounded, open loop)")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--workflow-timeout", type=float, default=300.0, help="Seconds to wait for a job to complete")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--video-url", action="append", dest="video_urls",
+                        help="YouTube URL to submit (repeatable, cycled). Defaults to a sample video.")
+    parser.add_argument("--tone", default="professional")
+    parser.add_argument("--emoji-usage", default="moderate")
+    parser.add_argument("--allow-reuse", action="store_true", help="Let repeat submissions of a video copy earlier output instead of regenerating")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Exit non-zero if the workflow error rate exceeds this")
+    parser.add_argument("--json-out", default=None, help="Write the full report as JSON")
+    return parser.parse_args()
+
+class WorkflowError(Exception):
+    def __init__(self, step: str, reason: str):
+        self.step = step
+        self.reason = reason
+        super().__init__(f"{step}: {reason}")
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.queue_waits: List[float] = [] # Arrival until a --concurrency slot was free
+        self.completed = 0
+        self.failed = 0
+
+    def record(self, endpoint: str, seconds: float):
+        self.latencies[endpoint].append(seconds)
+
+    def error(self, endpoint: str, reason: str):
+        self.errors[(endpoint, reason)] += 1
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    counts = Counter()
+    for sample in samples:
+        for bound in HISTOGRAM_BUCKETS:
+            if sample <= bound:
+                counts[bound] += 1
+                break
+    return {("+Inf" if b == float("inf") else f"{b}s"): counts[b] for b in HISTOGRAM_BUCKETS if counts[b]}
+
+async def timed_request(client: httpx.AsyncClient, stats: LoadStats, endpoint: str, method: str, url: str,
+                        expected: tuple = (200,), **kwargs) -> httpx.Response:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        stats.record(endpoint, time.perf_counter() - started)
+        stats.error(endpoint, type(e).__name__)
+        raise WorkflowError(endpoint, type(e).__name__)
+    stats.record(endpoint, time.perf_counter() - started)
+    if response.status_code not in expected:
+        stats.error(endpoint, f"HTTP {response.status_code}")
+        raise WorkflowError(endpoint, f"HTTP {response.status_code}: {response.text[:200]}")
+    return response
+
+async def run_workflow(client: httpx.AsyncClient, args, stats: LoadStats, video_url: str, verbose: bool):
+    payload = {"url": video_url, "tone": args.tone, "emoji_usage": args.emoji_usage, "regenerate": not args.allow_reuse}
+    started = time.perf_counter()
+
+    # 1. Create
+    r = await timed_request(client, stats, "create", "POST", f"{API_PREFIX}/create", expected=(202,), json=payload)
+    job_id = r.json()["id"]
+    if verbose:
+        print(f"[*] Job created: {job_id}")
+
+    # 2. Poll status (conditional requests: unchanged status comes back as 304)
+    etag: Optional[str] = None
+    status = "queued"
+    deadline = time.monotonic() + args.workflow_timeout
+    while True:
+        headers = {"If-None-Match": etag} if etag else {}
+        r = await timed_request(client, stats, "status", "GET", f"{API_PREFIX}/status/{job_id}", expected=(200, 304), headers=headers)
+        if r.status_code == 200:
+            etag = r.headers.get("ETag")
+            data = r.json()
+            status = data["status"]
+            if verbose:
+                print(f"    - Status: {status}")
+            if status == "completed":
+                break
+            if status == "failed":
+                stats.error("status", "job_failed")
+                raise WorkflowError("status", f"job failed: {data.get('error')}")
+        if time.monotonic() > deadline:
+            stats.error("status", "timeout")
+            raise WorkflowError("status", "timed out waiting for completion")
+        await asyncio.sleep(args.poll_interval)
+    stats.record("job_completion", time.perf_counter() - started)
+
+    # 3. Schedule, 4. Preview, 5. Run
+    r = await timed_request(client, stats, "schedule", "POST", f"{API_PREFIX}/schedule/{job_id}")
+    if verbose:
+        print(f"[*] Schedule generated: {r.json()}")
+    r = await timed_request(client, stats, "preview", "GET", f"{API_PREFIX}/schedule/preview/{job_id}")
+    if verbose:
+        print(f"[*] Preview: {len(r.json())} scheduled items")
+    r = await timed_request(client, stats, "run", "POST", f"{API_PREFIX}/schedule/run/{job_id}")
+    if verbose:
+        print(f"[*] Simulation: {r.json()}")
+
+    stats.record("workflow", time.perf_counter() - started)
+
+async def run_load(args) -> Dict:
+    rng = random.Random(args.seed)
+    video_urls = args.video_urls or ["https://www.youtube.com/watch?v=dQw4w9WgXcQ"]
+    stats = LoadStats()
+    semaphore = asyncio.Semaphore(args.concurrency) if args.concurrency > 0 else contextlib.nullcontext()
+    verbose = args.workflows == 1
+    connections = args.concurrency or args.workflows
+    limits = httpx.Limits(max_connections=connections * 2, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.request_timeout, limits=limits) as client:
+        r = await client.get("/health")
+        r.raise_for_status()
+
+        async def guarded(index: int):
+            arrived = time.perf_counter()
+            async with semaphore:
+                stats.queue_waits.append(time.perf_counter() - arrived)
+                try:
+                    await run_workflow(client, args, stats, video_urls[index % len(video_urls)], verbose)
+                    stats.completed += 1
+                except WorkflowError as e:
+                    stats.failed += 1
+                    if verbose:
+                        print(f"❌ {e}")
+                except Exception as e:
+                    # Anything else (undecodable body, missing field) fails this workflow, not the run
+                    stats.failed += 1
+                    stats.error("workflow", f"unexpected {type(e).__name__}")
+                    if verbose:
+                        print(f"❌ unexpected {type(e).__name__}: {e}")
+
+        started = time.perf_counter()
+        tasks = []
+        for i in range(args.workflows):
+            tasks.append(asyncio.create_task(guarded(i)))
+            if args.rate > 0 and i < args.workflows - 1:
+                await asyncio.sleep(rng.expovariate(args.rate))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "workflows": args.workflows,
+        "completed": stats.completed,
+        "failed": stats.failed,
+        "error_rate": round(stats.failed / max(args.workflows, 1), 4),
+        "duration_s": round(elapsed, 2),
+        "workflows_per_sec": round(stats.completed / elapsed, 3) if elapsed else 0.0,
+        # Arrivals that waited for a --concurrency slot: the offered rate was not held
+        "queued": sum(1 for wait in stats.queue_waits if wait > 0.001),
+        "queue_wait_p95_ms": round(percentile(stats.queue_waits, 95) * 1000, 2),
+        "queue_wait_max_ms": round(max(stats.queue_waits, default=0.0) * 1000, 2),
+        "endpoints": {
+            endpoint: {
+                "count": len(samples),
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+                "max_ms": round(max(samples) * 1000, 2),
+                "histogram": histogram(samples),
+            }
+            for endpoint, samples in stats.latencies.items()
+        },
+        "errors": [
+            {"endpoint": endpoint, "reason": reason, "count": count}
+            for (endpoint, reason), count in stats.errors.most_common()
+        ],
+    }
+
+def print_report(report: Dict):
+    print(f"\nWorkflows: {report['completed']}/{report['workflows']} completed, {report['failed']} failed "
+          f"(error rate {report['error_rate']:.2%}) in {report['duration_s']}s, {report['workflows_per_sec']} workflows/sec")
+    if report["queued"]:
+        print(f"⚠️  {report['queued']} workflows waited for a --concurrency slot (p95 {report['queue_wait_p95_ms']}ms, "
+              f"max {report['queue_wait_max_ms']}ms): the arrival rate was throttled to a closed loop. "
+              "Raise --concurrency or use 0 to hold the offered rate.")
+    print(f"{'endpoint':<16}{'count':>8}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'max ms':>11}")
+    for endpoint, s in report["endpoints"].items():
+        print(f"{endpoint:<16}{s['count']:>8}{s['p50_ms']:>11}{s['p95_ms']:>11}{s['p99_ms']:>11}{s['max_ms']:>11}")
+        print(f"{'':<16}histogram: {s['histogram']}")
+    if report["errors"]:
+        print("Errors:")
+        for e in report["errors"]:
+            print(f"  {e['endpoint']:<14} {e['reason']:<40} x{e['count']}")
+
+def main():
+    args = parse_args()
+    try:
+        report = asyncio.run(run_load(args))
+    except httpx.HTTPError as e:
+        print(f"❌ Connection Failed: {e}")
+        print("Ensure the backend server is running (uvicorn app.main:app).")
+        sys.exit(1)
+
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        sys.exit(1)
+    if args.max_error_rate is None and report["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
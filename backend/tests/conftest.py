@@ -0,0 +1,17 @@
+import asyncio
+import os
+
+# Settings are required at import time; unit tests never connect to these services
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import pytest
+
+@pytest.fixture
+def run():
+    """
+    Runs a coroutine on a fresh event loop (no async test plugin required).
+    """
+    return asyncio.run
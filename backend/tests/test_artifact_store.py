@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from app.services.artifact_store import ArtifactNotFoundError, LocalArtifactStore
+
+def test_round_trip_stays_under_root(tmp_path):
+    store = LocalArtifactStore(str(tmp_path))
+    key = store.put_object({"atoms": [1, 2, 3]}, kind="atoms")
+
+    assert store.get_object(key) == {"atoms": [1, 2, 3]}
+    assert store.put_object({"atoms": [1, 2, 3]}, kind="atoms") == key
+    path = store._path(key)
+    assert os.path.commonpath([path, str(tmp_path)]) == str(tmp_path)
+
+    store.delete(key)
+    with pytest.raises(ArtifactNotFoundError):
+        store.get_object(key)
+
+@pytest.mark.parametrize("key", [
+    "atoms/..",
+    "atoms/../../etc/passwd",
+    "../" + "a" * 64,
+    "atoms/" + "A" * 64, # Digests are lowercase hex
+    "atoms/" + "a" * 63,
+    "atoms/" + "a" * 64 + "/x",
+    "/" + "a" * 64,
+    "atoms",
+])
+def test_keys_that_are_not_kind_and_sha256_are_rejected(tmp_path, key):
+    store = LocalArtifactStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.exists(key)
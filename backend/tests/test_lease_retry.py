@@ -0,0 +1,69 @@
+import uuid
+
+import pytest
+from celery.canvas import Signature
+from celery.exceptions import Retry
+
+from app.workers import tasks
+from app.workers.lease import LeaseHeldError
+
+LEASE_SECONDS = 300
+
+@pytest.fixture
+def sent(monkeypatch):
+    """
+    Signatures the task re-sent, instead of publishing them to a broker.
+    """
+    messages = []
+    monkeypatch.setattr(Signature, "apply_async", lambda self, *args, **kwargs: messages.append(self))
+    return messages
+
+def deliver(task, args, retries: int, failure: Exception, monkeypatch):
+    """
+    Runs `task` as a worker would for a delivery that has been retried `retries` times.
+    """
+    def run_async(coroutine):
+        coroutine.close()
+        raise failure
+
+    monkeypatch.setattr(tasks, "run_async", run_async)
+    task.push_request(id=str(uuid.uuid4()), args=args, kwargs={}, retries=retries, called_directly=False, is_eager=False, delivery_info={})
+    try:
+        return task.run(*args)
+    finally:
+        task.pop_request()
+
+@pytest.mark.parametrize("task", [tasks.generate_content_task, tasks.transcribe_video_task])
+def test_lease_waits_do_not_use_up_retries(task, sent, monkeypatch):
+    transcript_id = str(uuid.uuid4())
+    held = LeaseHeldError(uuid.UUID(transcript_id), retry_after=LEASE_SECONDS)
+
+    # Held for longer than max_retries lease windows: every delivery is re-sent, none dropped
+    retries = 0
+    for _ in range(task.max_retries * 2):
+        with pytest.raises(Retry) as retry:
+            deliver(task, [transcript_id], retries, held, monkeypatch)
+        assert retry.value.when == LEASE_SECONDS + 1
+        retries = sent[-1].options["retries"]
+    assert len(sent) == task.max_retries * 2
+    assert retries == 0
+
+def test_stage_lease_wait_keeps_retries_and_queue(sent, monkeypatch):
+    monkeypatch.setattr(tasks, "downstream_backlogged", lambda pipeline, stage_index: False)
+    item = {"transcript_id": str(uuid.uuid4())}
+    pipeline = tasks.PIPELINES["transcript"]
+    held = LeaseHeldError(uuid.UUID(item["transcript_id"]), retry_after=LEASE_SECONDS)
+
+    for _ in range(tasks.run_stage_task.max_retries + 2):
+        with pytest.raises(Retry):
+            deliver(tasks.run_stage_task, ["transcript", 0, item], 1, held, monkeypatch)
+    assert [s.options["retries"] for s in sent] == [1] * (tasks.run_stage_task.max_retries + 2)
+    assert {s.options["queue"] for s in sent} == {pipeline.stages[0].queue}
+
+def test_failures_still_count_against_max_retries(sent, monkeypatch):
+    monkeypatch.setattr(tasks, "downstream_backlogged", lambda pipeline, stage_index: False)
+    item = {"transcript_id": str(uuid.uuid4())}
+
+    with pytest.raises(Retry):
+        deliver(tasks.run_stage_task, ["transcript", 0, item], 1, RuntimeError("boom"), monkeypatch)
+    assert sent[-1].options["retries"] == 2
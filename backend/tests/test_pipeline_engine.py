@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from app.pipeline.engine import Pipeline, Stage, StageError
+
+def test_items_flow_through_all_stages(run):
+    async def double(item):
+        return item * 2
+
+    async def drop_odd_halves(item):
+        return None if item % 4 else item
+
+    pipeline = Pipeline("test", [Stage("double", double), Stage("filter", drop_odd_halves, concurrency=3)])
+    assert sorted(run(pipeline.run(range(6)))) == [0, 4, 8]
+
+def test_fan_out_emits_each_output(run):
+    async def split(item):
+        return [f"{item}a", f"{item}b"]
+
+    async def identity(item):
+        return item
+
+    pipeline = Pipeline("test", [Stage("split", split, fan_out=True), Stage("identity", identity)])
+    assert sorted(run(pipeline.run([1, 2]))) == ["1a", "1b", "2a", "2b"]
+
+def test_slow_stage_blocks_its_upstream(run):
+    produced = []
+    release = asyncio.Event()
+
+    async def produce(item):
+        produced.append(item)
+        return item
+
+    async def consume(item):
+        await release.wait()
+        return item
+
+    pipeline = Pipeline("test", [
+        Stage("produce", produce),
+        Stage("consume", consume, queue_size=2),
+    ])
+
+    async def scenario():
+        job = asyncio.create_task(pipeline.run(range(20)))
+        await asyncio.sleep(0.05)
+        # One item held by the consumer, two queued, one produced and waiting for room
+        in_flight = len(produced)
+        release.set()
+        return in_flight, await job
+
+    in_flight, results = run(scenario())
+    assert in_flight == 4
+    assert sorted(results) == list(range(20))
+
+def test_failing_item_does_not_drop_its_siblings(run):
+    saved = []
+
+    async def maybe_fail(item):
+        if item == 3:
+            raise ValueError("bad item")
+        return item
+
+    async def save(item):
+        saved.append(item)
+        return item
+
+    pipeline = Pipeline("test", [Stage("maybe_fail", maybe_fail, concurrency=2), Stage("save", save)])
+    with pytest.raises(StageError) as raised:
+        run(pipeline.run(range(8)))
+
+    assert sorted(saved) == [0, 1, 2, 4, 5, 6, 7]
+    assert raised.value.stage == "maybe_fail"
+    assert isinstance(raised.value.error, ValueError)
+
+def test_first_failure_is_raised_after_draining(run):
+    async def fail_late(item):
+        raise RuntimeError(f"failed {item}")
+
+    pipeline = Pipeline("test", [Stage("fail_late", fail_late)])
+    with pytest.raises(StageError, match="Stage 'fail_late' failed: failed 0"):
+        run(pipeline.run(range(3)))
+
+def test_batch_size_caps_batches(run):
+    batches = []
+
+    async def save(items):
+        batches.append(list(items))
+        return items
+
+    pipeline = Pipeline("test", [Stage("save", save, batch_size=4)])
+    assert sorted(run(pipeline.run(range(10)))) == list(range(10))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+@pytest.mark.parametrize("batch_wait, expected", [(0.0, [1, 1, 1, 1]), (0.5, [4])])
+def test_batch_wait_lingers_for_stragglers(run, batch_wait, expected):
+    batches = []
+
+    async def trickle(item):
+        await asyncio.sleep(0.005)
+        return item
+
+    async def save(items):
+        batches.append(list(items))
+        return items
+
+    pipeline = Pipeline("test", [
+        Stage("trickle", trickle),
+        Stage("save", save, batch_size=4, batch_wait=batch_wait),
+    ])
+    assert sorted(run(pipeline.run(range(4)))) == [0, 1, 2, 3]
+    assert [len(batch) for batch in batches] == expected
+
+def test_pipeline_needs_stages():
+    with pytest.raises(ValueError):
+        Pipeline("empty", [])
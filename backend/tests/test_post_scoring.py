@@ -0,0 +1,95 @@
+import uuid
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+from app.services.post_scoring import Candidates, WEIGHTS, rank_for_schedule, score_posts
+
+# Stands in for the labelled rows of candidate_columns
+Row = namedtuple("Row", "post_id platform atom_type simhash length words hashtags")
+
+def candidates(*rows) -> Candidates:
+    """
+    Rows of (platform, atom type, simhash, length, words, hashtags).
+    """
+    return Candidates.from_rows([Row(uuid.uuid4(), *row) for row in rows])
+
+def test_rank_interleaves_types_strongest_first():
+    pool = candidates(
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "lesson", None, 200, 30, 1),
+        ("twitter", "lesson", None, 200, 30, 1),
+        ("twitter", "insight", None, 200, 30, 1),
+        ("linkedin", "quote", None, 900, 150, 3),
+    )
+    scores = np.array([0.5, 0.6, 0.4, 0.9, 0.3, 0.7, 1.0])
+
+    # Type order follows each type's best post: lesson (0.9), insight (0.7), quote (0.6)
+    assert rank_for_schedule(pool, scores, "twitter", 6) == [3, 5, 1, 4, 0, 2]
+    # One per type before any type gets a second slot
+    assert rank_for_schedule(pool, scores, "twitter", 3) == [3, 5, 1]
+    assert rank_for_schedule(pool, scores, "linkedin", 6) == [6]
+    assert rank_for_schedule(pool, scores, "threads", 6) == []
+
+def test_rank_fills_leftover_slots_with_best_remaining_posts():
+    pool = candidates(
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "lesson", None, 200, 30, 1),
+    )
+    scores = np.array([0.1, 0.4, 0.3, 0.2, 0.9])
+
+    # Quota is ceil(4 / 2) = 2 per type; lesson has one, so the best remaining quote fills in
+    assert rank_for_schedule(pool, scores, "twitter", 4) == [4, 1, 2, 3]
+
+def test_length_outside_the_platform_range_scores_lower():
+    pool = candidates(
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 20, 3, 0),
+        ("twitter", "quote", None, 400, 30, 1), # Over the hard limit
+    )
+    scores = score_posts(pool, [])
+
+    assert scores[0] > scores[1] > scores[2]
+    assert scores[0] - scores[2] == pytest.approx(WEIGHTS["length"])
+
+def test_hashtag_walls_score_lower():
+    pool = candidates(
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 15),
+    )
+    scores = score_posts(pool, [])
+
+    assert scores[0] > scores[1]
+
+def test_dominant_type_scores_lower():
+    pool = candidates(
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "quote", None, 200, 30, 1),
+        ("twitter", "lesson", None, 200, 30, 1),
+    )
+    scores = score_posts(pool, [])
+
+    assert scores[3] > scores[0] == scores[1] == scores[2]
+
+def test_atoms_close_to_scheduled_ones_are_less_novel():
+    scheduled = 0x0F0F_0F0F_0F0F_0F0F
+    pool = candidates(
+        ("twitter", "quote", scheduled, 200, 30, 1),
+        ("twitter", "quote", scheduled ^ 0b111, 200, 30, 1), # 3 bits away
+        ("twitter", "quote", ~scheduled, 200, 30, 1), # Every bit differs
+        ("twitter", "quote", None, 200, 30, 1), # Unfingerprinted counts as novel
+    )
+    scores = score_posts(pool, [scheduled])
+
+    assert scores[0] < scores[1] < scores[2] == scores[3]
+    assert scores[3] - scores[0] == pytest.approx(WEIGHTS["novelty"])
+
+def test_no_candidates():
+    assert score_posts(candidates(), []).shape == (0,)
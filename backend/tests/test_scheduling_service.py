@@ -0,0 +1,100 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+from app.services.scheduling_service import SCHEDULE_DAYS, ScheduleSlot, plan_schedule
+
+START = date(2024, 3, 10)
+
+def day(offset: int) -> datetime:
+    return datetime(START.year, START.month, START.day) + timedelta(days=offset)
+
+def slot(post_id, offset: int, platform: str) -> ScheduleSlot:
+    return ScheduleSlot(id=uuid.uuid4(), post_id=post_id, publish_date=day(offset), platform=platform)
+
+def library(count: int):
+    """
+    `count` posts alternating twitter/linkedin, ranked in index order per platform.
+    """
+    post_ids = [uuid.uuid4() for _ in range(count)]
+    platforms = ["twitter" if i % 2 == 0 else "linkedin" for i in range(count)]
+    ranked = {
+        "twitter": [i for i in range(count) if platforms[i] == "twitter"],
+        "linkedin": [i for i in range(count) if platforms[i] == "linkedin"],
+    }
+    return post_ids, platforms, ranked
+
+def test_empty_schedule_alternates_platforms_from_start_date():
+    post_ids, platforms, ranked = library(6)
+    plan = plan_schedule([], post_ids, platforms, ranked, START)
+
+    assert [row["publish_date"] for row in plan.inserts] == [day(i) for i in range(6)]
+    assert [row["platform"] for row in plan.inserts] == ["twitter", "linkedin"] * 3
+    assert [row["post_id"] for row in plan.inserts] == post_ids
+    assert not plan.updates and not plan.deletes
+    assert plan.scheduled == 6
+
+def test_unchanged_schedule_is_a_no_op():
+    post_ids, platforms, ranked = library(4)
+    slots = [slot(post_ids[i], i, platforms[i]) for i in range(4)]
+    plan = plan_schedule(slots, post_ids, platforms, ranked, START)
+
+    assert not plan.changed
+    assert plan.scheduled == 4
+
+def test_freed_slot_is_refilled_with_best_unused_post_of_its_platform():
+    post_ids, platforms, ranked = library(6)
+    excluded = uuid.uuid4() # No longer among the included posts
+    slots = [slot(post_ids[0], 0, "twitter"), slot(excluded, 1, "linkedin"), slot(post_ids[2], 2, "twitter")]
+    plan = plan_schedule(slots, post_ids, platforms, ranked, START)
+
+    assert plan.updates == [{"id": slots[1].id, "post_id": post_ids[1], "platform": "linkedin"}]
+    assert not plan.deletes
+    # New posts continue after the last slot with what is left
+    assert [row["post_id"] for row in plan.inserts] == [post_ids[3], post_ids[4], post_ids[5]]
+    assert plan.inserts[0]["publish_date"] == day(3)
+
+def test_freed_slot_falls_back_to_the_other_platform_then_is_removed():
+    post_ids, platforms, ranked = library(2)
+    gone = [uuid.uuid4(), uuid.uuid4()]
+    slots = [slot(post_ids[0], 0, "twitter"), slot(gone[0], 1, "twitter"), slot(gone[1], 2, "twitter")]
+    plan = plan_schedule(slots, post_ids, platforms, ranked, START)
+
+    assert plan.updates == [{"id": slots[1].id, "post_id": post_ids[1], "platform": "linkedin"}]
+    assert plan.deletes == [slots[2].id]
+    assert not plan.inserts
+    assert plan.scheduled == 2
+
+def test_duplicate_day_and_duplicate_post_slots_are_removed():
+    post_ids, platforms, ranked = library(4)
+    # Same-day ties are resolved by slot ID, so fix the IDs
+    first = ScheduleSlot(id=uuid.UUID(int=1), post_id=post_ids[0], publish_date=day(0), platform="twitter")
+    same_day = ScheduleSlot(id=uuid.UUID(int=2), post_id=post_ids[1], publish_date=day(0), platform="linkedin")
+    same_post = ScheduleSlot(id=uuid.UUID(int=3), post_id=post_ids[0], publish_date=day(1), platform="twitter")
+    plan = plan_schedule([same_post, same_day, first], post_ids, platforms, ranked, START)
+
+    assert plan.deletes == [same_day.id, same_post.id]
+    assert not plan.updates
+    # The post of the removed same-day slot is free again and is appended
+    assert [(row["post_id"], row["publish_date"]) for row in plan.inserts] == [
+        (post_ids[1], day(1)), (post_ids[2], day(2)), (post_ids[3], day(3)),
+    ]
+    assert plan.scheduled == 4
+
+def test_past_slots_are_left_untouched():
+    post_ids, platforms, ranked = library(4)
+    excluded = uuid.uuid4()
+    past = [slot(post_ids[0], -2, "twitter"), slot(excluded, -1, "linkedin")]
+    plan = plan_schedule(past, post_ids, platforms, ranked, START)
+
+    assert not plan.updates and not plan.deletes
+    # The post that already went out is not scheduled again; the rotation starts on twitter
+    assert [row["post_id"] for row in plan.inserts] == [post_ids[2], post_ids[1], post_ids[3]]
+    assert plan.inserts[0]["publish_date"] == day(0)
+    assert plan.scheduled == 3
+
+def test_schedule_is_capped_at_schedule_days():
+    post_ids, platforms, ranked = library(SCHEDULE_DAYS + 10)
+    plan = plan_schedule([], post_ids, platforms, ranked, START)
+
+    assert len(plan.inserts) == plan.scheduled == SCHEDULE_DAYS
+    assert plan.inserts[-1]["publish_date"] == day(SCHEDULE_DAYS - 1)
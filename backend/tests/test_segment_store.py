@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.segment_store import InvalidSegmentsError, TranscriptSegments
+
+CAPTIONS = ["welcome back everyone", "", "this is a mock quote that", "sounds very inspiring", "this is a mock lesson about", "the content strategy we use"]
+
+def segments() -> TranscriptSegments:
+    return TranscriptSegments.from_fragments(CAPTIONS, [0.0, 2.0, 4.0, 8.0, 12.0, 16.0], [4.0] * 6)
+
+def test_round_trip_skips_empty_fragments():
+    original = segments()
+    loaded = TranscriptSegments.from_bytes(original.to_bytes())
+    assert len(loaded) == 5
+    assert loaded.text == " ".join(caption for caption in CAPTIONS if caption)
+    assert loaded.starts.tolist() == [0.0, 4.0, 8.0, 12.0, 16.0]
+
+def test_corrupt_blob_is_rejected():
+    with pytest.raises(InvalidSegmentsError):
+        TranscriptSegments.from_bytes(segments().to_bytes()[:-1])
+
+def test_timestamps_interpolate_within_a_segment():
+    store = segments()
+    offset = store.text.index("sounds very inspiring")
+    assert store.timestamp_at(offset) == 8.0
+    assert 8.0 < store.timestamp_at(offset + 10) < 12.0
+
+def test_exact_match_is_case_insensitive():
+    assert segments().timestamp_of("This is a mock quote that sounds very inspiring") == 4.0
+
+def test_paraphrase_matches_on_rare_trigrams():
+    # "this is a" and "is a mock" also occur in the quote; "the content strategy" only here
+    assert segments().timestamp_of("This is a mock lesson regarding the content strategy.") == 12.0
+
+def test_boilerplate_overlap_is_not_a_match():
+    assert segments().timestamp_of("This is a mock insight from the video transcript.") is None
+
+def test_offsets_survive_case_folding_that_changes_length():
+    # "İ".lower() is two code points; offsets must still index the original text
+    store = TranscriptSegments.from_fragments(
+        ["İstanbul İİİİİİİİİİ first caption", "second caption here", "third caption"],
+        [0.0, 10.0, 20.0],
+        [10.0] * 3,
+    )
+    assert store.timestamp_of("second caption here") == 10.0
+    assert store.timestamp_of("Second Caption Here") == 10.0
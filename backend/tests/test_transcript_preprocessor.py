@@ -0,0 +1,53 @@
+from app.services.segment_store import TranscriptSegments
+from app.services.transcript_preprocessor import preprocess_fragments, preprocess_text
+
+def test_fillers_and_non_speech_tags_are_removed():
+    result = preprocess_fragments(["[Music] um so today we", "uh talk about (laughs) money >> okay."])
+
+    # Already punctuated, so the casing is left as captioned
+    assert result.text == "so today we talk about money okay."
+    assert result.reduction_ratio > 0
+
+def test_rolling_caption_overlap_is_dropped():
+    result = preprocess_fragments(["we are going to talk about", "going to talk about money today."])
+
+    assert result.text == "we are going to talk about money today."
+    assert result.fragments == ["we are going to talk about", "money today."]
+
+def test_only_function_word_stutters_are_dropped():
+    result = preprocess_text("the the plan is very very simple.")
+
+    assert result.text == "the plan is very very simple."
+
+def test_sentences_are_restored_at_discourse_markers():
+    result = preprocess_fragments(["this is the first idea we have", "but this one is the best idea"])
+
+    assert result.text == "This is the first idea we have. But this one is the best idea."
+    assert result.fragments == ["This is the first idea we have.", "But this one is the best idea."]
+
+def test_fragments_stay_aligned_with_captions():
+    captions = ["[Music]", "um welcome back everyone", "welcome back everyone to the show", "uh"]
+    result = preprocess_fragments(captions)
+
+    # One cleaned fragment per caption, "" for captions that were dropped entirely
+    assert result.fragments == ["", "Welcome back everyone", "to the show.", ""]
+    assert " ".join(fragment for fragment in result.fragments if fragment) == result.text
+
+def test_offsets_map_back_to_caption_timestamps():
+    captions = ["[Music]", "um so today we are going to", "going to talk about the the budget", "uh", "and then we save money."]
+    starts = [0.0, 3.0, 6.0, 9.0, 12.0]
+    result = preprocess_fragments(captions)
+    segments = TranscriptSegments.from_fragments(result.fragments, starts, [3.0] * len(captions))
+
+    assert segments.text == result.text
+    # Dropped captions keep no segment; the rest keep their own start times
+    assert segments.starts.tolist() == [3.0, 6.0, 12.0]
+    assert segments.timestamp_at(result.text.index("talk about")) == 6.0
+    assert segments.timestamp_at(result.text.index("save money")) > 12.0
+    assert segments.timestamp_of("and then we save money") == 12.0
+
+def test_empty_input():
+    result = preprocess_fragments(["[Applause]", "um"])
+
+    assert result.text == ""
+    assert result.fragments == ["", ""]